@@ -0,0 +1,66 @@
+"""
+Fits the cost model of `schematicconverter.cost_estimation` to conversions of the complex example and of generated
+stations of increasing size, and prints the coefficients together with the estimation error per case.
+
+    python benchmarks/calibrate_cost_model.py [number of generated stations] [path to save the model to]
+"""
+import sys
+from pathlib import Path
+
+from compare_engines import COMPLEX_EXAMPLE, generate_station
+from schematicconverter import CostModel, load_planpro
+from schematicconverter.cost_estimation import measure
+from schematicconverter.planpro_loader import LayoutTopology
+
+
+def generate_stations(seed: int, num_stations: int, size: int) -> LayoutTopology:
+    """
+    Places unconnected generated stations below each other. Every station needs its own node in the cover of the
+    start nodes, which makes the graph analysis grow combinatorially with the number of stations.
+    """
+    topology = LayoutTopology()
+    for idx in range(num_stations):
+        station = generate_station(seed + idx, num_sidings=size, num_stubs=size // 3, num_signals=2 * size)
+        for node in station.nodes.values():
+            node.geo_node.y += 200 * idx
+        for elements, station_elements in ((topology.nodes, station.nodes), (topology.edges, station.edges),
+                                           (topology.signals, station.signals), (topology.tracks, station.tracks)):
+            for element in station_elements.values():
+                element.uuid = f"{idx}-{element.uuid}"
+                elements[element.uuid] = element
+    return topology
+
+
+def get_cases(num_stations: int) -> list[tuple[str, callable]]:
+    cases = [("complex-example", lambda: load_planpro(str(COMPLEX_EXAMPLE)))]
+    for seed in range(num_stations):
+        size, num_components = 2 + seed % 12, 1 + seed % 4
+        cases.append((
+            f"stations-{seed}-{num_components}x{size}",
+            lambda seed=seed, num_components=num_components, size=size: generate_stations(seed, num_components, size)
+        ))
+    return cases
+
+
+def main(num_stations: int = 60, path: str | None = None) -> None:
+    cases = get_cases(num_stations)
+    model = CostModel.calibrate(create_topology for _, create_topology in cases)
+    if path:
+        model.save(path)
+    print({"time": model.time_coefficients, "memory": model.memory_coefficients})
+
+    for name, create_topology in cases[:20]:
+        try:
+            features, times, memory = measure(create_topology, repetitions=1)
+        except Exception as error:
+            print(f"{name:<20} failed: {type(error).__name__}")
+            continue
+        estimate = model.estimate_from_features(features)
+        print(
+            f"{name:<20} {sum(times.values()) * 1000:9.1f} ms (estimated {estimate.total_time * 1000:9.1f} ms) "
+            f"{max(memory.values()) / 1024:9.1f} KiB (estimated {estimate.peak_memory / 1024:9.1f} KiB)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60, sys.argv[2] if len(sys.argv) > 2 else None)
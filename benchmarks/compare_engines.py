@@ -0,0 +1,45 @@
+"""
+Compares the layouts and conversion times of two engines on the complex example and on generated stations.
+
+    python benchmarks/compare_engines.py [number of generated stations] [engine] [reference engine]
+"""
+import sys
+from pathlib import Path
+
+from schematicconverter import compare_engines, load_planpro
+
+TEST_DIRECTORY = Path(__file__).parent.parent / "test"
+COMPLEX_EXAMPLE = TEST_DIRECTORY / "complex-example.ppxml"
+sys.path.insert(0, str(TEST_DIRECTORY))
+
+from stations import generate_station
+
+
+def main(num_stations: int = 50, engine: str = "default", reference: str = "reference") -> None:
+    cases = [("complex-example", lambda: load_planpro(str(COMPLEX_EXAMPLE)))]
+    cases += [(f"station-{seed}", lambda seed=seed: generate_station(seed)) for seed in range(num_stations)]
+
+    num_equal = num_unstable = num_failed = 0
+    for name, create_topology in cases:
+        try:
+            comparison = compare_engines(create_topology, engine, reference)
+        except Exception as error:
+            num_failed += 1
+            print(f"{name:<20} failed: {type(error).__name__}: {error}")
+            continue
+        num_equal += comparison.is_equal
+        num_unstable += not comparison.is_stable
+        differences = ", ".join(f"{len(uuids)} {kind}" for kind, uuids in comparison.differences.items() if uuids)
+        print(
+            f"{name:<20} {comparison.reference_time * 1000:9.1f} ms {comparison.engine_time * 1000:9.1f} ms "
+            f"{comparison.speedup:7.1f}x  {differences or 'equal'}{'' if comparison.is_stable else ' (unstable)'}"
+        )
+    print(f"{num_equal} of {len(cases)} equal, {num_unstable} unstable, {num_failed} failed")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        sys.argv[2] if len(sys.argv) > 2 else "default",
+        sys.argv[3] if len(sys.argv) > 3 else "reference"
+    )
@@ -0,0 +1,37 @@
+"""
+Measures the cumulative import time of the package entry points in fresh interpreters.
+
+    python benchmarks/import_time.py [repetitions]
+"""
+import re
+import subprocess
+import sys
+from statistics import median
+
+
+STATEMENTS = (
+    "import schematicconverter",
+    "from schematicconverter import convert",
+    "from schematicconverter import load_planpro",
+    "from schematicoverview import SchematicOverview",
+)
+
+
+def measure_import_time(statement: str) -> float:
+    """Returns the import time of `statement` in milliseconds as reported by `python -X importtime`."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    ).stderr
+    cumulative_times = [int(match) for match in re.findall(r"import time:\s+\d+ \|\s+(\d+) \|", stderr)]
+    top_level = [time for line, time in zip(stderr.splitlines()[1:], cumulative_times) if re.search(r"\| \S", line)]
+    return sum(top_level) / 1000
+
+
+def main(repetitions: int = 5) -> None:
+    for statement in STATEMENTS:
+        times = [measure_import_time(statement) for _ in range(repetitions)]
+        print(f"{statement:<50} {median(times):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
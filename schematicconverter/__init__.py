@@ -1 +1,36 @@
-from .converter import convert
+from importlib import import_module
+
+# Submodules are imported on first attribute access so that `import schematicconverter` stays cheap.
+_exports: dict[str, str] = {
+    "convert": ".converter",
+    "convert_async": ".stepwise",
+    "convert_batch": ".isolation",
+    "convert_isolated": ".isolation",
+    "convert_partitioned": ".partitioning",
+    "convert_variants": ".converter",
+    "compare_engines": ".engines",
+    "CostModel": ".cost_estimation",
+    "create_snapshot": ".converter",
+    "estimate_cost": ".cost_estimation",
+    "get_engine": ".engines",
+    "GraphSnapshot": ".helper",
+    "LayoutEngine": ".engines",
+    "MemoryBudgetExceededError": ".memory_profiling",
+    "MemoryProfile": ".memory_profiling",
+    "TimeBudget": ".helper",
+    "load_planpro": ".planpro_loader",
+    "register_engine": ".engines",
+    "SignalFilter": ".helper",
+    "StepwiseConversion": ".stepwise",
+    "validate_layout": ".validation",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
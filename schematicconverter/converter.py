@@ -1,35 +1,241 @@
+from __future__ import annotations
+from copy import copy
+from typing import TYPE_CHECKING, Iterator
+
 from yaramo.geo_node import EuclideanGeoNode
-from yaramo.model import Topology
 
-from schematicconverter.helper import SchematicGraph
-from schematicconverter.helper import generate_vertical_positions, generate_horizontal_positions
-from schematicconverter.helper import shorten_normal_tracks, stretch_main_tracks
-from schematicconverter.helper import process_signals
+from schematicconverter.engines import LayoutEngine, get_engine
+from schematicconverter.helper import GraphSnapshot, SchematicGraph, TimeBudget, get_signal_filter
 
+if TYPE_CHECKING:
+    from yaramo.model import Topology
 
-def convert(topology: Topology, scale_factor: float = 4.5, remove_non_ks_signals: bool = False) -> Topology:
-    yaramo_graph = SchematicGraph(topology, remove_non_ks_signals)
+    from schematicconverter.helper.datastructures import SignalPredicate
+    from schematicconverter.memory_profiling import MemoryProfile
 
-    generate_vertical_positions(yaramo_graph)
-    generate_horizontal_positions(yaramo_graph)
 
-    shorten_normal_tracks(yaramo_graph)
-    stretch_main_tracks(yaramo_graph)
-    process_signals(yaramo_graph)
-    _normalize_nodes(yaramo_graph, scale_factor)
+def convert(
+    topology: Topology,
+    scale_factor: float = 4.5,
+    remove_non_ks_signals: bool = False,
+    snapshot: GraphSnapshot | None = None,
+    time_budget: float | TimeBudget | None = None,
+    partition: bool = False,
+    engine: str | LayoutEngine = "default",
+    isolated: bool = False,
+    signal_filter: SignalPredicate | None = None,
+    memory_profile: MemoryProfile | None = None
+) -> Topology:
+    """
+    If a `time_budget` (in seconds) is given and exceeded, expensive steps are replaced by cheaper fallbacks.
+    Pass a `TimeBudget` instance to inspect the used fallbacks and the time spent per phase afterwards.
+    With `partition`, long corridors are cut into sections that are converted in parallel, see `convert_partitioned`.
+    The `engine` selects the layout algorithms, see `schematicconverter.engines`.
+    With `isolated`, the conversion is thread-safe and writes to the topology only at the end, see `convert_isolated`.
+    Only the signals selected by the `signal_filter` are placed, the others keep their relative position on their edges,
+    see `SignalFilter`.
+    `remove_non_ks_signals` is short for a filter of KS signals and does not remove signals from the topology.
+    Pass a `MemoryProfile` to record the memory per phase and to abort once a memory budget is exceeded.
+    """
+    signal_filter = get_signal_filter(signal_filter, remove_non_ks_signals)
+    if partition:
+        if snapshot is not None or time_budget is not None or isolated or memory_profile is not None:
+            raise ValueError(
+                "Partitioned conversion does not support snapshots, time budgets, isolation and memory profiles."
+            )
+        from .partitioning import convert_partitioned
 
-    for node in yaramo_graph.nodes:
-        node.yaramo_node.geo_node = EuclideanGeoNode(node.new_x, node.new_y)
+        return convert_partitioned(topology, scale_factor=scale_factor, engine=engine, signal_filter=signal_filter)
+
+    if isolated:
+        from .isolation import convert_isolated
+
+        return convert_isolated(
+            topology, scale_factor, snapshot=snapshot, time_budget=time_budget, engine=engine,
+            signal_filter=signal_filter, memory_profile=memory_profile
+        )
 
+    budget = time_budget if isinstance(time_budget, TimeBudget) else TimeBudget(time_budget)
+
+    if memory_profile is None:
+        for _ in _iter_conversion(topology, scale_factor, signal_filter, snapshot, budget, engine):
+            pass
+        return topology
+    with memory_profile.tracing():
+        for phase, _ in _iter_conversion(topology, scale_factor, signal_filter, snapshot, budget, engine):
+            memory_profile.record(phase)
     return topology
 
 
+def create_snapshot(topology: Topology) -> GraphSnapshot:
+    """
+    Analyses the graph of the topology once, so that it can be converted repeatedly with `convert(..., snapshot=...)`.
+    The topology itself is left unchanged.
+    """
+    geo_coordinates = {uuid: (node.geo_node.x, node.geo_node.y) for uuid, node in topology.nodes.items()}
+    intermediate_geo_nodes = {uuid: edge.intermediate_geo_nodes for uuid, edge in topology.edges.items()}
+
+    snapshot = GraphSnapshot.from_graph(SchematicGraph(topology))
+
+    for uuid, node in topology.nodes.items():
+        node.geo_node.x, node.geo_node.y = geo_coordinates[uuid]
+    for uuid, edge in topology.edges.items():
+        edge.intermediate_geo_nodes = intermediate_geo_nodes[uuid]
+    return snapshot
+
+
+def convert_variants(
+    base: Topology,
+    variants: list[Topology],
+    scale_factor: float = 4.5,
+    remove_non_ks_signals: bool = False,
+    engine: str | LayoutEngine = "default",
+    signal_filter: SignalPredicate | None = None
+) -> list[Topology]:
+    """
+    Converts the base topology and all variants of it, e.g. the same station with a few signals or switches changed.
+    The graph analysis is shared by all topologies with the same nodes, edges and tracks (compared by uuid and
+    content), and the positions of nodes and breakpoints are shared if additionally the number of signals per edge
+    is the same, so that only the signals are placed individually. Returns the converted variants.
+    """
+    import hashlib
+    import json
+
+    layout_engine = get_engine(engine)
+    signal_filter = get_signal_filter(signal_filter, remove_non_ks_signals)
+
+    def get_structure_key(topology: Topology) -> str:
+        structure = [
+            sorted((uuid, node.geo_node.x, node.geo_node.y) for uuid, node in topology.nodes.items()),
+            sorted((uuid, edge.node_a.uuid, edge.node_b.uuid) for uuid, edge in topology.edges.items()),
+            sorted(
+                (uuid, str(track.track_type), sorted(node.uuid for node in track.nodes))
+                for uuid, track in topology.tracks.items()
+            ),
+        ]
+        return hashlib.sha256(json.dumps(structure).encode("utf-8")).hexdigest()
+
+    structure_keys = [get_structure_key(topology) for topology in (base, *variants)]
+    snapshots: dict[str, GraphSnapshot] = {}
+    positions: dict[tuple, tuple[dict, dict]] = {}
+
+    for topology, structure_key in zip((base, *variants), structure_keys):
+        budget = TimeBudget()
+        yaramo_graph = layout_engine.create_graph(
+            topology, snapshot=snapshots.get(structure_key), time_budget=budget, signal_filter=signal_filter
+        )
+        for _ in layout_engine.iter_build_graph(yaramo_graph):
+            pass
+        if structure_key not in snapshots:
+            snapshots[structure_key] = copy(GraphSnapshot.from_graph(yaramo_graph))
+            # Signal distances are taken from each variant itself
+            snapshots[structure_key].signal_distances = {}
+
+        positions_key = (structure_key, *sorted((edge.uuid, edge.max_num_signals) for edge in yaramo_graph.edges))
+        if positions_key in positions:
+            node_positions, breakpoint_positions = positions[positions_key]
+            for node in yaramo_graph.nodes:
+                node.new_x, node.new_y = node_positions[node.uuid]
+            for edge in yaramo_graph.edges:
+                if edge.uuid in breakpoint_positions:
+                    edge.intermediate_geo_node = EuclideanGeoNode(*breakpoint_positions[edge.uuid])
+        else:
+            for _ in _iter_positions(yaramo_graph, budget, layout_engine):
+                pass
+            positions[positions_key] = (
+                {node.uuid: (node.new_x, node.new_y) for node in yaramo_graph.nodes},
+                {
+                    edge.uuid: (edge.intermediate_geo_node.x, edge.intermediate_geo_node.y)
+                    for edge in yaramo_graph.edges if edge.intermediate_geo_node
+                }
+            )
+        for _ in _iter_finish_conversion(yaramo_graph, scale_factor, budget, layout_engine):
+            pass
+
+    return variants
+
+
+def _iter_conversion(
+    topology: Topology,
+    scale_factor: float,
+    signal_filter: SignalPredicate | None,
+    snapshot: GraphSnapshot | None,
+    budget: TimeBudget,
+    engine: str | LayoutEngine = "default"
+) -> Iterator[tuple[str, int]]:
+    """
+    Runs the conversion and yields (phase, number of processed elements) after every unit of work,
+    and (phase, 0) before the first unit of every phase.
+    """
+    layout_engine = get_engine(engine)
+    yield "graph", 0
+    yaramo_graph = layout_engine.create_graph(
+        topology, snapshot=snapshot, time_budget=budget, signal_filter=signal_filter
+    )
+    yield from _iter_phase(budget, "graph", layout_engine.iter_build_graph(yaramo_graph))
+
+    yield from _iter_positions(yaramo_graph, budget, layout_engine)
+    yield from _iter_finish_conversion(yaramo_graph, scale_factor, budget, layout_engine)
+
+
+def _iter_positions(
+    yaramo_graph: SchematicGraph,
+    budget: TimeBudget,
+    engine: LayoutEngine
+) -> Iterator[tuple[str, int]]:
+    yield "vertical_positioning", 0
+    yield from _iter_phase(budget, "vertical_positioning", engine.iter_vertical_positions(yaramo_graph))
+    yield "horizontal_positioning", 0
+    with budget.phase("horizontal_positioning"):
+        engine.generate_horizontal_positions(yaramo_graph)
+    yield "horizontal_positioning", len(yaramo_graph.nodes)
+
+    yield "track_postprocessing", 0
+    if budget.exceeded:
+        budget.use_fallback("skip_shorten_normal_tracks")
+    else:
+        yield from _iter_phase(budget, "track_postprocessing", engine.iter_shorten_normal_tracks(yaramo_graph))
+    with budget.phase("track_postprocessing"):
+        engine.stretch_main_tracks(yaramo_graph)
+    yield "track_postprocessing", len(yaramo_graph.nodes)
+
+
+def _iter_finish_conversion(
+    yaramo_graph: SchematicGraph,
+    scale_factor: float,
+    budget: TimeBudget,
+    engine: LayoutEngine
+) -> Iterator[tuple[str, int]]:
+    yield "signals", 0
+    yield from _iter_phase(budget, "signals", engine.iter_process_signals(yaramo_graph))
+    yield "normalization", 0
+    with budget.phase("normalization"):
+        engine.normalize(yaramo_graph, scale_factor)
+
+        for node in yaramo_graph.nodes:
+            node.yaramo_node.geo_node = EuclideanGeoNode(node.new_x, node.new_y)
+    yield "normalization", len(yaramo_graph.nodes)
+
+
+def _iter_phase(budget: TimeBudget, phase: str, units: Iterator[int]) -> Iterator[tuple[str, int]]:
+    """Only the work of each unit is accounted to the phase, not the time the conversion is suspended."""
+    while True:
+        with budget.phase(phase):
+            num_units = next(units, None)
+        if num_units is None:
+            return
+        yield phase, num_units
 
 
 def _normalize_nodes(yaramo_graph: SchematicGraph, scale_factor: int):
     min_x = min([node.new_x for node in yaramo_graph.nodes])
     min_y = min([node.new_y for node in yaramo_graph.nodes])
-    old_edge_lens = {edge: edge.horizontal_length for edge in yaramo_graph.edges}
+    signal_table = yaramo_graph.signal_table
+    if not signal_table.is_placed:
+        # Engines may also place the signals directly
+        signal_table.read_distances()
+    signal_table.place_rejected()
+    old_edge_lens = signal_table.get_horizontal_lengths()
 
     for node in yaramo_graph.nodes:
         node.new_x = (node.new_x - min_x) / scale_factor
@@ -39,6 +245,5 @@ def _normalize_nodes(yaramo_graph: SchematicGraph, scale_factor: int):
         edge.intermediate_geo_node.x = (edge.intermediate_geo_node.x - min_x) / scale_factor
         edge.intermediate_geo_node.y = (edge.intermediate_geo_node.y - min_y) / scale_factor
 
-    for edge in yaramo_graph.edges:
-        for signal in edge.yaramo_edge.signals:
-            signal.distance_edge = signal.distance_edge * (edge.horizontal_length / old_edge_lens[edge])
+    signal_table.rescale(old_edge_lens, signal_table.get_horizontal_lengths())
+    signal_table.write_back()
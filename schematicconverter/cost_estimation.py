@@ -0,0 +1,326 @@
+"""
+Pre-flight estimation of the runtime and peak memory of a conversion.
+
+The estimate is computed from structural features of the topology only (no conversion is run), so that schedulers
+can route large jobs to dedicated workers or order batches longest-first. Every phase of the conversion is modelled
+as a non-negative linear combination of terms, i.e. products of features that follow the complexity of the phase.
+The coefficients are fitted with `CostModel.calibrate`, the defaults come from `benchmarks/calibrate_cost_model.py`.
+"""
+from __future__ import annotations
+import json
+from math import comb, prod
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from yaramo.track import TrackType
+
+from .helper import get_signal_filter
+
+if TYPE_CHECKING:
+    from yaramo.model import Topology
+
+    from .helper.datastructures import SignalPredicate
+
+
+PHASES: tuple[str, ...] = (
+    "graph", "vertical_positioning", "horizontal_positioning", "track_postprocessing", "signals", "normalization"
+)
+
+_TIME_TERMS: dict[str, tuple[tuple[str, ...], ...]] = {
+    "graph": (
+        (), ("num_nodes",), ("num_edges", "num_edges"), ("num_crossings",), ("reachable_pairs", "num_edges"),
+        ("cover_combinations", "num_start_nodes"),
+    ),
+    "vertical_positioning": ((), ("num_nodes",), ("num_nodes", "num_edges")),
+    "horizontal_positioning": ((), ("num_nodes",), ("num_nodes", "num_edges")),
+    "track_postprocessing": (
+        (), ("num_edges", "num_nodes"), ("num_edges", "num_edges"), ("num_main_tracks", "num_edges"),
+    ),
+    "signals": ((), ("num_edges",), ("num_signals",)),
+    "normalization": ((), ("num_nodes",), ("num_edges",), ("num_signals",)),
+}
+_MEMORY_TERMS: tuple[tuple[str, ...], ...] = (
+    (), ("num_nodes",), ("num_edges",), ("num_signals",), ("reachable_pairs",),
+)
+
+# Fitted by benchmarks/calibrate_cost_model.py, times in seconds and memory in bytes
+_DEFAULT_COEFFICIENTS: dict[str, dict[str, list[float]]] = {
+    "time": {
+        "graph": [4.532e-05, 0.0, 0.0, 0.0, 6.777e-06, 2.184e-08],
+        "vertical_positioning": [0.0001305, 7.828e-06, 5.836e-07],
+        "horizontal_positioning": [9.727e-05, 1.776e-05, 0.0],
+        "track_postprocessing": [0.0001408, 2.542e-07, 0.0, 0.0],
+        "signals": [6.626e-05, 0.0, 2.018e-05],
+        "normalization": [8.141e-06, 1.843e-06, 3.643e-07, 0.0],
+    },
+    "memory": {
+        "graph": [0.0, 0.0, 1200.0, 927.8, 1563.6],
+        "vertical_positioning": [0.0, 0.0, 511.8, 3744.8, 689.3],
+        "horizontal_positioning": [0.0, 0.0, 770.5, 3461.3, 771.3],
+        "track_postprocessing": [0.0, 0.0, 51.0, 3228.4, 1159.6],
+        "signals": [1468.4, 0.0, 27.0, 3417.8, 1090.8],
+        "normalization": [0.0, 0.0, 55.1, 3326.2, 1171.1],
+    },
+}
+
+
+class CostEstimate:
+    def __init__(self, features: dict[str, float], phase_times: dict[str, float], phase_memory: dict[str, float]):
+        self.features: dict[str, float] = features
+        self.phase_times: dict[str, float] = phase_times
+        self.phase_memory: dict[str, float] = phase_memory
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.phase_times.values())
+
+    @property
+    def peak_memory(self) -> float:
+        return max(self.phase_memory.values(), default=0.0)
+
+    def to_dict(self) -> dict:
+        return {
+            "features": self.features,
+            "phase_times": self.phase_times,
+            "phase_memory": self.phase_memory,
+            "total_time": self.total_time,
+            "peak_memory": self.peak_memory,
+        }
+
+
+class ConversionTimeExceededError(TimeoutError):
+    def __init__(self, seconds: float):
+        super().__init__(f"Conversion exceeded {seconds} seconds.")
+        self.seconds: float = seconds
+
+
+class CostModel:
+    """Coefficients of the terms of every phase for the runtime (in seconds) and the peak memory (in bytes)."""
+    version: int = 1
+
+    def __init__(self, time_coefficients: dict[str, list[float]], memory_coefficients: dict[str, list[float]]):
+        for phase in PHASES:
+            if len(time_coefficients.get(phase, [])) != len(_TIME_TERMS[phase]) or \
+                    len(memory_coefficients.get(phase, [])) != len(_MEMORY_TERMS):
+                raise ValueError(f"Coefficients of phase '{phase}' do not match the terms of the model.")
+        self.time_coefficients: dict[str, list[float]] = time_coefficients
+        self.memory_coefficients: dict[str, list[float]] = memory_coefficients
+
+    @classmethod
+    def default(cls) -> CostModel:
+        return cls(_DEFAULT_COEFFICIENTS["time"], _DEFAULT_COEFFICIENTS["memory"])
+
+    def estimate(
+        self,
+        topology: Topology,
+        remove_non_ks_signals: bool = False,
+        signal_filter: SignalPredicate | None = None
+    ) -> CostEstimate:
+        return self.estimate_from_features(get_topology_features(topology, remove_non_ks_signals, signal_filter))
+
+    def estimate_from_features(self, features: dict[str, float]) -> CostEstimate:
+        return CostEstimate(
+            features,
+            {
+                phase: _dot(self.time_coefficients[phase], _get_terms(features, _TIME_TERMS[phase]))
+                for phase in PHASES
+            },
+            {
+                phase: _dot(self.memory_coefficients[phase], _get_terms(features, _MEMORY_TERMS))
+                for phase in PHASES
+            }
+        )
+
+    @classmethod
+    def calibrate(
+        cls,
+        create_topologies: Iterable[Callable[[], Topology]],
+        remove_non_ks_signals: bool = False,
+        repetitions: int = 3,
+        max_seconds: float = 10.0
+    ) -> CostModel:
+        """
+        Fits a model to measured conversions. Every factory of `create_topologies` is converted `repetitions` times
+        to take the fastest time of each phase, and once more with `tracemalloc` to measure the peak memory.
+        Conversions that exceed `max_seconds` are skipped, errors of all other conversions are raised.
+        """
+        import numpy as np
+        from scipy.optimize import nnls
+
+        samples = []
+        for create_topology in create_topologies:
+            try:
+                samples.append(measure(create_topology, remove_non_ks_signals, repetitions, max_seconds))
+            except ConversionTimeExceededError:
+                continue
+        if not samples:
+            raise ValueError("No conversion could be measured.")
+
+        def fit(terms: tuple[tuple[str, ...], ...], targets: list[float]) -> list[float]:
+            matrix = np.array([_get_terms(features, terms) for features, _, _ in samples], dtype=float)
+            # Columns are scaled to unit maximum, as the terms differ by many orders of magnitude
+            scales = np.maximum(matrix.max(axis=0), 1e-12)
+            coefficients, _ = nnls(matrix / scales, np.array(targets, dtype=float))
+            return [float(value) for value in coefficients / scales]
+
+        return cls(
+            {phase: fit(_TIME_TERMS[phase], [times[phase] for _, times, _ in samples]) for phase in PHASES},
+            {phase: fit(_MEMORY_TERMS, [memory[phase] for _, _, memory in samples]) for phase in PHASES}
+        )
+
+    def to_dict(self) -> dict:
+        return {"version": self.version, "time": self.time_coefficients, "memory": self.memory_coefficients}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CostModel:
+        if data.get("version") != cls.version:
+            raise ValueError(f"Unsupported cost model version {data.get('version')}.")
+        return cls(data["time"], data["memory"])
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path: str | Path) -> CostModel:
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+
+def estimate_cost(
+    topology: Topology,
+    remove_non_ks_signals: bool = False,
+    model: CostModel | None = None,
+    signal_filter: SignalPredicate | None = None
+) -> CostEstimate:
+    """
+    Estimates the runtime and peak memory of `convert(topology)` per phase without converting the topology.
+    If a start node cannot reach any node, the search for a cover of the start nodes checks all combinations of nodes
+    and the estimated time of the graph phase explodes. Such topologies have to be converted with a `time_budget`.
+    """
+    return (model or CostModel.default()).estimate(topology, remove_non_ks_signals, signal_filter)
+
+
+def get_topology_features(
+    topology: Topology,
+    remove_non_ks_signals: bool = False,
+    signal_filter: SignalPredicate | None = None
+) -> dict[str, float]:
+    """
+    Structural features of the topology that drive the conversion cost. Nodes are ordered by their coordinates like
+    in `SchematicGraph`, start nodes have no predecessor. `reachable_pairs` counts the nodes reachable from every
+    start node without passing crossing edges and `cover_combinations` the node combinations checked for a minimal
+    cover of the start nodes, whose size is estimated by a greedy cover.
+    """
+    coordinates = {uuid: (node.geo_node.x, node.geo_node.y) for uuid, node in topology.nodes.items()}
+    crossings = _find_crossings(topology, coordinates)
+    crossing_edges = {uuid for pair in crossings for uuid in pair}
+    successors: dict[str, list[str]] = {uuid: [] for uuid in topology.nodes}
+    has_predecessor: set[str] = set()
+    for edge in topology.edges.values():
+        node_a, node_b = sorted((edge.node_a.uuid, edge.node_b.uuid), key=coordinates.get)
+        if coordinates[node_a] != coordinates[node_b]:
+            has_predecessor.add(node_b)
+            if edge.uuid not in crossing_edges:
+                successors[node_a].append(node_b)
+    start_nodes = [uuid for uuid in topology.nodes if uuid not in has_predecessor]
+
+    # Reachable nodes as bit sets, computed from right to left
+    bits = {uuid: 1 << idx for idx, uuid in enumerate(topology.nodes)}
+    reachable: dict[str, int] = {}
+    for uuid in sorted(topology.nodes, key=coordinates.get, reverse=True):
+        reachable[uuid] = 0
+        for successor in successors[uuid]:
+            reachable[uuid] |= bits[successor] | reachable[successor]
+    start_reachable = [reachable[uuid] for uuid in start_nodes]
+
+    num_nodes = len(topology.nodes)
+    if not all(start_reachable):
+        # A start node without reachable nodes cannot be covered, so all combinations are checked
+        cover_combinations = 2 ** num_nodes - 1
+    else:
+        cover_size = 0
+        remaining = start_reachable
+        while remaining:
+            node_bit = max(bits.values(), key=lambda bit: sum(1 for nodes in remaining if nodes & bit))
+            remaining = [nodes for nodes in remaining if not nodes & node_bit]
+            cover_size += 1
+        cover_combinations = sum(comb(num_nodes, size) for size in range(1, cover_size))
+        cover_combinations += comb(num_nodes, cover_size) // 2
+
+    signal_filter = get_signal_filter(signal_filter, remove_non_ks_signals)
+    num_signals = sum(
+        1 for edge in topology.edges.values() for signal in edge.signals
+        if signal_filter is None or signal_filter(signal)
+    )
+    return {
+        "num_nodes": float(num_nodes),
+        "num_edges": float(len(topology.edges)),
+        "num_signals": float(num_signals),
+        "num_start_nodes": float(len(start_nodes)),
+        "num_main_tracks": float(sum(
+            1 for track in topology.tracks.values() if track.track_type == TrackType.Durchgehendes_Hauptgleis
+        )),
+        "num_crossings": float(len(crossings)),
+        "reachable_pairs": float(sum(nodes.bit_count() for nodes in start_reachable)),
+        "cover_combinations": float(min(cover_combinations, 10 ** 300)),
+    }
+
+
+def _find_crossings(topology: Topology, coordinates: dict[str, tuple[float, float]]) -> list[tuple[str, str]]:
+    """Returns the pairs of edges that cross strictly, edges are treated as straight lines between their nodes."""
+    def orientation(p: tuple[float, float], q: tuple[float, float], r: tuple[float, float]) -> int:
+        value = (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+        return (value > 0) - (value < 0)
+
+    segments = sorted(
+        (*sorted((coordinates[edge.node_a.uuid], coordinates[edge.node_b.uuid])), uuid)
+        for uuid, edge in topology.edges.items()
+    )
+    crossings = []
+    active: list[tuple[tuple[float, float], tuple[float, float], str]] = []
+    for start, end, uuid in segments:
+        active = [segment for segment in active if segment[1][0] >= start[0]]
+        for other_start, other_end, other_uuid in active:
+            if orientation(start, end, other_start) * orientation(start, end, other_end) < 0 and \
+                    orientation(other_start, other_end, start) * orientation(other_start, other_end, end) < 0:
+                crossings.append((other_uuid, uuid))
+        active.append((start, end, uuid))
+    return crossings
+
+
+def _get_terms(features: dict[str, float], terms: tuple[tuple[str, ...], ...]) -> list[float]:
+    return [prod(features[name] for name in term) for term in terms]
+
+
+def _dot(coefficients: list[float], values: list[float]) -> float:
+    return sum(coefficient * value for coefficient, value in zip(coefficients, values))
+
+
+def measure(
+    create_topology: Callable[[], Topology],
+    remove_non_ks_signals: bool = False,
+    repetitions: int = 3,
+    max_seconds: float | None = None
+) -> tuple[dict[str, float], dict[str, float], dict[str, float]]:
+    """
+    Returns the features, the fastest time per phase and the peak memory per phase of converting a topology.
+    Raises `ConversionTimeExceededError` if a conversion switches to fallbacks after `max_seconds`.
+    """
+    from .converter import convert
+    from .helper import TimeBudget
+    from .memory_profiling import MemoryProfile
+
+    features = get_topology_features(create_topology(), remove_non_ks_signals)
+    times = {phase: float("inf") for phase in PHASES}
+    for _ in range(repetitions):
+        budget = TimeBudget(max_seconds)
+        convert(create_topology(), remove_non_ks_signals=remove_non_ks_signals, time_budget=budget)
+        if budget.fallbacks:
+            raise ConversionTimeExceededError(max_seconds)
+        times = {phase: min(times[phase], budget.phase_times.get(phase, 0.0)) for phase in PHASES}
+
+    profile = MemoryProfile(top_sites=0)
+    convert(create_topology(), remove_non_ks_signals=remove_non_ks_signals, memory_profile=profile)
+    memory = {phase: float(profile.phases[phase].peak) if phase in profile.phases else 0.0 for phase in PHASES}
+    return features, times, memory
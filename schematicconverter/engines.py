@@ -0,0 +1,232 @@
+"""
+Layout engines and a differential harness to compare them.
+
+An engine provides the positioning and signal stages of the conversion. The default engine uses the optimised
+algorithms of `schematicconverter.helper`, the reference engine frozen copies of the original algorithms.
+Further engines can be registered with `register_engine` and selected with `convert(..., engine=...)`.
+"""
+from __future__ import annotations
+import time
+from typing import TYPE_CHECKING, Callable, Iterator
+
+if TYPE_CHECKING:
+    from yaramo.model import Topology
+
+    from .helper import GraphSnapshot, SchematicGraph, TimeBudget
+    from .helper.datastructures import SignalPredicate
+
+
+class LayoutEngine:
+    """
+    Default engine. Engines yield the number of processed elements after every unit of work from the `iter_*`
+    stages, so that conversions can be run step-wise.
+    """
+    name: str = "default"
+
+    def create_graph(
+        self,
+        topology: Topology,
+        snapshot: GraphSnapshot | None = None,
+        time_budget: TimeBudget | None = None,
+        signal_filter: SignalPredicate | None = None
+    ) -> SchematicGraph:
+        """Creates the graph of the topology, which is analysed by `iter_build_graph`."""
+        from .helper import SchematicGraph
+
+        return SchematicGraph(
+            topology, snapshot=snapshot, time_budget=time_budget, signal_filter=signal_filter, defer_build=True
+        )
+
+    def iter_build_graph(self, yaramo_graph: SchematicGraph) -> Iterator[int]:
+        yield from yaramo_graph.iter_build()
+        yield from yaramo_graph.iter_start_nodes_in_order()
+
+    def iter_vertical_positions(self, yaramo_graph: SchematicGraph) -> Iterator[int]:
+        from .helper import iter_generate_vertical_positions
+
+        return iter_generate_vertical_positions(yaramo_graph)
+
+    def generate_horizontal_positions(self, yaramo_graph: SchematicGraph) -> None:
+        from .helper import generate_horizontal_positions
+
+        generate_horizontal_positions(yaramo_graph)
+
+    def iter_shorten_normal_tracks(self, yaramo_graph: SchematicGraph) -> Iterator[int]:
+        from .helper import iter_shorten_normal_tracks
+
+        return iter_shorten_normal_tracks(yaramo_graph)
+
+    def stretch_main_tracks(self, yaramo_graph: SchematicGraph) -> None:
+        from .helper import stretch_main_tracks
+
+        stretch_main_tracks(yaramo_graph)
+
+    def iter_process_signals(self, yaramo_graph: SchematicGraph) -> Iterator[int]:
+        from .helper import iter_process_signals
+
+        return iter_process_signals(yaramo_graph)
+
+    def normalize(self, yaramo_graph: SchematicGraph, scale_factor: float) -> None:
+        from .converter import _normalize_nodes
+
+        _normalize_nodes(yaramo_graph, scale_factor)
+
+
+class ReferenceEngine(LayoutEngine):
+    """
+    The original graph and algorithms, every stage is a single unit of work. Snapshots and time budgets are ignored,
+    the graph is always analysed from the topology.
+    """
+    name: str = "reference"
+
+    def create_graph(
+        self,
+        topology: Topology,
+        snapshot: GraphSnapshot | None = None,
+        time_budget: TimeBudget | None = None,
+        signal_filter: SignalPredicate | None = None
+    ) -> SchematicGraph:
+        from .helper.algorithms import reference
+
+        return reference.SchematicGraph(topology, signal_filter=signal_filter)
+
+    def iter_build_graph(self, yaramo_graph: SchematicGraph) -> Iterator[int]:
+        yield len(yaramo_graph.nodes)
+
+    def iter_vertical_positions(self, yaramo_graph: SchematicGraph) -> Iterator[int]:
+        from .helper.algorithms import reference
+
+        reference.generate_vertical_positions(yaramo_graph)
+        yield len(yaramo_graph.nodes)
+
+    def generate_horizontal_positions(self, yaramo_graph: SchematicGraph) -> None:
+        from .helper.algorithms import reference
+
+        reference.generate_horizontal_positions(yaramo_graph)
+
+    def iter_shorten_normal_tracks(self, yaramo_graph: SchematicGraph) -> Iterator[int]:
+        from .helper.algorithms import reference
+
+        reference.shorten_normal_tracks(yaramo_graph)
+        yield len(yaramo_graph.edges)
+
+    def stretch_main_tracks(self, yaramo_graph: SchematicGraph) -> None:
+        from .helper.algorithms import reference
+
+        reference.stretch_main_tracks(yaramo_graph)
+
+    def iter_process_signals(self, yaramo_graph: SchematicGraph) -> Iterator[int]:
+        from .helper.algorithms import reference
+
+        reference.process_signals(yaramo_graph)
+        yield len(yaramo_graph.edges)
+
+    def normalize(self, yaramo_graph: SchematicGraph, scale_factor: float) -> None:
+        from .helper.algorithms import reference
+
+        reference.normalize_nodes(yaramo_graph, scale_factor)
+
+
+_engines: dict[str, LayoutEngine] = {engine.name: engine for engine in (LayoutEngine(), ReferenceEngine())}
+
+
+def register_engine(engine: LayoutEngine) -> None:
+    if engine.name in _engines:
+        raise ValueError(f"Engine '{engine.name}' is already registered.")
+    _engines[engine.name] = engine
+
+
+def get_engine(engine: str | LayoutEngine) -> LayoutEngine:
+    if isinstance(engine, LayoutEngine):
+        return engine
+    if engine not in _engines:
+        raise ValueError(f"Unknown engine '{engine}', available engines: {', '.join(_engines)}.")
+    return _engines[engine]
+
+
+class EngineComparison:
+    def __init__(
+        self,
+        differences: dict[str, list[str]],
+        reference_time: float,
+        engine_time: float,
+        is_stable: bool
+    ):
+        self.differences: dict[str, list[str]] = differences
+        self.reference_time: float = reference_time
+        self.engine_time: float = engine_time
+        self.is_stable: bool = is_stable
+
+    @property
+    def is_equal(self) -> bool:
+        return not any(self.differences.values())
+
+    @property
+    def speedup(self) -> float:
+        return self.reference_time / self.engine_time if self.engine_time else float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "differences": self.differences,
+            "reference_time": self.reference_time,
+            "engine_time": self.engine_time,
+            "speedup": self.speedup,
+            "is_stable": self.is_stable,
+        }
+
+
+def compare_engines(
+    create_topology: Callable[[], Topology],
+    engine: str | LayoutEngine = "default",
+    reference: str | LayoutEngine = "reference",
+    tolerance: float = 1e-9,
+    check_stability: bool = True,
+    **options
+) -> EngineComparison:
+    """
+    Converts fresh topologies of `create_topology` with both engines and reports the uuids of nodes, breakpoints
+    (by edge) and signals whose positions differ by more than `tolerance`, together with the conversion times.
+    Every conversion analyses the graph of its own topology. Some layouts depend on the iteration order of sets, so with
+    `check_stability` the reference engine is run twice and `is_stable` is false if its results differ.
+    """
+    from .converter import convert
+
+    def run(layout_engine: str | LayoutEngine) -> tuple[dict[str, dict], float]:
+        topology = create_topology()
+        started_at = time.perf_counter()
+        convert(topology, engine=layout_engine, **options)
+        return _get_layout(topology), time.perf_counter() - started_at
+
+    reference_layout, reference_time = run(reference)
+    engine_layout, engine_time = run(engine)
+    is_stable = not check_stability or not any(_diff_layouts(reference_layout, run(reference)[0], tolerance).values())
+    differences = _diff_layouts(reference_layout, engine_layout, tolerance)
+    return EngineComparison(differences, reference_time, engine_time, is_stable)
+
+
+def _get_layout(topology: Topology) -> dict[str, dict]:
+    return {
+        "nodes": {uuid: (node.geo_node.x, node.geo_node.y) for uuid, node in topology.nodes.items()},
+        "breakpoints": {
+            uuid: tuple((geo_node.x, geo_node.y) for geo_node in edge.intermediate_geo_nodes)
+            for uuid, edge in topology.edges.items()
+        },
+        "signals": {uuid: (signal.distance_edge,) for uuid, signal in topology.signals.items()},
+    }
+
+
+def _diff_layouts(expected: dict[str, dict], actual: dict[str, dict], tolerance: float) -> dict[str, list[str]]:
+    def differs(a: tuple | None, b: tuple | None) -> bool:
+        if a is None or b is None:
+            return a is not b
+        flat_a = [value for item in a for value in (item if isinstance(item, tuple) else (item,))]
+        flat_b = [value for item in b for value in (item if isinstance(item, tuple) else (item,))]
+        return len(flat_a) != len(flat_b) or any(abs(x - y) > tolerance for x, y in zip(flat_a, flat_b))
+
+    return {
+        kind: sorted(
+            uuid for uuid in expected[kind].keys() | actual[kind].keys()
+            if differs(expected[kind].get(uuid), actual[kind].get(uuid))
+        )
+        for kind in expected
+    }
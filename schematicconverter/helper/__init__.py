@@ -1,2 +1,32 @@
-from .algorithms import *
-from .datastructures import *
+from importlib import import_module
+
+# Algorithms and datastructures are imported on first attribute access so that heavy dependencies
+# are only loaded once the conversion stage that needs them runs.
+_exports: dict[str, str] = {
+    "generate_horizontal_positions": ".algorithms",
+    "generate_vertical_positions": ".algorithms",
+    "iter_generate_vertical_positions": ".algorithms",
+    "shorten_normal_tracks": ".algorithms",
+    "iter_shorten_normal_tracks": ".algorithms",
+    "stretch_main_tracks": ".algorithms",
+    "process_signals": ".algorithms",
+    "iter_process_signals": ".algorithms",
+    "GraphSnapshot": ".datastructures",
+    "SchematicEdge": ".datastructures",
+    "SchematicGraph": ".datastructures",
+    "SchematicNode": ".datastructures",
+    "SignalFilter": ".datastructures",
+    "SignalTable": ".datastructures",
+    "TimeBudget": ".datastructures",
+    "get_signal_filter": ".datastructures",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
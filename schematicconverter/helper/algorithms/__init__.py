@@ -1,12 +1,15 @@
 from .horizontal_positioning import generate_horizontal_positions
-from .signal_processing import process_signals
-from .track_postprocessing import shorten_normal_tracks, stretch_main_tracks
-from .vertical_positioning import generate_vertical_positions
+from .signal_processing import iter_process_signals, process_signals
+from .track_postprocessing import iter_shorten_normal_tracks, shorten_normal_tracks, stretch_main_tracks
+from .vertical_positioning import generate_vertical_positions, iter_generate_vertical_positions
 
 __all__ = [
     "generate_horizontal_positions",
     "generate_vertical_positions", 
+    "iter_generate_vertical_positions",
     "shorten_normal_tracks",
+    "iter_shorten_normal_tracks",
     "stretch_main_tracks",
-    "process_signals"
-]
\ No newline at end of file
+    "process_signals",
+    "iter_process_signals"
+]
@@ -1,60 +1,130 @@
-from ..datastructures import SchematicGraph, SchematicNode
+from yaramo.geo_node import EuclideanGeoNode
+
+from ..datastructures import SchematicEdge, SchematicGraph, SchematicNode
 from ..utils import get_generation_direction
 
 
 def generate_horizontal_positions(yaramo_graph: SchematicGraph):
-    for start_node in sorted(yaramo_graph.start_nodes, key=lambda node: node.new_y):
-        _generate_from_node(yaramo_graph, start_node, 0)
-
-    yaramo_graph.reset_generation_helpers()
-
-
-
-def _generate_from_node(yaramo_graph: SchematicGraph, node: SchematicNode, horizontal_idx: int) -> None:
-    if not all(pred in yaramo_graph.visited for pred in node.predecessors):
+    """
+    With the vertical positions fixed, the horizontal position of a node is the longest path to it from the start nodes,
+    where every edge is weighted by its minimal length (depending on the vertical distance and the number of signals)
+    and the edge the node is generated from may get an additional branch-specific offset.
+    The order in which nodes are generated only depends on the structure of the graph, so it is determined first and
+    the longest paths are then computed level by level over arrays of edge weights.
+    """
+    import numpy as np
+
+    edges_by_nodes = {}
+    for edge in yaramo_graph.edges:
+        # Same as `SchematicGraph.get_edge` for parallel edges
+        edges_by_nodes.setdefault(frozenset((edge.source, edge.target)), edge)
+    order, callers, branches = _get_generation_order(yaramo_graph)
+    if not order:
+        yaramo_graph.reset_generation_helpers()
         return
 
-    for pred in node.predecessors:
-        if pred.is_part_of_main_track and node.is_part_of_main_track and pred.main_track != node.main_track:
-            pred_dist = abs(pred.new_y - node.new_y)
-        else:
-            pred_dist = abs(pred.new_y - node.new_y) + yaramo_graph.get_min_schematic_node_dist(pred, node)
-        horizontal_idx = max(horizontal_idx, pred.new_x + pred_dist)
-
-    for pred in node.predecessors:
-        both_are_part_of_main_track = pred.is_part_of_main_track and node.is_part_of_main_track
-        if pred.new_y != node.new_y and not both_are_part_of_main_track:
-            if not yaramo_graph.get_edge(pred, node).intermediate_geo_node:
-                yaramo_graph.set_breakpoint(horizontal_idx - abs(pred.new_y - node.new_y), pred.new_y, pred, node)
-
+    node_idxs = {node: idx for idx, node in enumerate(order)}
+    pairs = [(pred, node) for node in order for pred in node.predecessors]
+    pair_edges = [edges_by_nodes[frozenset(pair)] for pair in pairs]
+    sources = np.fromiter((node_idxs[pred] for pred, _ in pairs), dtype=int, count=len(pairs))
+    targets = np.fromiter((node_idxs[node] for _, node in pairs), dtype=int, count=len(pairs))
+    min_dists = np.fromiter((max(2, edge.max_num_signals + 1) for edge in pair_edges), dtype=int, count=len(pairs))
+    # 0 if the edge is not the one the node is generated from, 1 if it is, 2 if the node is also the first of a branch
+    caller_kinds = np.fromiter(
+        (
+            0 if pred is not callers[node] else 2 if pred in branches and branches[pred][0] is node else 1
+            for pred, node in pairs
+        ),
+        dtype=int, count=len(pairs)
+    )
+
+    main_tracks = [node.main_track for node in order]
+    main_track_idxs = {}
+    track_idxs = np.array([main_track_idxs.setdefault(track, len(main_track_idxs)) for track in main_tracks])
+    is_main = np.array([track is not None for track in main_tracks], dtype=bool)
+    ys = np.array([node.new_y for node in order])
+
+    y_dists = np.abs(ys[sources] - ys[targets])
+    both_are_part_of_main_track = is_main[sources] & is_main[targets]
+    weights = np.where(
+        both_are_part_of_main_track & (track_idxs[sources] != track_idxs[targets]), y_dists, y_dists + min_dists
+    )
+    offsets = np.where(
+        caller_kinds == 2,
+        np.where(both_are_part_of_main_track, min_dists - 1, min_dists + y_dists),
+        min_dists
+    )
+    weights = np.where(caller_kinds > 0, np.maximum(weights, offsets), weights)
+
+    levels = [0] * len(order)
+    for source, target in zip(sources.tolist(), targets.tolist()):
+        levels[target] = max(levels[target], levels[source] + 1)
+    levels = np.array(levels, dtype=int)
+
+    # All weights are non-negative, so every position starts at 0 (the position of the start nodes).
+    xs = np.zeros(len(order), dtype=weights.dtype if len(weights) else int)
+    edge_order = np.argsort(levels[targets], kind="stable")
+    boundaries = np.searchsorted(levels[targets][edge_order], np.arange(1, levels.max() + 2))
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        level_edges = edge_order[start:end]
+        np.maximum.at(xs, targets[level_edges], xs[sources[level_edges]] + weights[level_edges])
+
+    # Later passes use horizontal lengths as counts, so integral positions have to stay integers.
+    for node, x in zip(order, xs.tolist()):
+        node.new_x = int(x) if float(x).is_integer() else x
+
+    def set_breakpoint(x: float, y: float, edge: SchematicEdge) -> None:
+        breakpoint = EuclideanGeoNode(x, y)
+        edge.intermediate_geo_node = breakpoint
+        yaramo_graph.breakpoints.add(breakpoint)
+
+    for node, (first_node, _) in branches.items():
+        if not (node.is_part_of_main_track and first_node.is_part_of_main_track):
+            set_breakpoint(node.new_x + abs(node.new_y - first_node.new_y), first_node.new_y,
+                           edges_by_nodes[frozenset((node, first_node))])
+
+    for pair_idx in np.flatnonzero((y_dists != 0) & ~both_are_part_of_main_track).tolist():
+        (pred, node), edge = pairs[pair_idx], pair_edges[pair_idx]
+        if not edge.intermediate_geo_node:
+            set_breakpoint(node.new_x - abs(pred.new_y - node.new_y), pred.new_y, edge)
 
-    node.new_x = horizontal_idx
-    yaramo_graph.add_visited_node(node)
+    yaramo_graph.reset_generation_helpers()
 
 
-    if node.num_successors == 0:
-        return
+def _get_generation_order(
+    yaramo_graph: SchematicGraph
+) -> tuple[list[SchematicNode], dict[SchematicNode, SchematicNode | None], dict[SchematicNode, tuple[SchematicNode, SchematicNode]]]:
+    """
+    Traverses the graph depth-first from the start nodes (top to bottom), generating a node as soon as all of its
+    predecessors are generated. Returns the generated nodes in order, the predecessor each node is generated from
+    and the (first, second) generation order of the successors of every node with two successors.
+    """
+    order: list[SchematicNode] = []
+    callers: dict[SchematicNode, SchematicNode | None] = {}
+    branches: dict[SchematicNode, tuple[SchematicNode, SchematicNode]] = {}
+    visited: set[SchematicNode] = set()
 
-    if node.num_successors == 1:
-        next_node = node.successors[0]
-        if next_node not in yaramo_graph.visited:
-            horizontal_idx += yaramo_graph.get_min_schematic_node_dist(node, next_node)
-            _generate_from_node(yaramo_graph, next_node, horizontal_idx)
-
-    if node.num_successors == 2:
-        n0, n1 = node.successors
-        higher_node, lower_node = (n0, n1) if node.slope_to(n0) < node.slope_to(n1) else (n1, n0)
-        first_node, second_node = get_generation_direction(node, higher_node, lower_node)
-
-        if first_node not in yaramo_graph.visited:
-            if node.is_part_of_main_track and first_node.is_part_of_main_track:
-                horizontal_offset = yaramo_graph.get_min_schematic_node_dist(node, first_node) - 1
-            else:
-                y_dist = abs(node.new_y - first_node.new_y)
-                horizontal_offset = yaramo_graph.get_min_schematic_node_dist(node, first_node) + y_dist
-                yaramo_graph.set_breakpoint(horizontal_idx + y_dist, first_node.new_y, node, first_node)
-            _generate_from_node(yaramo_graph, first_node, horizontal_idx + horizontal_offset)
-
-        if second_node not in yaramo_graph.visited:
-            horizontal_idx += yaramo_graph.get_min_schematic_node_dist(node, second_node)
-            _generate_from_node(yaramo_graph, second_node, horizontal_idx)
+    for start_node in sorted(yaramo_graph.start_nodes, key=lambda node: node.new_y):
+        stack = [(None, iter((start_node,)))]
+        while stack:
+            caller, candidates = stack[-1]
+            node = next(candidates, None)
+            if node is None:
+                stack.pop()
+                continue
+            if node in visited or not all(pred in visited for pred in node.predecessors):
+                continue
+
+            visited.add(node)
+            order.append(node)
+            callers[node] = caller
+
+            successors = node.successors
+            if node.num_successors == 2:
+                n0, n1 = node.successors
+                higher_node, lower_node = (n0, n1) if node.slope_to(n0) < node.slope_to(n1) else (n1, n0)
+                branches[node] = get_generation_direction(node, higher_node, lower_node)
+                successors = branches[node]
+            stack.append((node, iter(successors)))
+
+    return order, callers, branches
@@ -0,0 +1,25 @@
+"""
+Frozen copies of the graph, the layout algorithms and the normalisation as they were before any engine-specific
+optimisation. They are only used by the reference engine and must not be changed, so that other engines can be
+compared against them. Only the signal filter was added, which the original graph applied by removing signals.
+"""
+from .horizontal_positioning import generate_horizontal_positions
+from .normalization import normalize_nodes
+from .schematic_edge import SchematicEdge
+from .schematic_graph import SchematicGraph
+from .schematic_node import SchematicNode
+from .signal_processing import process_signals
+from .track_postprocessing import shorten_normal_tracks, stretch_main_tracks
+from .vertical_positioning import generate_vertical_positions
+
+__all__ = [
+    "SchematicEdge",
+    "SchematicGraph",
+    "SchematicNode",
+    "generate_horizontal_positions",
+    "generate_vertical_positions",
+    "normalize_nodes",
+    "shorten_normal_tracks",
+    "stretch_main_tracks",
+    "process_signals"
+]
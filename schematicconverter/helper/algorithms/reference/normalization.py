@@ -0,0 +1,26 @@
+from .schematic_graph import SchematicGraph
+
+
+def normalize_nodes(yaramo_graph: SchematicGraph, scale_factor: float):
+    if yaramo_graph.signal_filter is not None:
+        for edge in yaramo_graph.edges:
+            for signal in edge.yaramo_edge.signals:
+                if not yaramo_graph.signal_filter(signal):
+                    relative_distance = signal.distance_edge / edge.yaramo_edge.length if edge.yaramo_edge.length else 0
+                    edge.set_signal_position(signal, min(max(relative_distance, 0), 1))
+
+    min_x = min([node.new_x for node in yaramo_graph.nodes])
+    min_y = min([node.new_y for node in yaramo_graph.nodes])
+    old_edge_lens = {edge: edge.horizontal_length for edge in yaramo_graph.edges}
+
+    for node in yaramo_graph.nodes:
+        node.new_x = (node.new_x - min_x) / scale_factor
+        node.new_y = (node.new_y - min_y) / scale_factor
+
+    for edge in filter(lambda edge: edge.intermediate_geo_node, yaramo_graph.edges):
+        edge.intermediate_geo_node.x = (edge.intermediate_geo_node.x - min_x) / scale_factor
+        edge.intermediate_geo_node.y = (edge.intermediate_geo_node.y - min_y) / scale_factor
+
+    for edge in yaramo_graph.edges:
+        for signal in edge.yaramo_edge.signals:
+            signal.distance_edge = signal.distance_edge * (edge.horizontal_length / old_edge_lens[edge])
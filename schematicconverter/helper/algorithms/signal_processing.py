@@ -1,35 +1,88 @@
-import numpy as np
-import scipy.optimize
+from __future__ import annotations
+from typing import Iterator
 
-from yaramo.signal import Signal
-
-from ..datastructures import SchematicEdge, SchematicGraph
+from ..datastructures import SchematicGraph, SignalTable
 
 
 def process_signals(yaramo_graph: SchematicGraph):
-    def compute_edge_positions(edge: SchematicEdge, signals: list[Signal]):
-        if not signals:
-            return []
-
-        if edge.horizontal_only_length > 0:
-            epsilon = 1 / edge.horizontal_only_length
-            available_positions = np.linspace(epsilon, 1 - epsilon, edge.horizontal_only_length - 1)
-        else:
-            epsilon = 1 / (edge.horizontal_length + 1)
-            available_positions = np.linspace(epsilon, 1 - epsilon, edge.horizontal_length + 2)
-
-        positions_input = np.array([signal.distance_edge / edge.yaramo_edge.length for signal in signals])
-        cost_matrix = np.abs(positions_input[:, None] - available_positions[None, :])
-        row_ind, col_ind = scipy.optimize.linear_sum_assignment(cost_matrix)
-        sorted_indices = np.argsort(row_ind)
-        assignment = col_ind[sorted_indices]
-        return available_positions[assignment]
-
-    for edge in yaramo_graph.edges:
-        signal_positions_against = sorted(compute_edge_positions(edge, edge.signals_against))
-        for idx, signal in enumerate(sorted(edge.signals_against, key=lambda signal: signal.distance_edge)):
-            edge.set_signal_position(signal, float(signal_positions_against[idx]))
-
-        signal_positions_in = sorted(compute_edge_positions(edge, edge.signals_in))
-        for idx, signal in enumerate(sorted(edge.signals_in, key=lambda signal: signal.distance_edge)):
-            edge.set_signal_position(signal, float(signal_positions_in[idx]))
+    for _ in iter_process_signals(yaramo_graph):
+        pass
+
+
+def iter_process_signals(yaramo_graph: SchematicGraph) -> Iterator[int]:
+    """
+    Same as `process_signals`, but yields once per edge. Every group of signals sharing an edge and a direction is
+    assigned to the evenly spaced slots of the edge with minimal total displacement, keeping the order of the signals.
+    The slots of single signals are computed for all edges at once, larger groups are solved as assignment problems.
+    The resulting distances are kept in the signal table of the graph until they are written back.
+    """
+    import numpy as np
+    import scipy.optimize
+
+    table = yaramo_graph.signal_table
+    horizontal_lengths = table.get_horizontal_lengths()
+    horizontal_only_lengths = horizontal_lengths - np.fromiter(
+        (abs(edge.source.new_y - edge.target.new_y) for edge in table.edges), dtype=float, count=len(table.edges)
+    )
+    # Slots are np.linspace(start, stop, num_slots) of every edge
+    has_horizontal_part = horizontal_only_lengths > 0
+    with np.errstate(divide="ignore"):
+        starts = np.where(has_horizontal_part, 1 / horizontal_only_lengths, 1 / (horizontal_lengths + 1))
+    stops = 1 - starts
+    num_slots = np.where(has_horizontal_part, horizontal_only_lengths - 1, horizontal_lengths + 2).astype(np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        steps = np.where(num_slots > 1, (stops - starts) / (num_slots - 1), 0.0)
+
+    def get_slot(edge_idx: int, slot_idx: np.ndarray) -> np.ndarray:
+        values = slot_idx * steps[edge_idx] + starts[edge_idx]
+        return np.where((slot_idx == num_slots[edge_idx] - 1) & (num_slots[edge_idx] > 1), stops[edge_idx], values)
+
+    groups = [group for group in table.groups if group[1] in (SignalTable.IN, SignalTable.AGAINST)]
+    edge_lengths = np.fromiter(
+        (edge.yaramo_edge.length or 0 for edge in table.edges), dtype=float, count=len(table.edges)
+    )
+    zero_length_edges = [edge_idx for edge_idx, *_ in groups if edge_lengths[edge_idx] == 0]
+    if zero_length_edges:
+        raise ValueError(f"Edge {table.edges[zero_length_edges[0]].uuid} has zero length, its signals cannot be placed.")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_distances = table.original_distances / edge_lengths[table.edge_idxs]
+    slots = np.full(len(table), np.nan)
+
+    single_rows = np.array([start for _, _, start, end in groups if end - start == 1], dtype=np.int64)
+    single_edges = table.edge_idxs[single_rows]
+    unplaceable_rows = single_rows[num_slots[single_edges] < 1]
+    if len(unplaceable_rows) > 0:
+        row = unplaceable_rows[0]
+        raise ValueError(
+            f"Signal {table.signals[row].name} lies beyond the signal slots of edge "
+            f"{table.edges[table.edge_idxs[row]].uuid}, the horizontal part of the edge is too short."
+        )
+
+    # The nearest slot of a single signal, on ties the first one like the assignment problem
+    nearest = np.floor((relative_distances[single_rows] - starts[single_edges]) / np.where(
+        steps[single_edges] > 0, steps[single_edges], 1.0
+    ))
+    candidates = np.clip(nearest[:, None] + np.arange(-1, 3)[None, :], 0, (num_slots[single_edges] - 1)[:, None])
+    candidate_slots = get_slot(single_edges[:, None], candidates)
+    costs = np.abs(relative_distances[single_rows][:, None] - candidate_slots)
+    slots[single_rows] = candidate_slots[np.arange(len(single_rows)), np.argmin(costs, axis=1)]
+
+    groups_by_edge: dict[int, list[tuple[int, int]]] = {}
+    for edge_idx, _, start, end in groups:
+        if end - start > 1:
+            groups_by_edge.setdefault(edge_idx, []).append((start, end))
+
+    for edge_idx in range(len(table.edges)):
+        for start, end in groups_by_edge.get(edge_idx, ()):
+            if num_slots[edge_idx] < end - start:
+                raise ValueError(
+                    f"Edge {table.edges[edge_idx].uuid} has {max(num_slots[edge_idx], 0)} signal slots per direction, "
+                    f"but {end - start} signals in one direction."
+                )
+            available_slots = get_slot(edge_idx, np.arange(num_slots[edge_idx]))
+            cost_matrix = np.abs(relative_distances[start:end, None] - available_slots[None, :])
+            _, col_ind = scipy.optimize.linear_sum_assignment(cost_matrix)
+            slots[start:end] = np.sort(available_slots[col_ind])
+        yield 1
+
+    table.place(slots)
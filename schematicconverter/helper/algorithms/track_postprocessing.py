@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from ..datastructures import SchematicEdge, SchematicGraph, SchematicNode
 
 
@@ -13,6 +15,12 @@ def stretch_main_tracks(yaramo_graph: SchematicGraph) -> None:
 
 
 def shorten_normal_tracks(yaramo_graph: SchematicGraph) -> None:
+    for _ in iter_shorten_normal_tracks(yaramo_graph):
+        pass
+
+
+def iter_shorten_normal_tracks(yaramo_graph: SchematicGraph) -> Iterator[int]:
+    """Same as `shorten_normal_tracks`, but yields once per edge."""
     def get_default_node_dist(node_a: SchematicNode, node_b: SchematicNode) -> int:
         return max(2, yaramo_graph.get_max_num_signals(node_a, node_b) + 1) + abs(node_a.new_y - node_b.new_y)
 
@@ -44,3 +52,4 @@ def shorten_normal_tracks(yaramo_graph: SchematicGraph) -> None:
                     for e in node.successor_edges:
                         if e.intermediate_geo_node and (e != edge or e.intermediate_geo_node.y != node.new_y):
                             e.intermediate_geo_node.x += overhang_dist
+        yield 1
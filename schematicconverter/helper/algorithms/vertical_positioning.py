@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from yaramo.geo_node import EuclideanGeoNode
 
 from ..datastructures import SchematicGraph, SchematicNode
@@ -5,34 +7,88 @@ from ..utils import get_generation_direction
 
 
 def generate_vertical_positions(yaramo_graph: SchematicGraph):
+    for _ in iter_generate_vertical_positions(yaramo_graph):
+        pass
+
+
+def iter_generate_vertical_positions(yaramo_graph: SchematicGraph) -> Iterator[int]:
+    """Same as `generate_vertical_positions`, but yields once per positioned node."""
     for start_node in yaramo_graph.get_start_nodes_in_order():
         vertical_idx = max(
             [max(node.new_y for node in yaramo_graph.visited) if yaramo_graph.visited else -1] +
             [max(breakpoint.y for breakpoint in yaramo_graph.breakpoints) if yaramo_graph.breakpoints else -1]
         )
-        _generate_from_node(yaramo_graph, start_node, 0, vertical_idx + 1)
+        yield from _generate_from_node(yaramo_graph, start_node, 0, vertical_idx + 1)
 
     yaramo_graph.reset_generation_helpers()
     yaramo_graph.reset_intermediate_geo_nodes()
 
 
-
-def _generate_from_node(yaramo_graph: SchematicGraph, node: SchematicNode, horizontal_idx: int, vertical_idx: int) -> None:
-    def shift_existing_nodes(vertical_idx_threshold: int) -> None:
-        adjusted_breakpoints: set[EuclideanGeoNode] = set()
-        for node in yaramo_graph.visited:
-            if node.new_y <= vertical_idx_threshold:
-                node.new_y -= 1
-
-                for edge in node.connected_edges:
-                    breakpoint = edge.intermediate_geo_node
-                    if breakpoint and breakpoint.y <= vertical_idx_threshold and breakpoint not in adjusted_breakpoints:
-                        adjusted_breakpoints.add(breakpoint)
-                        breakpoint.y -= 1
-
+def _generate_from_node(
+    yaramo_graph: SchematicGraph,
+    start_node: SchematicNode,
+    horizontal_idx: int,
+    vertical_idx: int
+) -> Iterator[int]:
+    """
+    Positions the nodes depth-first from `start_node`. The traversal uses an explicit stack instead of recursion, where
+    a node with two successors leaves an entry to continue with its second successor once the first one is done.
+    """
+    stack: list[tuple[SchematicNode, int, int, SchematicNode | None]] = [
+        (start_node, horizontal_idx, vertical_idx, None)
+    ]
+    while stack:
+        node, horizontal_idx, vertical_idx, second_node = stack.pop()
+        if second_node is not None:
+            if second_node not in yaramo_graph.visited:
+                horizontal_idx += yaramo_graph.get_min_schematic_node_dist(node, second_node)
+                stack.append((second_node, horizontal_idx, vertical_idx, None))
+            continue
+
+        position = _position_node(yaramo_graph, node, horizontal_idx, vertical_idx)
+        if position is None:
+            continue
+        horizontal_idx, vertical_idx = position
+        yield 1
+
+        if node.num_successors == 1:
+            next_node = node.successors[0]
+            if next_node not in yaramo_graph.visited:
+                horizontal_idx += yaramo_graph.get_min_schematic_node_dist(node, next_node)
+                if any(yaramo_graph.get_edge(p, next_node).intermediate_geo_node for p in next_node.predecessors):
+                    vertical_idx -= 1
+                stack.append((next_node, horizontal_idx, vertical_idx, None))
+
+        if node.num_successors == 2:
+            n0, n1 = node.successors
+            higher_node, lower_node = (n0, n1) if node.slope_to(n0) < node.slope_to(n1) else (n1, n0)
+            first_node, second_node = get_generation_direction(node, higher_node, lower_node)
+            dy = -1 if first_node == higher_node else 1
+
+            stack.append((node, horizontal_idx, vertical_idx, second_node))
+            if first_node not in yaramo_graph.visited:
+                if node.is_part_of_main_track and first_node.is_part_of_main_track:
+                    horizontal_offset = yaramo_graph.get_min_schematic_node_dist(node, first_node) - 1
+                    vertical_offset = dy * (horizontal_offset)
+                else:
+                    horizontal_offset = yaramo_graph.get_min_schematic_node_dist(node, first_node) + 1
+                    vertical_offset = dy
+                    if horizontal_idx < yaramo_graph.max_horizontal_idxs[vertical_idx + vertical_offset]:
+                        _shift_existing_nodes(yaramo_graph, vertical_idx + vertical_offset)
+                    yaramo_graph.set_breakpoint(horizontal_idx + 1, vertical_idx + vertical_offset, node, first_node)
+                stack.append((first_node, horizontal_idx + horizontal_offset, vertical_idx + vertical_offset, None))
+
+
+def _position_node(
+    yaramo_graph: SchematicGraph,
+    node: SchematicNode,
+    horizontal_idx: int,
+    vertical_idx: int
+) -> tuple[int, int] | None:
+    """Positions `node` once all of its predecessors are positioned and returns its position."""
     if not all(pred in yaramo_graph.visited for pred in node.predecessors):
         yaramo_graph.max_horizontal_idxs[vertical_idx] = float('inf')
-        return
+        return None
 
     if node.num_predecessors == 2:
         if all(node.original_y <= pred.original_y for pred in node.predecessors):
@@ -58,41 +114,20 @@ def _generate_from_node(yaramo_graph: SchematicGraph, node: SchematicNode, horiz
                 yaramo_graph.set_breakpoint(horizontal_idx - abs(pred.new_y - vertical_idx), pred.new_y, pred, node)
                 yaramo_graph.max_horizontal_idxs[pred.new_y] = horizontal_idx - abs(pred.new_y - vertical_idx)
 
-
     node.new_x = horizontal_idx
     node.new_y = vertical_idx
     yaramo_graph.add_visited_node(node)
+    return horizontal_idx, vertical_idx
+
 
+def _shift_existing_nodes(yaramo_graph: SchematicGraph, vertical_idx_threshold: int) -> None:
+    adjusted_breakpoints: set[EuclideanGeoNode] = set()
+    for node in yaramo_graph.visited:
+        if node.new_y <= vertical_idx_threshold:
+            node.new_y -= 1
 
-    if node.num_successors == 0:
-        return
-
-    if node.num_successors == 1:
-        next_node = node.successors[0]
-        if next_node not in yaramo_graph.visited:
-            horizontal_idx += yaramo_graph.get_min_schematic_node_dist(node, next_node)
-            if any(yaramo_graph.get_edge(p, next_node).intermediate_geo_node for p in next_node.predecessors):
-                vertical_idx -= 1
-            _generate_from_node(yaramo_graph, next_node, horizontal_idx, vertical_idx)
-
-    if node.num_successors == 2:
-        n0, n1 = node.successors
-        higher_node, lower_node = (n0, n1) if node.slope_to(n0) < node.slope_to(n1) else (n1, n0)
-        first_node, second_node = get_generation_direction(node, higher_node, lower_node)
-        dy = -1 if first_node == higher_node else 1
-
-        if first_node not in yaramo_graph.visited:
-            if node.is_part_of_main_track and first_node.is_part_of_main_track:
-                horizontal_offset = yaramo_graph.get_min_schematic_node_dist(node, first_node) - 1
-                vertical_offset = dy * (horizontal_offset)
-            else:
-                horizontal_offset = yaramo_graph.get_min_schematic_node_dist(node, first_node) + 1
-                vertical_offset = dy
-                if horizontal_idx < yaramo_graph.max_horizontal_idxs[vertical_idx + vertical_offset]:
-                    shift_existing_nodes(vertical_idx + vertical_offset)
-                yaramo_graph.set_breakpoint(horizontal_idx + 1, vertical_idx + vertical_offset, node, first_node)
-            _generate_from_node(yaramo_graph, first_node, horizontal_idx + horizontal_offset, vertical_idx + vertical_offset)
-
-        if second_node not in yaramo_graph.visited:
-            horizontal_idx += yaramo_graph.get_min_schematic_node_dist(node, second_node)
-            _generate_from_node(yaramo_graph, second_node, horizontal_idx, vertical_idx)
+            for edge in node.connected_edges:
+                breakpoint = edge.intermediate_geo_node
+                if breakpoint and breakpoint.y <= vertical_idx_threshold and breakpoint not in adjusted_breakpoints:
+                    adjusted_breakpoints.add(breakpoint)
+                    breakpoint.y -= 1
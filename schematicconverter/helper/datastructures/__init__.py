@@ -1,5 +1,10 @@
+from .graph_snapshot import GraphSnapshot
 from .schematic_edge import SchematicEdge
 from .schematic_graph import SchematicGraph
 from .schematic_node import SchematicNode
+from .signal_filter import SignalFilter, SignalPredicate, get_signal_filter
+from .signal_table import SignalTable
+from .time_budget import TimeBudget
 
-__all__ = ["SchematicEdge", "SchematicGraph", "SchematicNode"]
\ No newline at end of file
+__all__ = ["GraphSnapshot", "SchematicEdge", "SchematicGraph", "SchematicNode", "SignalFilter", "SignalPredicate", "SignalTable",
+           "TimeBudget", "get_signal_filter"]
\ No newline at end of file
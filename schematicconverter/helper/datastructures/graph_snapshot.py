@@ -0,0 +1,100 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .schematic_graph import SchematicGraph
+
+
+class GraphSnapshot:
+    """
+    Result of the graph analysis of a `SchematicGraph` (normalised coordinates, edge directions, heights,
+    reachability, track membership and the order of the start nodes), keyed by uuid.
+    The analysis only depends on the structure of a topology, so it can be reused for every set of conversion options.
+    The snapshot also keeps the original signal distances, which overwrite the `distance_edge` of the signals when it
+    is restored, so that a topology can be converted again after a conversion changed its signals.
+    The nodes of every edge are kept to reject snapshots of other topologies.
+    """
+    version: int = 2
+
+    def __init__(
+        self,
+        coordinates: dict[str, tuple[float, float]],
+        predecessors: dict[str, list[str]],
+        successors: dict[str, list[str]],
+        heights: dict[str, int],
+        reachable_nodes: dict[str, list[str]],
+        tracks: dict[str, list[str]],
+        start_nodes_in_order: list[str],
+        signal_distances: dict[str, float],
+        edges: dict[str, tuple[str, str]]
+    ):
+        self.coordinates: dict[str, tuple[float, float]] = coordinates
+        self.predecessors: dict[str, list[str]] = predecessors
+        self.successors: dict[str, list[str]] = successors
+        self.heights: dict[str, int] = heights
+        self.reachable_nodes: dict[str, list[str]] = reachable_nodes
+        self.tracks: dict[str, list[str]] = tracks
+        self.start_nodes_in_order: list[str] = start_nodes_in_order
+        self.signal_distances: dict[str, float] = signal_distances
+        self.edges: dict[str, tuple[str, str]] = edges
+
+    @classmethod
+    def from_graph(cls, yaramo_graph: SchematicGraph) -> GraphSnapshot:
+        nodes = sorted(yaramo_graph.nodes, key=lambda node: node.uuid)
+        return cls(
+            coordinates={node.uuid: node.original_coords for node in nodes},
+            predecessors={node.uuid: [pred.uuid for pred in node.predecessors] for node in nodes},
+            successors={node.uuid: [succ.uuid for succ in node.successors] for node in nodes},
+            heights={node.uuid: node.height for node in nodes},
+            reachable_nodes={node.uuid: sorted(n.uuid for n in node.reachable_nodes) for node in nodes},
+            tracks={node.uuid: sorted(track.uuid for track in node.tracks) for node in nodes},
+            start_nodes_in_order=[node.uuid for node in yaramo_graph.get_start_nodes_in_order()],
+            signal_distances={
+                signal.uuid: signal.distance_edge
+                for edge in yaramo_graph.edges
+                for signal in edge.yaramo_edge.signals
+            },
+            edges={
+                edge.uuid: (edge.yaramo_edge.node_a.uuid, edge.yaramo_edge.node_b.uuid)
+                for edge in sorted(yaramo_graph.edges, key=lambda edge: edge.uuid)
+            }
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.version,
+            "coordinates": {uuid: list(coords) for uuid, coords in self.coordinates.items()},
+            "predecessors": self.predecessors,
+            "successors": self.successors,
+            "heights": self.heights,
+            "reachable_nodes": self.reachable_nodes,
+            "tracks": self.tracks,
+            "start_nodes_in_order": self.start_nodes_in_order,
+            "signal_distances": self.signal_distances,
+            "edges": {uuid: list(node_uuids) for uuid, node_uuids in self.edges.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> GraphSnapshot:
+        if data.get("version") != cls.version:
+            raise ValueError(f"Unsupported snapshot version {data.get('version')}.")
+        return cls(
+            coordinates={uuid: tuple(coords) for uuid, coords in data["coordinates"].items()},
+            predecessors=data["predecessors"],
+            successors=data["successors"],
+            heights=data["heights"],
+            reachable_nodes=data["reachable_nodes"],
+            tracks=data["tracks"],
+            start_nodes_in_order=data["start_nodes_in_order"],
+            signal_distances=data["signal_distances"],
+            edges={uuid: tuple(node_uuids) for uuid, node_uuids in data["edges"].items()}
+        )
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path: str | Path) -> GraphSnapshot:
+        return cls.from_dict(json.loads(Path(path).read_text()))
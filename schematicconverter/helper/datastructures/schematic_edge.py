@@ -2,11 +2,12 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from yaramo.edge import Edge as YaramoEdge
-from yaramo.signal import Signal as YaramoSignal, SignalDirection
+from yaramo.signal import Signal as YaramoSignal
 from yaramo.geo_node import EuclideanGeoNode
 
 if TYPE_CHECKING:
     from .schematic_node import SchematicNode
+    from .signal_table import SignalTable
 
 
 class SchematicEdge:
@@ -20,16 +21,9 @@ class SchematicEdge:
         self.source, self.target = sorted(
             (helper_node_a, helper_node_b), key=lambda node: (node.original_x, node.original_y)
         )
-        self.signals_in: set[YaramoSignal] = {
-            signal for signal in self.yaramo_edge.signals
-            if (signal.direction == SignalDirection.IN and self.source.yaramo_node == self.yaramo_edge.node_a) or
-               (signal.direction == SignalDirection.GEGEN and self.source.yaramo_node == self.yaramo_edge.node_b)
-        }
-        self.signals_against: set[YaramoSignal] = {
-            signal for signal in self.yaramo_edge.signals
-            if (signal.direction == SignalDirection.IN and self.source.yaramo_node == self.yaramo_edge.node_b) or
-               (signal.direction == SignalDirection.GEGEN and self.source.yaramo_node == self.yaramo_edge.node_a)
-        }
+        # Signals are counted per direction for all edges at once by the signal table of the graph
+        self._signal_table: SignalTable | None = None
+        self._signal_table_idx: int = -1
         yaramo_edge.intermediate_geo_nodes = []
 
     @property
@@ -42,7 +36,15 @@ class SchematicEdge:
 
     @property
     def max_num_signals(self) -> int:
-        return max(len(self.signals_in), len(self.signals_against))
+        if self._signal_table is None:
+            from .signal_table import SignalTable
+
+            # Edges built without a graph count their own signals on first access
+            SignalTable([self])
+        return self._signal_table.max_num_signals[self._signal_table_idx]
+
+    def set_signal_table(self, signal_table: SignalTable, idx: int) -> None:
+        self._signal_table, self._signal_table_idx = signal_table, idx
 
     @property
     def intermediate_geo_node(self) -> EuclideanGeoNode:
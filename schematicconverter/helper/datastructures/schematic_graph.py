@@ -1,26 +1,60 @@
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 from itertools import combinations
-from statistics import mean
+from typing import Callable, Iterator
 
 from yaramo.geo_node import EuclideanGeoNode
 from yaramo.model import Topology as YaramoTopology
-from yaramo.signal import SignalSystem
 
+from .graph_snapshot import GraphSnapshot
 from .schematic_edge import SchematicEdge
 from .schematic_node import SchematicNode
+from .signal_filter import SignalPredicate, get_signal_filter
+from .signal_table import SignalTable
+from .time_budget import TimeBudget
 
 
 class SchematicGraph:
-    def __init__(self, topology: YaramoTopology, remove_non_ks_signals: bool = False):
+    def __init__(
+        self,
+        topology: YaramoTopology,
+        remove_non_ks_signals: bool = False,
+        snapshot: GraphSnapshot | None = None,
+        time_budget: TimeBudget | None = None,
+        signal_filter: SignalPredicate | None = None,
+        defer_build: bool = False
+    ):
+        """With `defer_build`, the graph is only built by consuming `iter_build`, e.g. by a step-wise conversion."""
         self.topology: YaramoTopology = topology
+        # Signals rejected by the filter are left in the topology and take no space in the layout
+        self.signal_filter: SignalPredicate | None = get_signal_filter(signal_filter, remove_non_ks_signals)
+        self.time_budget: TimeBudget = time_budget or TimeBudget()
         self.nodes: set[SchematicNode] = set()
         self.edges: set[SchematicEdge] = set()
         self.breakpoints: set[EuclideanGeoNode] = set()
         self.max_horizontal_idxs: defaultdict[int, int | float] = defaultdict(int)
         self.visited: set[SchematicNode] = set()
+        self._start_nodes_in_order: list[SchematicNode] | None = None
+        self._edges_by_nodes: dict[frozenset[SchematicNode], SchematicEdge] | None = None
+        self.signal_table: SignalTable | None = None
+        self._snapshot: GraphSnapshot | None = snapshot
 
-        self._process_planpro_topology(remove_non_ks_signals=remove_non_ks_signals)
-        self._compute_graph_properties()
+        if not defer_build:
+            for _ in self.iter_build():
+                pass
+
+    def iter_build(self) -> Iterator[int]:
+        """
+        Builds the graph from the topology or the snapshot and yields the number of processed nodes per unit.
+        Every unit allocates at most memory linear in the size of the topology, the reachability of every node
+        is a unit of its own.
+        """
+        snapshot, self._snapshot = self._snapshot, None
+        if snapshot is None:
+            yield from self._iter_process_planpro_topology()
+            yield from self._iter_compute_graph_properties()
+        else:
+            self._restore_snapshot(snapshot)
+            yield len(self.nodes)
 
     def add_node(self, node: SchematicNode) -> None:
         self.nodes.add(node)
@@ -29,6 +63,7 @@ class SchematicGraph:
         edge.source.add_connected_edge(edge)
         edge.target.add_connected_edge(edge)
         self.edges.add(edge)
+        self._edges_by_nodes = None
 
     def add_visited_node(self, node: SchematicNode) -> None:
         self.visited.add(node)
@@ -54,10 +89,12 @@ class SchematicGraph:
         return None
 
     def get_edge(self, node_a: SchematicNode, node_b: SchematicNode) -> SchematicEdge | None:
-        for edge in self.edges:
-            if {edge.source, edge.target} == {node_a, node_b}:
-                return edge
-        return None
+        if self._edges_by_nodes is None:
+            # Of parallel edges, the first one in the iteration order of `edges` is returned
+            self._edges_by_nodes = {}
+            for edge in self.edges:
+                self._edges_by_nodes.setdefault(frozenset((edge.source, edge.target)), edge)
+        return self._edges_by_nodes.get(frozenset((node_a, node_b)))
 
     def get_max_num_signals(self, node_a: SchematicNode, node_b: SchematicNode) -> int:
         if node_b not in node_a.connected_nodes:
@@ -76,8 +113,37 @@ class SchematicGraph:
         """
         It is very important that we know the correct subsequent order of the start nodes along the y-axis
         even before we start generating the schematic overview.
+        If the time budget is exceeded, the start nodes are ordered by their original y-coordinate instead
+        and the minimal cover is replaced by a greedy cover.
         """
-        def get_start_node_reachability() -> dict[SchematicNode, set[SchematicNode]]:
+        for _ in self.iter_start_nodes_in_order():
+            pass
+        return list(self._start_nodes_in_order)
+
+    def iter_start_nodes_in_order(self) -> Iterator[int]:
+        """
+        Same as `get_start_nodes_in_order`, but yields after every node visited by the reachability search and after
+        every 1024 combinations checked by the cover search.
+        """
+        from statistics import mean
+
+        if self._start_nodes_in_order is not None:
+            return
+
+        def iter_crossing_edges() -> Iterator[int]:
+            """Finds the edges that cross another edge strictly, only edges with overlapping x-extents are compared."""
+            crossing_edges = set()
+            active = []
+            for edge in sorted(self.edges, key=lambda edge: edge.source.original_coords):
+                active = [other for other in active if other.target.original_x >= edge.source.original_x]
+                for other in active:
+                    if edge.intersects_strictly(other):
+                        crossing_edges.update((edge, other))
+                active.append(edge)
+                yield 1
+            return crossing_edges
+
+        def iter_start_node_reachability() -> Iterator[int]:
             reachable_nodes = {}
 
             for start in self.start_nodes:
@@ -86,54 +152,85 @@ class SchematicGraph:
                 stack = [start]
 
                 while stack:
+                    if self.time_budget.exceeded:
+                        return None
                     current = stack.pop()
                     for succ in current.successors:
                         edge = self.get_edge(current, succ)
-                        if succ not in visited and not any(edge.intersects_strictly(e) for e in self.edges):
+                        if succ not in visited and edge not in crossing_edges:
                             visited.add(succ)
                             reachable.add(succ)
                             stack.append(succ)
+                    yield 1
 
                 reachable_nodes[start] = reachable
 
             return reachable_nodes
 
-        def find_minimal_cover() -> list[SchematicNode]:
+        def iter_minimal_cover(reachable_nodes: dict[SchematicNode, set[SchematicNode]]) -> Iterator[int]:
             """Finds a minimal set of nodes that can be reached from all start nodes."""
-            reachable_nodes = get_start_node_reachability()
             reachable_sets = [reachable_nodes[start_node] for start_node in self.start_nodes]
+            num_checked_combos = 0
             for size in range(1, len(self.start_nodes) + 1):
                 for combo in combinations(self.nodes, size):
+                    num_checked_combos += 1
+                    if num_checked_combos % 1024 == 0:
+                        if self.time_budget.exceeded:
+                            self.time_budget.use_fallback("greedy_cover")
+                            return find_greedy_cover(reachable_sets)
+                        yield 1024
                     if all(set(combo) & reachable for reachable in reachable_sets):
                         return list(combo)
 
-
-        def collect_predecessors(node: SchematicNode, visited: set[SchematicNode], result: list[SchematicNode]) -> None:
-            """Recursively traverses predecessors in descending slope order and collects start nodes."""
-            if node in visited:
-                return
-            visited.add(node)
-
-            if node.is_start_node and node not in result:
-                result.append(node)
-
-            for pred in sorted(node.predecessors, key=lambda pred: node.slope_to(pred), reverse=True):
-                edge = self.get_edge(pred, node)
-                if not any(edge.intersects_strictly(e) for e in self.edges):
-                    collect_predecessors(pred, visited, result)
+        def find_greedy_cover(reachable_sets: list[set[SchematicNode]]) -> list[SchematicNode]:
+            """Repeatedly picks the node that can be reached from most of the remaining start nodes."""
+            cover = []
+            while reachable_sets:
+                counts = Counter(node for reachable in reachable_sets for node in reachable)
+                if not counts:
+                    break
+                node = max(counts, key=counts.get)
+                cover.append(node)
+                reachable_sets = [reachable for reachable in reachable_sets if node not in reachable]
+            return cover
+
+
+        def collect_predecessors(node: SchematicNode, result: list[SchematicNode]) -> None:
+            """Traverses predecessors depth-first in descending slope order and collects start nodes."""
+            visited = set()
+            stack = [node]
+            while stack:
+                node = stack.pop()
+                if node in visited:
+                    continue
+                visited.add(node)
+
+                if node.is_start_node and node not in result:
+                    result.append(node)
+
+                preds = sorted(node.predecessors, key=lambda pred: node.slope_to(pred), reverse=True)
+                stack.extend(pred for pred in reversed(preds) if self.get_edge(pred, node) not in crossing_edges)
+
+        crossing_edges = yield from iter_crossing_edges()
+        reachable_nodes = yield from iter_start_node_reachability()
+        if reachable_nodes is None:
+            self.time_budget.use_fallback("start_nodes_by_original_y")
+            self._start_nodes_in_order = sorted(self.start_nodes, key=lambda node: (node.original_y, node.original_x))
+            return
 
         cover_nodes = sorted(
-            find_minimal_cover(),
+            (yield from iter_minimal_cover(reachable_nodes)),
             key=lambda node: mean([n.original_y for n in node.reaching_nodes if n.is_start_node])
         )
         result = []
         for node in cover_nodes:
-            collect_predecessors(node, set(), result)
+            collect_predecessors(node, result)
+            yield 1
 
-        return result
+        self._start_nodes_in_order = result
 
 
-    def _process_planpro_topology(self, remove_non_ks_signals: bool) -> None:
+    def _iter_process_planpro_topology(self) -> Iterator[int]:
         def _compute_nodes() -> None:
             for node in self.topology.nodes.values():
                 self.add_node(SchematicNode(node))
@@ -149,33 +246,73 @@ class SchematicGraph:
                 node.new_x = node.original_x
                 node.new_y = node.original_y
 
-        def _compute_edges() -> None:
-            for yaramo_edge in self.topology.edges.values():
-                if remove_non_ks_signals:
-                    for idx in reversed(range(len(yaramo_edge.signals))):
-                        yaramo_signal = yaramo_edge.signals[idx]
-                        if yaramo_signal.system != SignalSystem.Ks:
-                            yaramo_edge.signals.pop(idx)
-                            self.topology.signals.pop(yaramo_signal.uuid)
-                self.add_edge(SchematicEdge(
-                    yaramo_edge=yaramo_edge,
-                    helper_node_a=self.get_element_by_id(yaramo_edge.node_a.uuid),
-                    helper_node_b=self.get_element_by_id(yaramo_edge.node_b.uuid)
-                ))
-
         def _compute_tracks():
+            nodes_by_uuid = {node.uuid: node for node in self.nodes}
             for yaramo_track in self.topology.tracks.values():
                 for yaramo_node in yaramo_track.nodes:
-                    self.get_element_by_id(yaramo_node.uuid).add_track(yaramo_track)
+                    nodes_by_uuid[yaramo_node.uuid].add_track(yaramo_track)
 
 
         _compute_nodes()
-        _compute_edges()
+        yield len(self.nodes)
+        self._compute_edges()
+        yield len(self.nodes)
         _compute_tracks()
-
-
-
-    def _compute_graph_properties(self) -> None:
+        yield len(self.nodes)
+
+    def _compute_edges(self) -> None:
+        nodes_by_uuid = {node.uuid: node for node in self.nodes}
+        for yaramo_edge in self.topology.edges.values():
+            self.add_edge(SchematicEdge(
+                yaramo_edge=yaramo_edge,
+                helper_node_a=nodes_by_uuid[yaramo_edge.node_a.uuid],
+                helper_node_b=nodes_by_uuid[yaramo_edge.node_b.uuid]
+            ))
+        self.signal_table = SignalTable(list(self.edges), self.signal_filter)
+
+    def _restore_snapshot(self, snapshot: GraphSnapshot) -> None:
+        if set(snapshot.coordinates) != set(self.topology.nodes):
+            raise ValueError("Given snapshot does not match the nodes of the topology.")
+        edges = {uuid: (edge.node_a.uuid, edge.node_b.uuid) for uuid, edge in self.topology.edges.items()}
+        if snapshot.edges != edges:
+            raise ValueError("Given snapshot does not match the edges of the topology.")
+        tracks: dict[str, set[str]] = {uuid: set() for uuid in self.topology.nodes}
+        for yaramo_track in self.topology.tracks.values():
+            for yaramo_node in yaramo_track.nodes:
+                tracks[yaramo_node.uuid].add(yaramo_track.uuid)
+        if {uuid: set(track_uuids) for uuid, track_uuids in snapshot.tracks.items()} != tracks:
+            raise ValueError("Given snapshot does not match the tracks of the topology.")
+
+        for yaramo_node in self.topology.nodes.values():
+            node = SchematicNode(yaramo_node)
+            node.original_x, node.original_y = snapshot.coordinates[node.uuid]
+            node.new_x, node.new_y = node.original_x, node.original_y
+            node.height = snapshot.heights[node.uuid]
+            self.add_node(node)
+
+        for yaramo_signal in self.topology.signals.values():
+            if yaramo_signal.uuid in snapshot.signal_distances:
+                yaramo_signal.distance_edge = snapshot.signal_distances[yaramo_signal.uuid]
+
+        self._compute_edges()
+
+        nodes_by_uuid = {node.uuid: node for node in self.nodes}
+        for node in self.nodes:
+            for uuid in snapshot.predecessors[node.uuid]:
+                node.add_predecessor(nodes_by_uuid[uuid])
+            for uuid in snapshot.successors[node.uuid]:
+                node.add_successor(nodes_by_uuid[uuid])
+            for uuid in snapshot.reachable_nodes[node.uuid]:
+                node.add_reachable_node(nodes_by_uuid[uuid])
+                nodes_by_uuid[uuid].add_reaching_node(node)
+            for uuid in snapshot.tracks[node.uuid]:
+                node.add_track(self.topology.tracks[uuid])
+
+        self._start_nodes_in_order = [nodes_by_uuid[uuid] for uuid in snapshot.start_nodes_in_order]
+
+
+
+    def _iter_compute_graph_properties(self) -> Iterator[int]:
         def _compute_predecessors_and_successors():
             for node in self.nodes:
                 for edge in node.connected_edges:
@@ -199,46 +336,58 @@ class SchematicGraph:
 
 
         def _compute_heights():
-            def compute_height(node: SchematicNode):
-                if node.height is not None:
-                    return node.height
-                if not node.successors:
-                    node.height = 0
-                else:
-                    node.height = 1 + max(compute_height(child) for child in node.successors)
-                return node.height
-
-            for node in self.nodes:
-                compute_height(node)
+            for root in self.nodes:
+                for node in _iter_post_order(root, lambda node: node.height is not None):
+                    node.height = 1 + max((child.height for child in node.successors), default=-1)
 
 
-        def _compute_reachability():
+        def _iter_reachability():
             computed_reachability = {}
 
-            def get_reachable_nodes(node: SchematicNode):
-                if node in computed_reachability:
-                    return computed_reachability[node]
-
-                reachable = set()
-                for successor in node.successors:
-                    reachable.add(successor)
-                    reachable.update(get_reachable_nodes(successor))
-
-                computed_reachability[node] = reachable
-                return reachable
-
-            # Compute forward reachability
-            for node in self.nodes:
-                reachable_nodes = get_reachable_nodes(node)
-                for reachable_node in reachable_nodes:
-                    node.add_reachable_node(reachable_node)
+            # Compute forward reachability, every node after its successors
+            for root in self.nodes:
+                for node in _iter_post_order(root, lambda node: node in computed_reachability):
+                    reachable = set()
+                    for successor in node.successors:
+                        reachable.add(successor)
+                        reachable.update(computed_reachability[successor])
+                    computed_reachability[node] = reachable
+                    for reachable_node in reachable:
+                        node.add_reachable_node(reachable_node)
+                    yield 1
 
             # Compute backward reachability
             for node in self.nodes:
                 for reachable_node in node.reachable_nodes:
                     reachable_node.add_reaching_node(node)
+                yield 1
 
 
         _compute_predecessors_and_successors()
+        yield len(self.nodes)
         _compute_heights()
-        _compute_reachability()
+        yield len(self.nodes)
+        yield from _iter_reachability()
+
+
+def _iter_post_order(root: SchematicNode, is_done: Callable[[SchematicNode], bool]) -> Iterator[SchematicNode]:
+    """
+    Yields `root` and its direct and indirect successors that are not done yet, every node after its successors.
+    A node has to be done once it was yielded. Uses an explicit stack, so that long chains of nodes do not recurse.
+    """
+    if is_done(root):
+        return
+    path = {root}
+    stack = [(root, iter(root.successors))]
+    while stack:
+        node, successors = stack[-1]
+        child = next((child for child in successors if not is_done(child)), None)
+        if child is None:
+            stack.pop()
+            path.remove(node)
+            yield node
+        elif child in path:
+            raise ValueError(f"Detected a cycle of successors at node {child.uuid}.")
+        else:
+            path.add(child)
+            stack.append((child, iter(child.successors)))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from typing import Callable, Iterable
+
+from yaramo.signal import Signal as YaramoSignal
+from yaramo.signal import SignalDirection, SignalKind, SignalSystem
+
+SignalPredicate = Callable[[YaramoSignal], bool]
+
+
+class SignalFilter:
+    """
+    Selects the signals of the given systems, kinds and directions, where `None` selects all values.
+    Signals that are not selected stay in the topology at the relative position of their original distance, but take
+    no space in the layout and are not shown by the overview.
+    Any callable that takes a signal and returns a bool can be used in place of a `SignalFilter`.
+    """
+
+    def __init__(
+        self,
+        systems: Iterable[SignalSystem | None] | None = None,
+        kinds: Iterable[SignalKind | None] | None = None,
+        directions: Iterable[SignalDirection | None] | None = None
+    ):
+        self.systems: frozenset[SignalSystem | None] | None = None if systems is None else frozenset(systems)
+        self.kinds: frozenset[SignalKind | None] | None = None if kinds is None else frozenset(kinds)
+        self.directions: frozenset[SignalDirection | None] | None = None if directions is None else frozenset(directions)
+
+    def __call__(self, signal: YaramoSignal) -> bool:
+        return (self.systems is None or signal.system in self.systems) and \
+               (self.kinds is None or signal.kind in self.kinds) and \
+               (self.directions is None or signal.direction in self.directions)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SignalFilter):
+            return NotImplemented
+        return (self.systems, self.kinds, self.directions) == (other.systems, other.kinds, other.directions)
+
+    def __hash__(self) -> int:
+        return hash((self.systems, self.kinds, self.directions))
+
+    def __repr__(self) -> str:
+        return f"SignalFilter(systems={self.systems}, kinds={self.kinds}, directions={self.directions})"
+
+
+def get_signal_filter(
+    signal_filter: SignalPredicate | None = None,
+    remove_non_ks_signals: bool = False
+) -> SignalPredicate | None:
+    """Returns the filter selected by the options, `remove_non_ks_signals` is short for a filter of KS signals."""
+    if not remove_non_ks_signals:
+        return signal_filter
+    if signal_filter is not None:
+        raise ValueError("Parameters 'remove_non_ks_signals' and 'signal_filter' cannot be combined.")
+    return SignalFilter(systems=[SignalSystem.Ks])
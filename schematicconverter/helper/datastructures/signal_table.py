@@ -0,0 +1,167 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from yaramo.signal import SignalDirection
+
+if TYPE_CHECKING:
+    import numpy as np
+    from yaramo.signal import Signal as YaramoSignal
+
+    from .schematic_edge import SchematicEdge
+    from .signal_filter import SignalPredicate
+
+
+class SignalTable:
+    """
+    Columnar table of all signals of a graph with the edge index, the direction relative to the edge's source,
+    the original distance, the assigned slot (relative position on the edge) and the final distance of every signal.
+    Rows are ordered by edge, direction and original distance, so that the signals that share an edge and a direction
+    form a contiguous group. Distances are only written to the signals by `write_back`.
+    The table also counts the signals per edge and direction, which the edges read as their `max_num_signals`.
+    Signals without a direction and signals rejected by the `signal_filter` are not assigned to slots, but are kept at
+    the relative position of their original distance by `place_rejected`, so that they stay on their edges in the
+    converted topology.
+    """
+    AGAINST: int = 0
+    IN: int = 1
+    UNPLACED: int = 2
+    REJECTED: int = 3
+
+    def __init__(self, edges: list[SchematicEdge], signal_filter: SignalPredicate | None = None):
+        import numpy as np
+
+        self.edges: list[SchematicEdge] = edges
+        signals = [signal for edge in edges for signal in edge.yaramo_edge.signals]
+        edge_idxs = np.repeat(np.arange(len(edges)), [len(edge.yaramo_edge.signals) for edge in edges])
+        source_is_node_a = np.fromiter(
+            (edge.source.yaramo_node == edge.yaramo_edge.node_a for edge in edges), dtype=bool, count=len(edges)
+        )
+        directions = np.fromiter(
+            (
+                self.IN if signal.direction == SignalDirection.IN else
+                self.AGAINST if signal.direction == SignalDirection.GEGEN else self.UNPLACED
+                for signal in signals
+            ),
+            dtype=np.int64, count=len(signals)
+        )
+        # Signals in direction of node_b point away from the source if the source is node_a
+        is_placed = directions != self.UNPLACED
+        directions[is_placed] = directions[is_placed] == source_is_node_a[edge_idxs[is_placed]]
+        if signal_filter is not None:
+            is_rejected = np.fromiter((not signal_filter(signal) for signal in signals), dtype=bool, count=len(signals))
+            directions[is_rejected] = self.REJECTED
+        distances = np.fromiter((signal.distance_edge for signal in signals), dtype=float, count=len(signals))
+
+        order = np.lexsort((distances, directions, edge_idxs))
+        self.signals: list[YaramoSignal] = [signals[idx] for idx in order.tolist()]
+        self.edge_idxs: np.ndarray = edge_idxs[order]
+        self.directions: np.ndarray = directions[order]
+        self.original_distances: np.ndarray = distances[order]
+        self.slots: np.ndarray = np.full(len(signals), np.nan)
+        self.distances: np.ndarray = self.original_distances.copy()
+        self.is_placed: bool = False
+
+        keys = self.edge_idxs * 4 + self.directions
+        starts = np.flatnonzero(np.concatenate(([len(signals) > 0], keys[1:] != keys[:-1])))
+        ends = np.append(starts[1:], len(signals))
+        self.groups: list[tuple[int, int, int, int]] = list(zip(
+            self.edge_idxs[starts].tolist(), self.directions[starts].tolist(), starts.tolist(), ends.tolist()
+        ))
+
+        num_signals = np.zeros((len(edges), 2), dtype=np.int64)
+        is_placeable = (self.directions == self.AGAINST) | (self.directions == self.IN)
+        np.add.at(num_signals, (self.edge_idxs[is_placeable], self.directions[is_placeable]), 1)
+        self.max_num_signals: list[int] = num_signals.max(axis=1).tolist()
+        for idx, edge in enumerate(edges):
+            edge.set_signal_table(self, idx)
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+    def get_horizontal_lengths(self) -> np.ndarray:
+        import numpy as np
+
+        return np.fromiter((edge.horizontal_length for edge in self.edges), dtype=float, count=len(self.edges))
+
+    def place(self, slots: np.ndarray) -> None:
+        """
+        Converts the slots of all placed signals to distances along their edges. On edges with a breakpoint, the
+        signals are placed on the horizontal part, which is offset from node_a if node_a lies on the diagonal part.
+        """
+        import numpy as np
+
+        is_placed = (self.directions == self.IN) | (self.directions == self.AGAINST)
+        if np.any(is_placed & ((slots < 0) | (slots > 1))):
+            raise ValueError("Parameter 'relative_distance' has to be in range between 0 and 1.")
+
+        self.slots = np.where(is_placed, slots, self.slots)
+        self.distances = np.where(is_placed, self._get_distances(slots, is_placed), self.distances)
+        self.is_placed = True
+
+    def place_rejected(self) -> None:
+        """Places the signals not assigned to slots like placed signals at the relative original distance."""
+        import numpy as np
+
+        is_rejected = (self.directions == self.UNPLACED) | (self.directions == self.REJECTED)
+        if not np.any(is_rejected):
+            return
+        edge_lengths = np.fromiter(
+            (edge.yaramo_edge.length or 0 for edge in self.edges), dtype=float, count=len(self.edges)
+        )[self.edge_idxs]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slots = np.clip(np.where(edge_lengths > 0, self.original_distances / edge_lengths, 0.0), 0, 1)
+        self.slots = np.where(is_rejected, slots, self.slots)
+        self.distances = np.where(is_rejected, self._get_distances(slots, is_rejected), self.distances)
+
+    def read_distances(self) -> None:
+        """Reads the current distances of the signals, e.g. after they were placed without the table."""
+        import numpy as np
+
+        self.distances = np.fromiter((signal.distance_edge for signal in self.signals), dtype=float, count=len(self))
+
+    def rescale(self, old_lengths: np.ndarray, new_lengths: np.ndarray) -> None:
+        """Scales the distances of the signals of every edge with the ratio of its new and old horizontal length."""
+        import numpy as np
+
+        zero_length_rows = np.flatnonzero(old_lengths[self.edge_idxs] == 0)
+        if len(zero_length_rows) > 0:
+            edge = self.edges[self.edge_idxs[zero_length_rows[0]]]
+            raise ValueError(f"Edge {edge.uuid} has zero length, its signals cannot be rescaled.")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factors = new_lengths / old_lengths
+        self.distances = self.distances * factors[self.edge_idxs]
+
+    def write_back(self) -> None:
+        for signal, distance in zip(self.signals, self.distances.tolist()):
+            signal.distance_edge = distance
+
+    def _get_distances(self, slots: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        import numpy as np
+
+        def get_column(get_value, dtype=float) -> np.ndarray:
+            return np.fromiter((get_value(edge) for edge in self.edges), dtype=dtype, count=len(self.edges))
+
+        source_x, source_y = get_column(lambda e: e.source.new_x), get_column(lambda e: e.source.new_y)
+        target_x, target_y = get_column(lambda e: e.target.new_x), get_column(lambda e: e.target.new_y)
+        breakpoint_x = get_column(lambda e: e.intermediate_geo_node.x if e.intermediate_geo_node else np.nan)
+        breakpoint_y = get_column(lambda e: e.intermediate_geo_node.y if e.intermediate_geo_node else np.nan)
+        node_a_is_source = get_column(lambda e: e.yaramo_edge.node_a == e.source.yaramo_node, bool)
+        node_a_is_target = get_column(lambda e: e.yaramo_edge.node_a == e.target.yaramo_node, bool)
+
+        has_breakpoint = ~np.isnan(breakpoint_x)
+        source_is_aligned = has_breakpoint & (source_y == breakpoint_y)
+        target_is_aligned = has_breakpoint & ~source_is_aligned & (target_y == breakpoint_y)
+        if np.any((has_breakpoint & ~source_is_aligned & ~target_is_aligned)[self.edge_idxs[rows]]):
+            raise ValueError("Detected breakpoint that is not aligned properly.")
+
+        horizontal_length = np.abs(target_x - source_x)
+        horizontal_only_length = horizontal_length - np.abs(source_y - target_y)
+        lengths = np.where(
+            source_is_aligned, np.abs(source_x - breakpoint_x),
+            np.where(target_is_aligned, np.abs(target_x - breakpoint_x), horizontal_length)
+        )
+        has_offset = (source_is_aligned & node_a_is_target) | (target_is_aligned & node_a_is_source)
+        offsets = np.where(has_offset, horizontal_length - horizontal_only_length, 0.0)
+
+        distances = slots * lengths[self.edge_idxs]
+        return np.where(has_offset[self.edge_idxs], distances + offsets[self.edge_idxs], distances)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class TimeBudget:
+    """
+    Tracks the elapsed time of a conversion. Once the budget is exceeded, expensive steps switch to cheaper
+    fallbacks, which are recorded in `fallbacks`. A budget of `None` never expires.
+    """
+
+    def __init__(self, seconds: float | None = None):
+        self.seconds: float | None = seconds
+        self.started_at: float = time.perf_counter()
+        self.phase_times: dict[str, float] = {}
+        self.fallbacks: list[str] = []
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def exceeded(self) -> bool:
+        return self.seconds is not None and self.elapsed > self.seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + time.perf_counter() - started_at
+
+    def use_fallback(self, name: str) -> None:
+        if name not in self.fallbacks:
+            self.fallbacks.append(name)
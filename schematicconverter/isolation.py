@@ -0,0 +1,134 @@
+"""
+Thread-safe conversion.
+
+`convert` keeps its working state on the objects of the topology (coordinates, breakpoints and signal distances).
+In the isolated mode, the topology is copied into a `LayoutTopology` of plain records first, the conversion works on
+this copy only, and the results are written back at the end. The new geo nodes and signal distances are built
+before they are applied with plain assignments. Copying and applying hold a lock of the topology, so concurrent
+isolated conversions of the same topology never observe it partially converted, while conversions of different
+topologies never wait for each other and all conversions themselves run in parallel.
+This pays off on free-threaded Python builds, where threads share the inputs without pickling them for a process pool.
+"""
+from __future__ import annotations
+import threading
+import weakref
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING
+
+from yaramo.geo_node import EuclideanGeoNode
+
+if TYPE_CHECKING:
+    from yaramo.model import Topology
+
+    from .engines import LayoutEngine
+    from .helper import GraphSnapshot, TimeBudget
+    from .helper.datastructures import SignalPredicate
+    from .memory_profiling import MemoryProfile
+    from .planpro_loader import LayoutTopology
+
+
+_topology_locks: weakref.WeakKeyDictionary[Topology, threading.Lock] = weakref.WeakKeyDictionary()
+_topology_locks_lock = threading.Lock()
+
+
+def convert_isolated(
+    topology: Topology,
+    scale_factor: float = 4.5,
+    remove_non_ks_signals: bool = False,
+    snapshot: GraphSnapshot | None = None,
+    time_budget: float | TimeBudget | None = None,
+    engine: str | LayoutEngine = "default",
+    signal_filter: SignalPredicate | None = None,
+    memory_profile: MemoryProfile | None = None
+) -> Topology:
+    """
+    Same as `convert`, but only reads the topology until the layout is complete, see the module documentation.
+    Unlike `convert`, the geo nodes of the topology are replaced instead of modified, so they may be shared.
+    """
+    from .converter import convert
+
+    with _get_lock(topology):
+        working_copy = _copy_topology(topology)
+    convert(
+        working_copy, scale_factor, remove_non_ks_signals, snapshot, time_budget, engine=engine,
+        signal_filter=signal_filter, memory_profile=memory_profile
+    )
+    _write_back(topology, working_copy)
+    return topology
+
+
+def convert_batch(
+    topologies: list[Topology],
+    scale_factor: float = 4.5,
+    remove_non_ks_signals: bool = False,
+    engine: str | LayoutEngine = "default",
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+    signal_filter: SignalPredicate | None = None
+) -> list[Topology]:
+    """
+    Converts the topologies in isolated mode in the given `executor` or in a thread pool with `max_workers`.
+    Returns the converted topologies in the given order, the first failing conversion raises its exception.
+    """
+    def convert_topology(topology: Topology) -> Topology:
+        return convert_isolated(
+            topology, scale_factor, remove_non_ks_signals, engine=engine, signal_filter=signal_filter
+        )
+
+    if executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(convert_topology, topologies))
+    return list(executor.map(convert_topology, topologies))
+
+
+def _get_lock(topology: Topology) -> threading.Lock:
+    with _topology_locks_lock:
+        return _topology_locks.setdefault(topology, threading.Lock())
+
+
+def _copy_topology(topology: Topology) -> LayoutTopology:
+    """Copies everything the conversion reads into a `LayoutTopology` with the same uuids."""
+    from .planpro_loader import LayoutEdge, LayoutGeoNode, LayoutNode, LayoutSignal, LayoutTopology, LayoutTrack
+
+    working_copy = LayoutTopology()
+    for uuid, node in topology.nodes.items():
+        working_copy.nodes[uuid] = LayoutNode(uuid, LayoutGeoNode(node.geo_node.x, node.geo_node.y), node.name)
+    for uuid, edge in topology.edges.items():
+        node_a, node_b = working_copy.nodes[edge.node_a.uuid], working_copy.nodes[edge.node_b.uuid]
+        working_copy.edges[uuid] = LayoutEdge(uuid, node_a, node_b, edge.length, edge.name)
+        node_a.connected_edges.append(working_copy.edges[uuid])
+        node_b.connected_edges.append(working_copy.edges[uuid])
+        for signal in edge.signals:
+            signal_copy = LayoutSignal(
+                signal.uuid, working_copy.edges[uuid], signal.distance_edge, signal.direction, signal.kind,
+                signal.system, signal.name
+            )
+            working_copy.edges[uuid].signals.append(signal_copy)
+            working_copy.signals[signal.uuid] = signal_copy
+    for uuid, track in topology.tracks.items():
+        working_copy.tracks[uuid] = LayoutTrack(
+            uuid, track.track_type, [working_copy.edges[edge.uuid] for edge in track.edges]
+        )
+    return working_copy
+
+
+def _write_back(topology: Topology, working_copy: LayoutTopology) -> None:
+    """Applies the converted working copy to the topology."""
+    geo_nodes = {
+        uuid: EuclideanGeoNode(node.geo_node.x, node.geo_node.y) for uuid, node in working_copy.nodes.items()
+    }
+    intermediate_geo_nodes = {
+        uuid: [EuclideanGeoNode(geo_node.x, geo_node.y) for geo_node in edge.intermediate_geo_nodes]
+        for uuid, edge in working_copy.edges.items()
+    }
+    distances = {uuid: signal.distance_edge for uuid, signal in working_copy.signals.items()}
+
+    with _get_lock(topology):
+        for uuid, node in topology.nodes.items():
+            node.geo_node = geo_nodes[uuid]
+        for uuid, edge in topology.edges.items():
+            edge.intermediate_geo_nodes = intermediate_geo_nodes[uuid]
+            for signal in edge.signals:
+                signal.distance_edge = distances[signal.uuid]
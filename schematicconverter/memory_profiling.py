@@ -0,0 +1,193 @@
+"""
+Opt-in memory profiling of conversions and overviews.
+
+A `MemoryProfile` passed to `convert` or `SchematicOverview` traces all allocations with `tracemalloc` while the
+conversion runs. The peak of the traced memory is checked after every unit of work, and a snapshot is taken at every
+phase boundary, so that the memory retained by a phase can be attributed to the source lines that allocated it.
+Units allocate at most memory linear in the size of the topology, e.g. the reachability of a single node in the graph
+phase, so a conversion is aborted at most one such unit after its budget is exceeded. The horizontal positioning,
+the normalisation and the components of an overview are single units.
+Tracing slows the conversion down considerably, so profiles are meant for sizing workers and for regression tests.
+
+`tracemalloc` traces the whole process. Profiles that trace at the same time, e.g. of isolated conversions in
+threads, share the tracing, which is started by the first and stopped by the last of them. Their peaks and retained
+memory then include the allocations of the other conversions, and the peak is not reset between units, so peaks are
+upper bounds and budgets apply to the memory of all profiled conversions together.
+"""
+from __future__ import annotations
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
+
+
+_tracing_lock = threading.Lock()
+_num_tracing_profiles = 0
+_started_tracing = False
+
+
+class MemoryBudgetExceededError(MemoryError):
+    def __init__(self, phase: str, peak: int, budget: int):
+        super().__init__(
+            f"Peak memory of {peak} bytes in phase '{phase}' exceeded the memory budget of {budget} bytes."
+        )
+        self.phase: str = phase
+        self.peak: int = peak
+        self.budget: int = budget
+
+
+class AllocationSite:
+    def __init__(self, location: str, size: int, count: int):
+        self.location: str = location
+        self.size: int = size
+        self.count: int = count
+
+    def to_dict(self) -> dict[str, str | int]:
+        return {"location": self.location, "size": self.size, "count": self.count}
+
+
+class PhaseMemory:
+    """
+    Memory of a phase in bytes. `peak` is the highest traced memory above the start of the profile, `retained` the
+    growth of the traced memory from the start to the end of the phase, which `top_sites` attribute to source lines.
+    """
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.peak: int = 0
+        self.retained: int = 0
+        self.top_sites: list[AllocationSite] = []
+
+    def to_dict(self) -> dict:
+        return {
+            "peak": self.peak,
+            "retained": self.retained,
+            "top_sites": [site.to_dict() for site in self.top_sites],
+        }
+
+
+class MemoryProfile:
+    """
+    Records the memory of every phase of the profiled conversions, see the module documentation. With a `budget`
+    (in bytes), `MemoryBudgetExceededError` is raised at the end of the first unit of work that exceeds it.
+    `top_sites` sets the number of allocation sites per phase, with 0 no snapshots are taken. `nframes` is the
+    number of frames stored per allocation, if the profile starts `tracemalloc` itself.
+    """
+
+    def __init__(self, budget: int | None = None, top_sites: int = 10, nframes: int = 1):
+        self.budget: int | None = budget
+        self.top_sites: int = top_sites
+        self.nframes: int = nframes
+        self.phases: dict[str, PhaseMemory] = {}
+        self._depth: int = 0
+        self._baseline: int = 0
+        self._phase: PhaseMemory | None = None
+        self._phase_start: int = 0
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    @property
+    def peak(self) -> int:
+        return max((phase.peak for phase in self.phases.values()), default=0)
+
+    @property
+    def retained(self) -> int:
+        return sum(phase.retained for phase in self.phases.values())
+
+    @contextmanager
+    def tracing(self) -> Iterator[None]:
+        """Traces the allocations of the block, nested blocks belong to the profile of the outermost one."""
+        if self._depth > 0:
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+            return
+
+        _start_tracing(self.nframes)
+        self._depth = 1
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        _reset_peak()
+        try:
+            yield
+            self._close_phase()
+        finally:
+            self._depth = 0
+            self._phase = None
+            self._snapshot = None
+            _stop_tracing()
+
+    def record(self, phase: str) -> None:
+        """Records the memory after a unit of work of `phase`, which is entered first if it is not the current one."""
+        if self._depth == 0:
+            raise ValueError("Memory can only be recorded while tracing.")
+        if self._phase is None or self._phase.name != phase:
+            self._close_phase()
+            self._phase = self.phases.setdefault(phase, PhaseMemory(phase))
+            self._snapshot = tracemalloc.take_snapshot() if self.top_sites > 0 else None
+            self._phase_start = tracemalloc.get_traced_memory()[0]
+        self._check_peak()
+
+    def to_dict(self) -> dict:
+        return {
+            "peak": self.peak,
+            "retained": self.retained,
+            "phases": {name: phase.to_dict() for name, phase in self.phases.items()},
+        }
+
+    def _check_peak(self) -> None:
+        peak = tracemalloc.get_traced_memory()[1] - self._baseline
+        _reset_peak()
+        self._phase.peak = max(self._phase.peak, peak)
+        if self.budget is not None and peak > self.budget:
+            raise MemoryBudgetExceededError(self._phase.name, peak, self.budget)
+
+    def _close_phase(self) -> None:
+        if self._phase is None:
+            return
+        self._check_peak()
+        self._phase.retained += tracemalloc.get_traced_memory()[0] - self._phase_start
+        if self._snapshot is not None:
+            self._phase.top_sites = sorted(
+                self._phase.top_sites + self._get_top_sites(), key=lambda site: site.size, reverse=True
+            )[:self.top_sites]
+            # Comparing the snapshots allocates memory that does not belong to any phase
+            _reset_peak()
+        self._phase = None
+        self._snapshot = None
+
+    def _get_top_sites(self) -> list[AllocationSite]:
+        # The snapshots themselves are not traced, allocations of the profile are left out
+        differences = tracemalloc.take_snapshot().compare_to(self._snapshot, "lineno")
+        return [
+            AllocationSite(str(difference.traceback[0]), difference.size_diff, difference.count_diff)
+            for difference in differences
+            if difference.size_diff > 0 and difference.traceback[0].filename not in (tracemalloc.__file__, __file__)
+        ][:self.top_sites]
+
+
+def _start_tracing(nframes: int) -> None:
+    global _num_tracing_profiles, _started_tracing
+
+    with _tracing_lock:
+        if _num_tracing_profiles == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(nframes)
+            _started_tracing = True
+        _num_tracing_profiles += 1
+
+
+def _stop_tracing() -> None:
+    global _num_tracing_profiles, _started_tracing
+
+    with _tracing_lock:
+        _num_tracing_profiles -= 1
+        if _num_tracing_profiles == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def _reset_peak() -> None:
+    """Resets the peak of the traced memory, unless other profiles are tracing and still need it."""
+    with _tracing_lock:
+        if _num_tracing_profiles == 1:
+            tracemalloc.reset_peak()
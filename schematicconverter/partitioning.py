@@ -0,0 +1,280 @@
+"""
+Partitioned conversion of long corridors.
+
+A corridor of many stations is cut at single-track sections of the main tracks (bridges of the graph on tracks of type
+`TrackType.Durchgehendes_Hauptgleis`). Every section is converted independently, possibly in parallel, and the
+sections are stitched left-to-right afterwards. The edge of a cut belongs to the section on its left, which gets a copy
+of the edge's right node; the right section is then moved so that its node lies on the position of this copy, or
+further right if it would otherwise overlap the sections on its left.
+"""
+from __future__ import annotations
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING
+
+from yaramo.geo_node import EuclideanGeoNode
+from yaramo.track import TrackType
+
+if TYPE_CHECKING:
+    from yaramo.model import Topology
+
+    from .engines import LayoutEngine
+    from .helper.datastructures import SignalPredicate
+
+
+class _Section:
+    """Picklable plain records of the part of a topology that is converted as one section."""
+
+    def __init__(self):
+        self.nodes: list[tuple] = []
+        self.edges: list[tuple] = []
+        self.signals: list[tuple] = []
+        self.tracks: list[tuple] = []
+
+
+def convert_partitioned(
+    topology: Topology,
+    scale_factor: float = 4.5,
+    remove_non_ks_signals: bool = False,
+    min_section_size: int = 16,
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+    engine: str | LayoutEngine = "default",
+    signal_filter: SignalPredicate | None = None
+) -> Topology:
+    """
+    Converts the topology section by section, see the module documentation. Sections have at least
+    `min_section_size` nodes. They are converted in the given `executor` or in a process pool with `max_workers`.
+    Engines that are not registered by name and signal filters have to be picklable to be used in a process pool.
+    The layout differs from `convert` without partitioning, as every section is stretched and shortened on its own.
+    """
+    from .converter import convert
+    from .helper import get_signal_filter
+
+    signal_filter = get_signal_filter(signal_filter, remove_non_ks_signals)
+    sections, cuts = _partition(topology, min_section_size)
+    if len(sections) == 1:
+        return convert(topology, scale_factor=scale_factor, engine=engine, signal_filter=signal_filter)
+
+    if executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(
+                _convert_section, sections, [signal_filter] * len(sections), [engine] * len(sections)
+            ))
+    else:
+        results = list(executor.map(
+            _convert_section, sections, [signal_filter] * len(sections), [engine] * len(sections)
+        ))
+
+    # Sections form a path from left to right, every cut moves its right section onto the copy in its left section.
+    # If the right section reaches further left than its node of the cut, it is moved further right, so that it does
+    # not overlap the bounding boxes of the sections placed before.
+    offsets = {_leftmost_section(cuts, len(sections)): (0.0, 0.0)}
+    right_cuts = {left: (right, node_uuid) for left, right, node_uuid in cuts}
+    section = next(iter(offsets))
+    max_x = _get_x_extent(results[section])[1]
+    while section in right_cuts:
+        right, node_uuid = right_cuts[section]
+        copy_x, copy_y = results[section]["nodes"][node_uuid]
+        node_x, node_y = results[right]["nodes"][node_uuid]
+        min_right_x, max_right_x = _get_x_extent(results[right])
+        dx = max(offsets[section][0] + copy_x - node_x, max_x - min_right_x)
+        offsets[right] = (dx, offsets[section][1] + copy_y - node_y)
+        max_x = max(max_x, max_right_x + dx)
+        section = right
+
+    node_positions, breakpoint_positions, signal_distances = {}, {}, {}
+    # Nodes of a cut are taken from the right section, not from the copy in the left one
+    for idx in offsets:
+        dx, dy = offsets[idx]
+        node_positions |= {uuid: (x + dx, y + dy) for uuid, (x, y) in results[idx]["nodes"].items()}
+        breakpoint_positions |= {uuid: (x + dx, y + dy) for uuid, (x, y) in results[idx]["breakpoints"].items()}
+        signal_distances |= results[idx]["signals"]
+
+    min_x = min(x for x, _ in node_positions.values())
+    min_y = min(y for _, y in node_positions.values())
+    for uuid, node in topology.nodes.items():
+        x, y = node_positions[uuid]
+        node.geo_node = EuclideanGeoNode((x - min_x) / scale_factor, (y - min_y) / scale_factor)
+    for uuid, edge in topology.edges.items():
+        edge.intermediate_geo_nodes = []
+        if uuid in breakpoint_positions:
+            x, y = breakpoint_positions[uuid]
+            edge.intermediate_geo_nodes.append(EuclideanGeoNode((x - min_x) / scale_factor, (y - min_y) / scale_factor))
+        for signal in edge.signals:
+            if signal.uuid in signal_distances:
+                signal.distance_edge = signal_distances[signal.uuid] / scale_factor
+    return topology
+
+
+def find_bridges(topology: Topology) -> set[str]:
+    """Returns the uuids of all edges whose removal disconnects the graph of the topology."""
+    adjacency: dict[str, list[tuple[str, str]]] = {uuid: [] for uuid in topology.nodes}
+    for uuid, edge in topology.edges.items():
+        adjacency[edge.node_a.uuid].append((edge.node_b.uuid, uuid))
+        adjacency[edge.node_b.uuid].append((edge.node_a.uuid, uuid))
+
+    discovery: dict[str, int] = {}
+    low: dict[str, int] = {}
+    bridges: set[str] = set()
+    for root in adjacency:
+        if root in discovery:
+            continue
+        discovery[root] = low[root] = len(discovery)
+        stack = [(root, None, iter(adjacency[root]))]
+        while stack:
+            node, parent_edge, neighbours = stack[-1]
+            for neighbour, edge_uuid in neighbours:
+                if edge_uuid == parent_edge:
+                    continue
+                if neighbour in discovery:
+                    low[node] = min(low[node], discovery[neighbour])
+                else:
+                    discovery[neighbour] = low[neighbour] = len(discovery)
+                    stack.append((neighbour, edge_uuid, iter(adjacency[neighbour])))
+                    break
+            else:
+                stack.pop()
+                if stack:
+                    parent = stack[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                    if low[node] > discovery[parent]:
+                        bridges.add(parent_edge)
+    return bridges
+
+
+def _partition(topology: Topology, min_section_size: int) -> tuple[list[_Section], list[tuple[int, int, str]]]:
+    """
+    Returns the sections and the cuts between them as (left section, right section, uuid of the shared node).
+    Cuts are only kept if all sections are large enough and the sections form a single path from left to right.
+    """
+    def position(node) -> tuple[float, float]:
+        return (node.geo_node.x, node.geo_node.y)
+
+    main_track_edges = {
+        edge.uuid
+        for track in topology.tracks.values() if track.track_type == TrackType.Durchgehendes_Hauptgleis
+        for edge in track.edges
+    }
+    candidates = sorted(
+        (topology.edges[uuid] for uuid in find_bridges(topology) & main_track_edges),
+        key=lambda edge: min(position(edge.node_a), position(edge.node_b))
+    )
+
+    parents = {uuid: uuid for uuid in topology.nodes}
+
+    def find(uuid: str) -> str:
+        while parents[uuid] != uuid:
+            parents[uuid] = parents[parents[uuid]]
+            uuid = parents[uuid]
+        return uuid
+
+    cut_uuids = {edge.uuid for edge in candidates}
+    for uuid, edge in topology.edges.items():
+        if uuid not in cut_uuids:
+            parents[find(edge.node_a.uuid)] = find(edge.node_b.uuid)
+    if len({find(uuid) for uuid in topology.nodes}) != len(candidates) + 1:
+        # Only a single connected component can be stitched from left to right
+        candidates = []
+        root = next(iter(topology.nodes))
+        parents = {uuid: root for uuid in topology.nodes}
+
+    changed = True
+    while changed:
+        changed = False
+        sizes: dict[str, int] = {}
+        for uuid in topology.nodes:
+            sizes[find(uuid)] = sizes.get(find(uuid), 0) + 1
+        left_cuts, right_cuts = set(), set()
+        for edge in candidates:
+            left, right = sorted((edge.node_a, edge.node_b), key=position)
+            left_root, right_root = find(left.uuid), find(right.uuid)
+            if min(sizes[left_root], sizes[right_root]) < min_section_size or left_root in right_cuts or \
+                    right_root in left_cuts:
+                parents[left_root] = right_root
+                candidates.remove(edge)
+                changed = True
+                break
+            right_cuts.add(left_root)
+            left_cuts.add(right_root)
+
+    roots = list(dict.fromkeys(find(uuid) for uuid in topology.nodes))
+    section_idxs = {root: idx for idx, root in enumerate(roots)}
+    sections = [_Section() for _ in roots]
+    left_nodes = {}
+    cuts = []
+    for edge in candidates:
+        left, right = sorted((edge.node_a, edge.node_b), key=position)
+        left_nodes[edge.uuid] = left
+        cuts.append((section_idxs[find(left.uuid)], section_idxs[find(right.uuid)], right.uuid))
+
+    def get_section_idx(edge) -> int:
+        return section_idxs[find(left_nodes.get(edge.uuid, edge.node_a).uuid)]
+
+    for uuid, node in topology.nodes.items():
+        sections[section_idxs[find(uuid)]].nodes.append((uuid, node.name, node.geo_node.x, node.geo_node.y))
+    for edge in candidates:
+        node = edge.node_b if left_nodes[edge.uuid] is edge.node_a else edge.node_a
+        sections[get_section_idx(edge)].nodes.append((node.uuid, node.name, node.geo_node.x, node.geo_node.y))
+    for uuid, edge in topology.edges.items():
+        section = sections[get_section_idx(edge)]
+        section.edges.append((uuid, edge.name, edge.node_a.uuid, edge.node_b.uuid, edge.length))
+        section.signals.extend(
+            (signal.uuid, signal.name, uuid, signal.distance_edge, signal.direction, signal.kind, signal.system)
+            for signal in edge.signals
+        )
+    for uuid, track in topology.tracks.items():
+        edges_by_section: dict[int, list[str]] = {}
+        for edge in track.edges:
+            edges_by_section.setdefault(get_section_idx(edge), []).append(edge.uuid)
+        for idx, edge_uuids in edges_by_section.items():
+            sections[idx].tracks.append((uuid, track.track_type, edge_uuids))
+
+    return sections, cuts
+
+
+def _leftmost_section(cuts: list[tuple[int, int, str]], num_sections: int) -> int:
+    right_sections = {right for _, right, _ in cuts}
+    return next(idx for idx in range(num_sections) if idx not in right_sections)
+
+
+def _get_x_extent(result: dict[str, dict]) -> tuple[float, float]:
+    """Returns the smallest and largest x of the nodes and breakpoints of a converted section."""
+    xs = [x for positions in (result["nodes"], result["breakpoints"]) for x, _ in positions.values()]
+    return min(xs), max(xs)
+
+
+def _convert_section(
+    section: _Section,
+    signal_filter: SignalPredicate | None,
+    engine: str | LayoutEngine = "default"
+) -> dict[str, dict]:
+    """Converts a section without scaling and returns the positions of its nodes, breakpoints and signals."""
+    from .converter import convert
+    from .planpro_loader import LayoutEdge, LayoutGeoNode, LayoutNode, LayoutSignal, LayoutTopology, LayoutTrack
+
+    topology = LayoutTopology()
+    for uuid, name, x, y in section.nodes:
+        topology.nodes[uuid] = LayoutNode(uuid, LayoutGeoNode(x, y), name)
+    for uuid, name, node_a_uuid, node_b_uuid, length in section.edges:
+        node_a, node_b = topology.nodes[node_a_uuid], topology.nodes[node_b_uuid]
+        topology.edges[uuid] = LayoutEdge(uuid, node_a, node_b, length, name)
+        node_a.connected_edges.append(topology.edges[uuid])
+        node_b.connected_edges.append(topology.edges[uuid])
+    for uuid, name, edge_uuid, distance, direction, kind, system in section.signals:
+        signal = LayoutSignal(uuid, topology.edges[edge_uuid], distance, direction, kind, system, name)
+        topology.edges[edge_uuid].signals.append(signal)
+        topology.signals[uuid] = signal
+    for uuid, track_type, edge_uuids in section.tracks:
+        topology.tracks[uuid] = LayoutTrack(uuid, track_type, [topology.edges[edge_uuid] for edge_uuid in edge_uuids])
+
+    convert(topology, scale_factor=1.0, engine=engine, signal_filter=signal_filter)
+    return {
+        "nodes": {uuid: (node.geo_node.x, node.geo_node.y) for uuid, node in topology.nodes.items()},
+        "breakpoints": {
+            uuid: (edge.intermediate_geo_nodes[0].x, edge.intermediate_geo_nodes[0].y)
+            for uuid, edge in topology.edges.items() if edge.intermediate_geo_nodes
+        },
+        "signals": {uuid: signal.distance_edge for uuid, signal in topology.signals.items()},
+    }
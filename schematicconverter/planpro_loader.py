@@ -0,0 +1,231 @@
+"""
+Streaming PlanPro loader for overview-only use.
+
+`load_planpro` iterparses a PlanPro file and only keeps what the schematic layout needs
+(node ids and coordinates, edge endpoints and lengths, track types and signal direction, kind, system and distance).
+Edges without a length get the distance between their nodes. Signals effective in both directions have no direction,
+they are not assigned to signal slots but keep their relative position on their edges like rejected signals.
+The returned `LayoutTopology` provides the subset of the yaramo `Topology` interface that `convert` and
+`SchematicOverview` read, so it can be passed to both without building yaramo objects or intermediate geo nodes.
+"""
+from __future__ import annotations
+import math
+from pathlib import Path
+from xml.etree.ElementTree import Element, iterparse
+
+from yaramo.signal import SignalDirection, SignalKind, SignalSystem
+from yaramo.track import TrackType
+
+
+class LayoutGeoNode:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float, y: float):
+        self.x: float = x
+        self.y: float = y
+
+
+class LayoutNode:
+    __slots__ = ("uuid", "name", "geo_node", "connected_edges")
+
+    def __init__(self, uuid: str, geo_node: LayoutGeoNode, name: str | None = None):
+        self.uuid: str = uuid
+        self.name: str | None = name
+        self.geo_node: LayoutGeoNode = geo_node
+        self.connected_edges: list[LayoutEdge] = []
+
+    def is_point(self) -> bool:
+        return len(self.connected_edges) == 3
+
+
+class LayoutEdge:
+    __slots__ = ("uuid", "name", "node_a", "node_b", "length", "signals", "intermediate_geo_nodes")
+
+    def __init__(self, uuid: str, node_a: LayoutNode, node_b: LayoutNode, length: float | None, name: str | None = None):
+        self.uuid: str = uuid
+        self.name: str | None = name
+        self.node_a: LayoutNode = node_a
+        self.node_b: LayoutNode = node_b
+        self.length: float | None = length
+        self.signals: list[LayoutSignal] = []
+        self.intermediate_geo_nodes: list = []
+
+    def get_opposite_node(self, node: LayoutNode) -> LayoutNode:
+        return self.node_b if node == self.node_a else self.node_a
+
+
+class LayoutSignal:
+    __slots__ = ("uuid", "name", "edge", "distance_edge", "direction", "kind", "system")
+
+    def __init__(
+        self,
+        uuid: str,
+        edge: LayoutEdge,
+        distance_edge: float,
+        direction: SignalDirection | None,
+        kind: SignalKind | None,
+        system: SignalSystem | None,
+        name: str | None = None
+    ):
+        self.uuid: str = uuid
+        self.name: str | None = name
+        self.edge: LayoutEdge = edge
+        self.distance_edge: float = distance_edge
+        self.direction: SignalDirection | None = direction
+        self.kind: SignalKind | None = kind
+        self.system: SignalSystem | None = system
+
+
+class LayoutTrack:
+    __slots__ = ("uuid", "track_type", "nodes", "edges")
+
+    def __init__(self, uuid: str, track_type: TrackType, edges: list[LayoutEdge]):
+        self.uuid: str = uuid
+        self.track_type: TrackType = track_type
+        self.edges: list[LayoutEdge] = edges
+        self.nodes: list[LayoutNode] = list(dict.fromkeys(node for edge in edges for node in (edge.node_a, edge.node_b)))
+
+
+class LayoutTopology:
+    def __init__(self):
+        self.nodes: dict[str, LayoutNode] = {}
+        self.edges: dict[str, LayoutEdge] = {}
+        self.signals: dict[str, LayoutSignal] = {}
+        self.tracks: dict[str, LayoutTrack] = {}
+
+
+_TOPOLOGY_OBJECTS = {"GEO_Punkt", "TOP_Knoten", "TOP_Kante", "Signal", "Gleis_Art"}
+_SIGNAL_DIRECTIONS = {"in": SignalDirection.IN, "gegen": SignalDirection.GEGEN, "beide": None}
+_TRACK_TYPES = {track_type.name.lower(): track_type for track_type in TrackType}
+
+
+def load_planpro(path: str | Path) -> LayoutTopology:
+    """Loads the target state (`LST_Zustand_Ziel`) of a PlanPro file into a `LayoutTopology`."""
+    coordinates: dict[str, tuple[float, float]] = {}
+    nodes: list[tuple[str, str]] = []
+    edges: list[tuple[str, str, str, float | None]] = []
+    signals: list[tuple[str, str, str | None, str | None, str | None, str | None, str | None]] = []
+    tracks: list[tuple[str, str, list[str]]] = []
+
+    path_tags: list[str] = []
+    path_elements: list[Element] = []
+    for event, element in iterparse(str(path), events=("start", "end")):
+        tag = _local_name(element.tag)
+        if event == "start":
+            path_tags.append(tag)
+            path_elements.append(element)
+            continue
+
+        path_tags.pop()
+        path_elements.pop()
+        if not path_tags or path_tags[-1] != "Container":
+            continue
+
+        if tag in _TOPOLOGY_OBJECTS and "LST_Zustand_Ziel" in path_tags:
+            uuid = _find_value(element, "Identitaet")
+            if tag == "GEO_Punkt":
+                x, y = _find_value(element, "GEO_Punkt_Allg", "GK_X"), _find_value(element, "GEO_Punkt_Allg", "GK_Y")
+                if x is not None and y is not None:
+                    coordinates.setdefault(_find_value(element, "ID_GEO_Knoten"), (float(x), float(y)))
+            elif tag == "TOP_Knoten":
+                nodes.append((uuid, _find_value(element, "ID_GEO_Knoten")))
+            elif tag == "TOP_Kante":
+                length = _find_value(element, "TOP_Kante_Allg", "TOP_Laenge")
+                edges.append((
+                    uuid,
+                    _find_value(element, "ID_TOP_Knoten_A"),
+                    _find_value(element, "ID_TOP_Knoten_B"),
+                    float(length) if length is not None else None
+                ))
+            elif tag == "Signal" and _find(element, "Signal_Real") is not None:
+                edge_uuid = _find_value(element, "Punkt_Objekt_TOP_Kante", "ID_TOP_Kante")
+                if edge_uuid is not None:
+                    signals.append((
+                        uuid,
+                        edge_uuid,
+                        _find_value(element, "Punkt_Objekt_TOP_Kante", "Abstand"),
+                        _find_value(element, "Punkt_Objekt_TOP_Kante", "Wirkrichtung"),
+                        _find_value(element, "Signal_Real", "Signal_Real_Aktiv_Schirm", "Signal_Art"),
+                        _find_value(element, "Signal_Real", "Signal_Real_Aktiv_Schirm", "Signalsystem"),
+                        _find_value(element, "Bezeichnung", "Bezeichnung_Tabelle")
+                    ))
+            elif tag == "Gleis_Art":
+                edge_uuids = [
+                    value.text.strip()
+                    for value in element.iterfind("{*}Bereich_Objekt_Teilbereich/{*}ID_TOP_Kante/{*}Wert")
+                ]
+                tracks.append((uuid, _find_value(element, "Gleisart"), edge_uuids))
+
+        # Container children are never needed again once processed, so drop them to keep memory bounded.
+        path_elements[-1].remove(element)
+
+    return _build_topology(coordinates, nodes, edges, signals, tracks)
+
+
+def _build_topology(
+    coordinates: dict[str, tuple[float, float]],
+    nodes: list[tuple[str, str]],
+    edges: list[tuple[str, str, str, float | None]],
+    signals: list[tuple[str, str, str | None, str | None, str | None, str | None, str | None]],
+    tracks: list[tuple[str, str, list[str]]]
+) -> LayoutTopology:
+    topology = LayoutTopology()
+
+    for uuid, geo_node_uuid in nodes:
+        if geo_node_uuid not in coordinates:
+            raise ValueError(f"No coordinates found for node {uuid}.")
+        topology.nodes[uuid] = LayoutNode(uuid, LayoutGeoNode(*coordinates[geo_node_uuid]))
+
+    for uuid, node_a_uuid, node_b_uuid, length in edges:
+        node_a, node_b = topology.nodes[node_a_uuid], topology.nodes[node_b_uuid]
+        if length is None:
+            length = math.dist((node_a.geo_node.x, node_a.geo_node.y), (node_b.geo_node.x, node_b.geo_node.y))
+        edge = LayoutEdge(uuid, node_a, node_b, length)
+        node_a.connected_edges.append(edge)
+        node_b.connected_edges.append(edge)
+        topology.edges[uuid] = edge
+
+    for uuid, edge_uuid, distance, direction, kind, system, name in signals:
+        if edge_uuid not in topology.edges:
+            continue
+        if distance is None:
+            raise ValueError(f"Signal {uuid} has no distance (Abstand) on edge {edge_uuid}.")
+        if direction is None or direction.lower() not in _SIGNAL_DIRECTIONS:
+            raise ValueError(
+                f"Signal {uuid} has an unknown direction (Wirkrichtung) {direction!r}, "
+                f"expected one of {', '.join(_SIGNAL_DIRECTIONS)}."
+            )
+        edge = topology.edges[edge_uuid]
+        signal = LayoutSignal(
+            uuid,
+            edge,
+            float(distance),
+            _SIGNAL_DIRECTIONS[direction.lower()],
+            SignalKind.__members__.get(kind),
+            SignalSystem.__members__.get(system),
+            name
+        )
+        edge.signals.append(signal)
+        topology.signals[uuid] = signal
+
+    for uuid, track_type, edge_uuids in tracks:
+        if track_type is None or track_type.lower() not in _TRACK_TYPES:
+            continue
+        track_edges = [topology.edges[edge_uuid] for edge_uuid in dict.fromkeys(edge_uuids) if edge_uuid in topology.edges]
+        if track_edges:
+            topology.tracks[uuid] = LayoutTrack(uuid, _TRACK_TYPES[track_type.lower()], track_edges)
+
+    return topology
+
+
+def _local_name(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _find(element: Element, *tags: str) -> Element | None:
+    return element.find("/".join(f"{{*}}{tag}" for tag in tags))
+
+
+def _find_value(element: Element, *tags: str) -> str | None:
+    value = _find(element, *tags, "Wert")
+    return value.text.strip() if value is not None and value.text else None
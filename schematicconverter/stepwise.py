@@ -0,0 +1,112 @@
+"""
+Cooperative conversion for event-loop hosts.
+
+`StepwiseConversion` runs the same pipeline as `convert`, but in bounded steps of work that can be interleaved with
+other tasks, and `convert_async` runs a conversion without blocking an asyncio event loop.
+"""
+from __future__ import annotations
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Iterator
+
+from .converter import _iter_conversion, convert
+from .engines import LayoutEngine
+from .helper import GraphSnapshot, TimeBudget, get_signal_filter
+
+if TYPE_CHECKING:
+    from yaramo.model import Topology
+
+    from .helper.datastructures import SignalPredicate
+
+
+class StepwiseConversion:
+    """
+    Resumable conversion of a topology. Every call of `step` processes about `units_per_step` elements (nodes
+    positioned, edges post-processed or provided with signals), after which the conversion can be suspended.
+    Building the graph and ordering the start nodes are split at the nodes of their reachability searches and at
+    every 1024 combinations of the cover search. The horizontal pass runs in linear time and is a single unit.
+    """
+
+    def __init__(
+        self,
+        topology: Topology,
+        scale_factor: float = 4.5,
+        remove_non_ks_signals: bool = False,
+        snapshot: GraphSnapshot | None = None,
+        time_budget: float | TimeBudget | None = None,
+        units_per_step: int = 256,
+        engine: str | LayoutEngine = "default",
+        signal_filter: SignalPredicate | None = None
+    ):
+        if units_per_step < 1:
+            raise ValueError("At least one unit has to be processed per step.")
+        self.topology: Topology = topology
+        self.units_per_step: int = units_per_step
+        self.time_budget: TimeBudget = time_budget if isinstance(time_budget, TimeBudget) else TimeBudget(time_budget)
+        self.phase: str | None = None
+        self.processed_units: int = 0
+        self.done: bool = False
+        signal_filter = get_signal_filter(signal_filter, remove_non_ks_signals)
+        self._units: Iterator[tuple[str, int]] = _iter_conversion(
+            topology, scale_factor, signal_filter, snapshot, self.time_budget, engine
+        )
+
+    def step(self) -> bool:
+        """Processes the next step and returns whether the conversion has to be continued."""
+        num_units = 0
+        while not self.done and num_units < self.units_per_step:
+            phase, units = next(self._units, (None, 0))
+            if phase is None:
+                self.done = True
+                break
+            self.phase = phase
+            num_units += units
+        self.processed_units += num_units
+        return not self.done
+
+    def __iter__(self) -> Iterator[str]:
+        """Yields the current phase after every step."""
+        while self.step():
+            yield self.phase
+
+    def run(self) -> Topology:
+        for _ in self:
+            pass
+        return self.topology
+
+    async def run_async(self) -> Topology:
+        """Runs all remaining steps and hands control back to the event loop after each of them."""
+        import asyncio
+
+        for _ in self:
+            await asyncio.sleep(0)
+        return self.topology
+
+
+async def convert_async(
+    topology: Topology,
+    scale_factor: float = 4.5,
+    remove_non_ks_signals: bool = False,
+    snapshot: GraphSnapshot | None = None,
+    time_budget: float | TimeBudget | None = None,
+    executor: Executor | None = None,
+    units_per_step: int = 256,
+    engine: str | LayoutEngine = "default",
+    signal_filter: SignalPredicate | None = None
+) -> Topology:
+    """
+    Converts the topology without blocking the event loop. With an `executor`, the conversion runs there as a whole
+    (in a process pool, the converted copy of the topology is returned). Otherwise it is interleaved with the other
+    tasks of the loop in steps of `units_per_step`.
+    """
+    import asyncio
+    from functools import partial
+
+    if executor is not None:
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(
+            convert, topology, scale_factor, remove_non_ks_signals, snapshot, time_budget, engine=engine,
+            signal_filter=signal_filter
+        ))
+    conversion = StepwiseConversion(
+        topology, scale_factor, remove_non_ks_signals, snapshot, time_budget, units_per_step, engine, signal_filter
+    )
+    return await conversion.run_async()
@@ -0,0 +1,184 @@
+"""
+Validation and quality metrics of converted topologies.
+
+All checks are evaluated on NumPy arrays of nodes, edge segments and signals,
+so `validate_layout` can run after every conversion, even for very large layouts.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from yaramo.model import Topology
+
+    from .helper.datastructures import SignalPredicate
+
+
+class LayoutValidationError(ValueError):
+    pass
+
+
+class LayoutReport:
+    def __init__(self, violations: dict[str, list[str]], metrics: dict[str, float]):
+        self.violations: dict[str, list[str]] = violations
+        self.metrics: dict[str, float] = metrics
+
+    @property
+    def is_valid(self) -> bool:
+        return not any(self.violations.values())
+
+    def raise_for_violations(self) -> None:
+        if not self.is_valid:
+            details = ", ".join(f"{name}: {len(uuids)}" for name, uuids in self.violations.items() if uuids)
+            raise LayoutValidationError(f"Detected invalid schematic layout ({details}).")
+
+    def to_dict(self) -> dict[str, dict]:
+        return {"violations": self.violations, "metrics": self.metrics}
+
+
+def validate_layout(
+    topology: Topology,
+    min_signal_spacing: float = 0.0,
+    tolerance: float = 1e-6,
+    chunk_size: int = 2048,
+    signal_filter: SignalPredicate | None = None
+) -> LayoutReport:
+    """
+    Checks the invariants of a schematic layout:
+        - multiple_breakpoints: edges with more than one breakpoint
+        - misaligned_breakpoint: breakpoints that are not on the height of one of the edge's nodes
+        - invalid_angle: edge segments that are neither horizontal nor bend by 45 degrees
+        - point_order: points whose head is not on the opposite side of both branches
+        - signal_outside_edge: signals placed outside the horizontal extent of their edge
+        - signal_spacing: signals with the same direction on the same edge closer than `min_signal_spacing`
+    and computes quality metrics (crossings, bends, size of the layout and lengths of the edges).
+    With a `signal_filter`, only the selected signals are checked, e.g. the ones placed by the conversion.
+    """
+    import numpy as np
+
+    node_uuids = list(topology.nodes)
+    node_idxs = {uuid: idx for idx, uuid in enumerate(node_uuids)}
+    node_xs = np.array([node.geo_node.x for node in topology.nodes.values()], dtype=float)
+    node_ys = np.array([node.geo_node.y for node in topology.nodes.values()], dtype=float)
+
+    edges = list(topology.edges.values())
+    edge_uuids = np.array([edge.uuid for edge in edges], dtype=object)
+    source_idxs = np.array([node_idxs[edge.node_a.uuid] for edge in edges], dtype=int)
+    target_idxs = np.array([node_idxs[edge.node_b.uuid] for edge in edges], dtype=int)
+    num_breakpoints = np.array([len(edge.intermediate_geo_nodes) for edge in edges], dtype=int)
+    breakpoints = [edge.intermediate_geo_nodes[0] if edge.intermediate_geo_nodes else None for edge in edges]
+    breakpoint_xs = np.array([node.x if node else np.nan for node in breakpoints], dtype=float)
+    breakpoint_ys = np.array([node.y if node else np.nan for node in breakpoints], dtype=float)
+    has_breakpoint = num_breakpoints > 0
+
+    # Every edge consists of one segment, or two segments if it has a breakpoint.
+    end_xs = np.where(has_breakpoint, breakpoint_xs, node_xs[target_idxs])
+    end_ys = np.where(has_breakpoint, breakpoint_ys, node_ys[target_idxs])
+    segment_edges = np.concatenate([np.arange(len(edges)), np.flatnonzero(has_breakpoint)])
+    segments = np.column_stack([
+        np.concatenate([node_xs[source_idxs], breakpoint_xs[has_breakpoint]]),
+        np.concatenate([node_ys[source_idxs], breakpoint_ys[has_breakpoint]]),
+        np.concatenate([end_xs, node_xs[target_idxs][has_breakpoint]]),
+        np.concatenate([end_ys, node_ys[target_idxs][has_breakpoint]]),
+    ]) if edges else np.empty((0, 4))
+    segment_dxs = np.abs(segments[:, 2] - segments[:, 0])
+    segment_dys = np.abs(segments[:, 3] - segments[:, 1])
+
+    violations: dict[str, list[str]] = {}
+    violations["multiple_breakpoints"] = edge_uuids[num_breakpoints > 1].tolist()
+
+    breakpoint_is_aligned = np.isclose(breakpoint_ys, node_ys[source_idxs], atol=tolerance) | \
+                            np.isclose(breakpoint_ys, node_ys[target_idxs], atol=tolerance)
+    violations["misaligned_breakpoint"] = edge_uuids[has_breakpoint & ~breakpoint_is_aligned].tolist()
+
+    segment_is_valid = (segment_dys <= tolerance) | np.isclose(segment_dxs, segment_dys, atol=tolerance)
+    violations["invalid_angle"] = np.unique(edge_uuids[segment_edges[~segment_is_valid]]).tolist()
+
+    # A point has one neighbour on one side (head) and two neighbours on the other side (branches).
+    incident_nodes = np.concatenate([source_idxs, target_idxs])
+    neighbour_dxs = node_xs[np.concatenate([target_idxs, source_idxs])] - node_xs[incident_nodes]
+    degrees = np.bincount(incident_nodes, minlength=len(node_uuids))
+    num_left = np.bincount(incident_nodes, weights=neighbour_dxs < -tolerance, minlength=len(node_uuids))
+    num_right = np.bincount(incident_nodes, weights=neighbour_dxs > tolerance, minlength=len(node_uuids))
+    point_is_valid = ((num_left == 1) & (num_right == 2)) | ((num_left == 2) & (num_right == 1))
+    violations["point_order"] = np.array(node_uuids, dtype=object)[(degrees == 3) & ~point_is_valid].tolist()
+
+    edge_idxs = {edge.uuid: idx for idx, edge in enumerate(edges)}
+    signals = [
+        (signal, edge_idxs[edge.uuid]) for edge in edges for signal in edge.signals
+        if signal_filter is None or signal_filter(signal)
+    ]
+    signal_uuids = np.array([signal.uuid for signal, _ in signals], dtype=object)
+    signal_edges = np.array([edge_idx for _, edge_idx in signals], dtype=int)
+    signal_directions = np.array([str(signal.direction) for signal, _ in signals], dtype=object)
+    signal_distances = np.array([signal.distance_edge for signal, _ in signals], dtype=float)
+
+    edge_widths = np.abs(node_xs[target_idxs] - node_xs[source_idxs])
+    signal_is_inside = (signal_distances >= -tolerance) & (signal_distances <= edge_widths[signal_edges] + tolerance)
+    violations["signal_outside_edge"] = signal_uuids[~signal_is_inside].tolist()
+
+    order = np.lexsort((signal_distances, np.unique(signal_directions, return_inverse=True)[1], signal_edges)) \
+        if signals else np.empty(0, dtype=int)
+    same_group = (signal_edges[order][1:] == signal_edges[order][:-1]) & \
+                 (signal_directions[order][1:] == signal_directions[order][:-1])
+    gaps = np.diff(signal_distances[order])
+    min_gap = min_signal_spacing - tolerance if min_signal_spacing > 0 else tolerance
+    too_close = same_group & (gaps < min_gap)
+    violations["signal_spacing"] = np.unique(np.concatenate([
+        signal_uuids[order][1:][too_close], signal_uuids[order][:-1][too_close]
+    ])).tolist()
+
+    all_xs = np.concatenate([node_xs, breakpoint_xs[has_breakpoint]])
+    all_ys = np.concatenate([node_ys, breakpoint_ys[has_breakpoint]])
+    segment_lengths = np.hypot(segment_dxs, segment_dys)
+    edge_lengths = np.bincount(segment_edges, weights=segment_lengths, minlength=len(edges))
+    metrics = {
+        "num_nodes": len(node_uuids),
+        "num_edges": len(edges),
+        "num_signals": len(signals),
+        "edge_crossings": _count_crossings(segments, segment_edges, chunk_size),
+        "bend_count": int(has_breakpoint.sum()),
+        "width": float(all_xs.max() - all_xs.min()) if len(all_xs) else 0.0,
+        "height": float(all_ys.max() - all_ys.min()) if len(all_ys) else 0.0,
+        "total_edge_length": float(edge_lengths.sum()),
+        "max_edge_length": float(edge_lengths.max()) if len(edges) else 0.0,
+        "max_edge_width": float(edge_widths.max()) if len(edges) else 0.0,
+        "max_edge_height": float(np.abs(node_ys[target_idxs] - node_ys[source_idxs]).max()) if len(edges) else 0.0,
+        "signal_spacing_violations": int(too_close.sum()),
+    }
+    return LayoutReport(violations, metrics)
+
+
+def _count_crossings(segments: np.ndarray, segment_edges: np.ndarray, chunk_size: int) -> int:
+    """
+    Counts pairs of segments of different edges that intersect strictly (touching end points do not count).
+    The segments are swept by their left end, so every segment is only compared with the segments that start within
+    its x-extent, `chunk_size` segments at a time.
+    """
+    import numpy as np
+
+    def orientation(ax, ay, bx, by, cx, cy):
+        return np.sign((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+
+    order = np.argsort(np.minimum(segments[:, 0], segments[:, 2]), kind="stable")
+    segments, segment_edges = segments[order], segment_edges[order]
+    left_xs = np.minimum(segments[:, 0], segments[:, 2])
+    right_xs = np.maximum(segments[:, 0], segments[:, 2])
+    # The segments following a segment overlap it in x up to the first one that starts right of its end
+    ends = np.searchsorted(left_xs, right_xs, side="right")
+    x0, y0, x1, y1 = (segments[:, i] for i in range(4))
+    crossings = 0
+    for start in range(0, len(segments), chunk_size):
+        rows = np.arange(start, min(start + chunk_size, len(segments)))
+        num_candidates = np.maximum(ends[rows] - rows - 1, 0)
+        firsts = np.repeat(rows, num_candidates)
+        offsets = np.arange(len(firsts)) - np.repeat(np.cumsum(num_candidates) - num_candidates, num_candidates)
+        seconds = firsts + 1 + offsets
+        a, b = (x0[firsts], y0[firsts], x1[firsts], y1[firsts]), (x0[seconds], y0[seconds], x1[seconds], y1[seconds])
+        d1 = orientation(*a, b[0], b[1])
+        d2 = orientation(*a, b[2], b[3])
+        d3 = orientation(*b, a[0], a[1])
+        d4 = orientation(*b, a[2], a[3])
+        intersects = (d1 * d2 < 0) & (d3 * d4 < 0) & (segment_edges[firsts] != segment_edges[seconds])
+        crossings += int(intersects.sum())
+    return crossings
@@ -1 +1,3 @@
 from .schematic_overview import SchematicOverview
+from .layout_delta import apply_layout_delta, compute_layout_delta
+from .svg_renderer import iter_svg, render_svg
@@ -0,0 +1,108 @@
+"""
+Compact differences between two layouts of (revisions of) a plan.
+
+Nodes of a `d3_graph` (points, signals and breakpoints) are identified by their uuid, edges by their uuid together
+with their source and target, because edges with a breakpoint are split into two parts.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .schematic_overview import SchematicOverview
+
+
+def compute_layout_delta(old: SchematicOverview | dict, new: SchematicOverview | dict) -> dict[str, Any]:
+    """
+    Returns the added, removed and changed nodes and edges and the changed properties between two layouts.
+    Changed elements only contain their identifying fields and the fields whose values differ.
+    If both layouts are given as `SchematicOverview`, breakpoints of the same edge keep the uuid of the old layout,
+    so that re-computed breakpoints are reported as moved instead of removed and added.
+    """
+    from .schematic_overview import SchematicOverview
+
+    if isinstance(old, SchematicOverview) and isinstance(new, SchematicOverview):
+        renamed_breakpoints = {
+            breakpoint.uuid: old._breakpoints_by_edge[edge_uuid].uuid
+            for edge_uuid, breakpoint in new._breakpoints_by_edge.items()
+            if edge_uuid in old._breakpoints_by_edge
+        }
+    else:
+        renamed_breakpoints = {}
+    old_graph = old.d3_graph if isinstance(old, SchematicOverview) else old
+    new_graph = new.d3_graph if isinstance(new, SchematicOverview) else new
+
+    def rename(element: dict, fields: tuple[str, ...]) -> dict:
+        if not any(element[field] in renamed_breakpoints for field in fields):
+            return element
+        return element | {field: renamed_breakpoints.get(element[field], element[field]) for field in fields}
+
+    def diff(old_elements: dict[tuple, dict], new_elements: dict[tuple, dict], key_fields: tuple[str, ...]) -> dict:
+        changed = []
+        for key, new_element in new_elements.items():
+            if key not in old_elements:
+                continue
+            old_element = old_elements[key]
+            fields = {
+                field: value for field, value in new_element.items()
+                if field not in key_fields and (field not in old_element or old_element[field] != value)
+            }
+            if fields:
+                changed.append(dict(zip(key_fields, key)) | fields)
+        return {
+            "added": [element for key, element in new_elements.items() if key not in old_elements],
+            "removed": [_serialise_key(key) for key in old_elements if key not in new_elements],
+            "changed": changed,
+        }
+
+    nodes = diff(
+        {(node["uuid"],): node for node in old_graph["nodes"]},
+        {(node["uuid"],): rename(node, ("uuid",)) for node in new_graph["nodes"]},
+        _NODE_KEY
+    )
+    edges = diff(
+        {_edge_key(edge): edge for edge in old_graph["edges"]},
+        {_edge_key(edge): edge for edge in (rename(edge, ("source", "target")) for edge in new_graph["edges"])},
+        _EDGE_KEY
+    )
+    properties = {
+        name: value for name, value in new_graph["properties"].items()
+        if old_graph["properties"].get(name) != value
+    }
+    return {"properties": properties, "nodes": nodes, "edges": edges}
+
+
+def apply_layout_delta(graph: dict, delta: dict[str, Any]) -> dict:
+    """Updates a `d3_graph` in place with a delta of `compute_layout_delta`. Added elements are appended."""
+    def apply(elements: list[dict], element_delta: dict, key_fields: tuple[str, ...]) -> list[dict]:
+        removed = {_deserialise_key(key) for key in element_delta["removed"]}
+        changed = {tuple(element[field] for field in key_fields): element for element in element_delta["changed"]}
+        result = []
+        for element in elements:
+            key = tuple(element[field] for field in key_fields)
+            if key in removed:
+                continue
+            if key in changed:
+                element.update(changed[key])
+            result.append(element)
+        return result + [dict(element) for element in element_delta["added"]]
+
+    graph["properties"].update(delta["properties"])
+    graph["nodes"] = apply(graph["nodes"], delta["nodes"], _NODE_KEY)
+    graph["edges"] = apply(graph["edges"], delta["edges"], _EDGE_KEY)
+    return graph
+
+
+_NODE_KEY = ("uuid",)
+_EDGE_KEY = ("uuid", "source", "target")
+
+
+def _edge_key(edge: dict) -> tuple[str, str, str]:
+    return tuple(edge[field] for field in _EDGE_KEY)
+
+
+def _serialise_key(key: tuple[str, ...]) -> str | list[str]:
+    return key[0] if len(key) == 1 else list(key)
+
+
+def _deserialise_key(key: str | list[str]) -> tuple[str, ...]:
+    return (key,) if isinstance(key, str) else tuple(key)
@@ -1,39 +1,116 @@
-from copy import copy
-
-from schematicconverter import convert
-from yaramo.model import Topology as PlanProTopology
+from __future__ import annotations
+from contextlib import nullcontext
+from functools import cached_property
+from typing import TYPE_CHECKING
 
 from .schematic_overview_elements import SchematicOverviewBreakpoint
 from .schematic_overview_elements import SchematicOverviewEdge
 from .schematic_overview_elements import SchematicOverviewPoint
 from .schematic_overview_elements import SchematicOverviewSignal
 
+if TYPE_CHECKING:
+    from yaramo.model import Topology as PlanProTopology
+
+    from schematicconverter.helper.datastructures import SignalPredicate
+    from schematicconverter.memory_profiling import MemoryProfile
+
 
 class SchematicOverview:
-    def __init__(self, topology: PlanProTopology, scale_factor: float = 10, remove_non_ks_signals: bool = False):
-        self.topology = convert(topology, scale_factor=scale_factor, remove_non_ks_signals=remove_non_ks_signals)
-        self.breakpoints: list[SchematicOverviewBreakpoint] = []
-        self.edges: list[SchematicOverviewEdge] = [
-            SchematicOverviewEdge(edge)
-            for edge in self.topology.edges.values()
-        ]
-        self.points: list[SchematicOverviewPoint] = [
-            SchematicOverviewPoint(node)
-            for node in self.topology.nodes.values()
-        ]
-        self.signals: list[SchematicOverviewSignal] = [
-            SchematicOverviewSignal(edge, signal)
+    """
+    Points, edges, breakpoints and signals are computed on first access and memoised.
+    Call `invalidate` after modifying the underlying topology to recompute them.
+    Only the signals selected by the `signal_filter` are shown, so several overviews of one converted topology can
+    show different signals, e.g. `SchematicOverview(topology, is_converted=True, signal_filter=...)`.
+    With a `memory_profile`, all components are computed right away and recorded as phases of the profile.
+    """
+    components: tuple[str, ...] = ("points", "edges", "breakpoints", "signals")
+    _dependent_components: dict[str, tuple[str, ...]] = {
+        "points": ("_points_by_uuid",),
+        "edges": ("breakpoints", "_breakpoints_by_edge"),
+        "breakpoints": ("edges", "_breakpoints_by_edge"),
+    }
+
+    def __init__(
+        self,
+        topology: PlanProTopology,
+        scale_factor: float = 10,
+        remove_non_ks_signals: bool = False,
+        is_converted: bool = False,
+        time_budget: float | None = None,
+        signal_filter: SignalPredicate | None = None,
+        memory_profile: MemoryProfile | None = None
+    ):
+        from schematicconverter.helper import get_signal_filter
+
+        self.fallbacks: list[str] = []
+        self.signal_filter: SignalPredicate | None = get_signal_filter(signal_filter, remove_non_ks_signals)
+        with memory_profile.tracing() if memory_profile is not None else nullcontext():
+            if is_converted:
+                self.topology = topology
+            else:
+                from schematicconverter import TimeBudget, convert
+
+                budget = TimeBudget(time_budget)
+                self.topology = convert(
+                    topology,
+                    scale_factor=scale_factor,
+                    time_budget=budget,
+                    signal_filter=self.signal_filter,
+                    memory_profile=memory_profile
+                )
+                self.fallbacks = budget.fallbacks
+
+            if memory_profile is not None:
+                for component in self.components:
+                    memory_profile.record(f"overview_{component}")
+                    getattr(self, component)
+
+    def invalidate(self, *components: str) -> None:
+        for component in components or self.components:
+            if component not in self.components:
+                raise ValueError(f"Unknown component '{component}'.")
+            for name in (component, *self._dependent_components.get(component, ())):
+                self.__dict__.pop(name, None)
+
+    @cached_property
+    def points(self) -> list[SchematicOverviewPoint]:
+        return [SchematicOverviewPoint(node) for node in self.topology.nodes.values()]
+
+    @cached_property
+    def edges(self) -> list[SchematicOverviewEdge]:
+        edges = [SchematicOverviewEdge(edge) for edge in self.topology.edges.values()]
+        self.compute_track_types(edges)
+        self.compute_breakpoints(edges)
+        return edges
+
+    @cached_property
+    def breakpoints(self) -> list[SchematicOverviewBreakpoint]:
+        return list(self._breakpoints_by_edge.values())
+
+    @cached_property
+    def signals(self) -> list[SchematicOverviewSignal]:
+        return [
+            signal
             for edge in self.topology.edges.values()
-            for signal in edge.signals
+            for signal in SchematicOverviewSignal.from_edge(edge, self.signal_filter)
         ]
-        self.compute_track_types()
-        self.compute_breakpoints()
+
+    @cached_property
+    def _points_by_uuid(self) -> dict[str, SchematicOverviewPoint]:
+        return {point.uuid: point for point in self.points}
+
+    @cached_property
+    def _breakpoints_by_edge(self) -> dict[str, SchematicOverviewBreakpoint]:
+        breakpoints = {}
+        for yaramo_edge in self.topology.edges.values():
+            if yaramo_edge.intermediate_geo_nodes:
+                if len(yaramo_edge.intermediate_geo_nodes) != 1:
+                    raise ValueError(f"Detected more than one intermediate node on edge {yaramo_edge.name}.")
+                breakpoints[yaramo_edge.uuid] = SchematicOverviewBreakpoint(yaramo_edge.intermediate_geo_nodes[0])
+        return breakpoints
 
     def get_point_by_uuid(self, uuid: str) -> SchematicOverviewPoint | None:
-        for point in self.points:
-            if point.uuid == uuid:
-                return point
-        return None
+        return self._points_by_uuid.get(uuid)
 
     def get_edge_by_node_uuids(self, uuid_a: str, uuid_b: str) -> SchematicOverviewEdge | None:
         for edge in self.edges:
@@ -41,41 +118,57 @@ class SchematicOverview:
                 return edge
         return None
 
-    def compute_track_types(self) -> None:
-        edge_dict: dict[str, SchematicOverviewEdge] = {edge.uuid: edge for edge in self.edges}
+    def compute_track_types(self, edges: list[SchematicOverviewEdge] | None = None) -> None:
+        """
+        Sets the type of the `edges` to their most important track type.
+        Without `edges`, the edges of the overview are computed again from the topology.
+        """
+        if edges is None:
+            self.invalidate("edges")
+            self.edges
+            return
+        edge_dict: dict[str, SchematicOverviewEdge] = {edge.uuid: edge for edge in edges}
         for yaramo_track in self.topology.tracks.values():
             for yaramo_edge in yaramo_track.edges:
-                if edge_dict[yaramo_edge.uuid].type is None or \
-                   yaramo_track.track_type < edge_dict[yaramo_edge.uuid].type:
-                    edge_dict[yaramo_edge.uuid].type = yaramo_track.track_type
+                edge = edge_dict[yaramo_edge.uuid.upper()]
+                if edge.type is None or yaramo_track.track_type < edge.type:
+                    edge.type = yaramo_track.track_type
 
-    def compute_breakpoints(self) -> None:
+    def compute_breakpoints(self, edges: list[SchematicOverviewEdge] | None = None) -> None:
+        """
+        Splits the unsplit `edges` at their breakpoints.
+        Without `edges`, the edges of the overview are computed again from the topology.
+        """
+        if edges is None:
+            self.invalidate("edges")
+            self.edges
+            return
+        edge_dict: dict[str, SchematicOverviewEdge] = {edge.uuid: edge for edge in edges}
         for yaramo_edge in self.topology.edges.values():
-            if yaramo_edge.intermediate_geo_nodes:
-                if len(yaramo_edge.intermediate_geo_nodes) != 1:
-                    raise ValueError(f"Detected more than one intermediate node on edge {yaramo_edge.name}.")
-
-                breakpoint = SchematicOverviewBreakpoint(yaramo_edge.intermediate_geo_nodes[0])
-                first_edge = self.get_edge_by_node_uuids(yaramo_edge.node_a.uuid.upper(), yaramo_edge.node_b.uuid.upper())
+            if yaramo_edge.uuid not in self._breakpoints_by_edge:
+                continue
 
-                second_edge = copy(first_edge)
-                first_edge.source = breakpoint.uuid
-                second_edge.target = breakpoint.uuid
+            breakpoint = self._breakpoints_by_edge[yaramo_edge.uuid]
+            first_edge = edge_dict[yaramo_edge.uuid.upper()]
 
-                if self.get_point_by_uuid(first_edge.target).y != breakpoint.y:
-                    first_edge.uuid = ""
-                if self.get_point_by_uuid(second_edge.source).y != breakpoint.y:
-                    second_edge.uuid = ""
+            second_edge = SchematicOverviewEdge(yaramo_edge)
+            second_edge.type = first_edge.type
+            first_edge.source = breakpoint.uuid
+            second_edge.target = breakpoint.uuid
 
-                self.edges.append(second_edge)
-                self.breakpoints.append(breakpoint)
+            if yaramo_edge.node_b.geo_node.y != breakpoint.y:
+                first_edge.uuid = ""
+            if yaramo_edge.node_a.geo_node.y != breakpoint.y:
+                second_edge.uuid = ""
 
+            edges.append(second_edge)
 
     @property
     def d3_graph(self) -> dict[str, list]:
         properties = {
             "max_x": max([node.x for node in self.points]),
-            "max_y": max([node.y for node in self.points])
+            "max_y": max([node.y for node in self.points]),
+            "fallbacks": self.fallbacks
         }
         breakpoints = [breakpoint.__dict__ for breakpoint in self.breakpoints]
         edges = [edge.__dict__ for edge in self.edges]
@@ -1,5 +1,7 @@
+from __future__ import annotations
 from enum import Enum, auto
 from math import atan, pi
+from typing import Callable
 
 from yaramo.base_element import BaseElement
 from yaramo.edge import Edge as YaramoEdge
@@ -39,61 +41,84 @@ class SchematicOverviewEdge(BaseElement):
         self.type: TrackType = None
 
 
+class SchematicOverviewEdgeGeometry:
+    def __init__(self, yaramo_edge: YaramoEdge):
+        node_a, node_b = yaramo_edge.node_a.geo_node, yaramo_edge.node_b.geo_node
+        if (node_a.x, node_a.y) == (node_b.x, node_b.y):
+            raise ValueError("Detected edge with length 0.")
+        if len(yaramo_edge.intermediate_geo_nodes) > 1:
+            raise ValueError("Detected node with more than one intermediate_geo_node.")
+
+        self.x: float = node_a.x
+        self.y: float = node_a.y
+        self.left_node: YaramoNode = yaramo_edge.node_a if (node_a.x, node_a.y) < (node_b.x, node_b.y) else yaramo_edge.node_b
+        self.left_node_is_a: bool = self.left_node == yaramo_edge.node_a
+        self.is_horizontal: bool = node_a.y == node_b.y
+        self.breakpoint_y: float | None = \
+            yaramo_edge.intermediate_geo_nodes[0].y if yaramo_edge.intermediate_geo_nodes else None
+
+        if self.is_horizontal or self.breakpoint_y is not None:
+            self.angles: dict[str, float] = {"in": 90, "gegen": -90}
+        elif (node_b.y - node_a.y) / (node_a.x - node_b.x) < 0:
+            self.angles: dict[str, float] = {"in": 135, "gegen": 315}
+        else:
+            self.angles: dict[str, float] = {"in": 45, "gegen": 225}
+
+    def signal_direction(self, yaramo_signal: YaramoSignal) -> str:
+        if self.left_node_is_a == (yaramo_signal.direction == SignalDirection.IN):
+            return str(SignalDirection.IN)
+        return str(SignalDirection.GEGEN)
+
+    def signal_angle(self, direction: str) -> float:
+        return self.angles["in"] if direction == "in" else self.angles["gegen"]
+
+    def signal_positions(self, distances: list[float]) -> tuple[list[float], list[float]]:
+        import numpy as np
+
+        distances = np.asarray(distances, dtype=float)
+        xs = self.x + distances if self.left_node_is_a else self.x - distances
+        if self.is_horizontal:
+            ys = np.full_like(distances, self.y)
+        elif self.breakpoint_y is None:
+            ys = self.y + distances
+        else:
+            ys = np.full_like(distances, self.breakpoint_y)
+        return xs.tolist(), ys.tolist()
+
+
 class SchematicOverviewSignal(BaseElement):
-    def __init__(self, yaramo_edge: YaramoEdge, yaramo_signal: YaramoSignal):
+    def __init__(
+        self,
+        yaramo_edge: YaramoEdge,
+        yaramo_signal: YaramoSignal,
+        geometry: SchematicOverviewEdgeGeometry | None = None,
+        position: tuple[float, float] | None = None
+    ):
         super().__init__(yaramo_signal.uuid.upper(), yaramo_signal.name)
-        self.x: float = self.init_x(yaramo_edge, yaramo_signal)
-        self.y: float = self.init_y(yaramo_edge, yaramo_signal)
-        self.direction: str = str(self.init_direction(yaramo_edge, yaramo_signal))
-        self.angle: float = self.init_angle(yaramo_edge)
+        geometry = geometry or SchematicOverviewEdgeGeometry(yaramo_edge)
+        if position is None:
+            (x,), (y,) = geometry.signal_positions([yaramo_signal.distance_edge])
+            position = (x, y)
+        self.x: float = position[0]
+        self.y: float = position[1]
+        self.direction: str = geometry.signal_direction(yaramo_signal)
+        self.angle: float = geometry.signal_angle(self.direction)
         self.special_signal: bool = yaramo_signal.kind == SignalKind.Sperrsignal
         self.type: str = str(NodeType.Signal)
 
-    def get_left_node(self, yaramo_edge: YaramoEdge) -> YaramoNode:
-        if (yaramo_edge.node_a.geo_node.x, yaramo_edge.node_a.geo_node.y) \
-           < (yaramo_edge.node_b.geo_node.x, yaramo_edge.node_b.geo_node.y):
-            return yaramo_edge.node_a
-        if (yaramo_edge.node_a.geo_node.x, yaramo_edge.node_a.geo_node.y) \
-           > (yaramo_edge.node_b.geo_node.x, yaramo_edge.node_b.geo_node.y):
-            return yaramo_edge.node_b
-        raise ValueError("Detected edge with length 0.")
-
-    def get_right_node(self, yaramo_edge: YaramoEdge) -> YaramoNode:
-        return yaramo_edge.get_opposite_node(self.get_left_node(yaramo_edge))
-
-    def init_x(self, yaramo_edge: YaramoEdge, yaramo_signal: YaramoSignal) -> None:
-        if self.get_left_node(yaramo_edge) == yaramo_edge.node_a:
-            return yaramo_edge.node_a.geo_node.x + yaramo_signal.distance_edge
-        if self.get_left_node(yaramo_edge) == yaramo_edge.node_b:
-            return yaramo_edge.node_a.geo_node.x - yaramo_signal.distance_edge
-
-    def init_y(self, yaramo_edge: YaramoEdge, yaramo_signal: YaramoSignal) -> None:
-        if yaramo_edge.node_a.geo_node.y == yaramo_edge.node_b.geo_node.y:
-            return yaramo_edge.node_a.geo_node.y
-        if len(yaramo_edge.intermediate_geo_nodes) == 0:
-            return yaramo_edge.node_a.geo_node.y + yaramo_signal.distance_edge
-        if len(yaramo_edge.intermediate_geo_nodes) == 1:
-            return yaramo_edge.intermediate_geo_nodes[0].y
-        raise ValueError("Detected node with more than one intermediate_geo_node.")
-
-    def init_direction(self, yaramo_edge: YaramoEdge, yaramo_signal: YaramoSignal):
-        if self.get_left_node(yaramo_edge) == yaramo_edge.node_a:
-            if yaramo_signal.direction == SignalDirection.IN:
-                return SignalDirection.IN
-            return SignalDirection.GEGEN
-        if self.get_left_node(yaramo_edge) == yaramo_edge.node_b:
-            if yaramo_signal.direction == SignalDirection.IN:
-                return SignalDirection.GEGEN
-            return SignalDirection.IN
-
-    def init_angle(self, yaramo_edge: YaramoEdge):
-        edge_is_horizontal = yaramo_edge.node_a.geo_node.y == yaramo_edge.node_b.geo_node.y
-        if edge_is_horizontal or yaramo_edge.intermediate_geo_nodes:
-            return 90 if self.direction == "in" else -90
-        else:
-            ax, ay = yaramo_edge.node_a.geo_node.x, -yaramo_edge.node_a.geo_node.y
-            bx, by = yaramo_edge.node_b.geo_node.x, -yaramo_edge.node_b.geo_node.y
-            if (ay - by) / (ax - bx) < 0:
-                return 135 if self.direction == "in" else 315
-            else:
-                return 45 if self.direction == "in" else 225
+    @classmethod
+    def from_edge(
+        cls,
+        yaramo_edge: YaramoEdge,
+        signal_filter: Callable[[YaramoSignal], bool] | None = None
+    ) -> list[SchematicOverviewSignal]:
+        signals = [signal for signal in yaramo_edge.signals if signal_filter is None or signal_filter(signal)]
+        if not signals:
+            return []
+
+        geometry = SchematicOverviewEdgeGeometry(yaramo_edge)
+        xs, ys = geometry.signal_positions([signal.distance_edge for signal in signals])
+        return [
+            cls(yaramo_edge, signal, geometry, (x, y))
+            for signal, x, y in zip(signals, xs, ys)
+        ]
@@ -0,0 +1,113 @@
+"""
+Server-side rendering of schematic overviews as SVG.
+
+The document is produced as a stream of text chunks directly from the points, edges and signals of the overview,
+so that large overviews can be written to files or HTTP responses without building an XML tree in memory.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, TextIO
+from xml.sax.saxutils import escape
+
+from yaramo.track import TrackType
+
+from .schematic_overview_elements import NodeType
+
+if TYPE_CHECKING:
+    from .schematic_overview import SchematicOverview
+
+
+_STYLE = (
+    "<style>"
+    ".track{stroke:#555;stroke-width:2;fill:none;stroke-linecap:round}"
+    ".main-track{stroke:#000;stroke-width:4;fill:none;stroke-linecap:round}"
+    ".point{fill:#000}"
+    ".endpoint{fill:#fff;stroke:#000;stroke-width:1.5}"
+    ".signal line{stroke:#000;stroke-width:1.5}"
+    ".signal circle{fill:#fff;stroke:#000;stroke-width:1.5}"
+    ".special-signal rect{fill:#fff;stroke:#000;stroke-width:1.5}"
+    "text{font:10px sans-serif}"
+    "</style>"
+)
+
+
+def iter_svg(
+    overview: SchematicOverview,
+    unit: float = 100.0,
+    margin: float = 0.5,
+    viewport: tuple[float, float, float, float] | None = None,
+    labels: bool = False
+) -> Iterator[str]:
+    """
+    Yields the SVG document of the overview in chunks.
+    `unit` is the size in pixels of one unit of the overview's coordinates and `margin` is given in these units.
+    If a `viewport` (min_x, min_y, max_x, max_y) in overview coordinates is given, only this area is rendered and
+    elements outside of it are skipped.
+    """
+    if viewport is None:
+        xs = [point.x for point in overview.points]
+        ys = [point.y for point in overview.points]
+        viewport = (min(xs) - margin, min(ys) - margin, max(xs) + margin, max(ys) + margin)
+    min_x, min_y, max_x, max_y = viewport
+    if max_x <= min_x or max_y <= min_y:
+        raise ValueError("Given viewport is empty.")
+
+    def fmt(value: float) -> str:
+        return f"{value * unit:.2f}".rstrip("0").rstrip(".")
+
+    def is_visible(x0: float, y0: float, x1: float = None, y1: float = None) -> bool:
+        x1, y1 = x0 if x1 is None else x1, y0 if y1 is None else y1
+        return min(x0, x1) <= max_x and max(x0, x1) >= min_x and min(y0, y1) <= max_y and max(y0, y1) >= min_y
+
+    width, height = max_x - min_x, max_y - min_y
+    yield (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{fmt(width)}" height="{fmt(height)}" '
+        f'viewBox="{fmt(min_x)} {fmt(min_y)} {fmt(width)} {fmt(height)}">'
+    )
+    yield _STYLE
+
+    coordinates = {point.uuid: (point.x, point.y) for point in overview.points}
+    coordinates |= {breakpoint.uuid: (breakpoint.x, breakpoint.y) for breakpoint in overview.breakpoints}
+
+    yield '<g class="tracks">'
+    for edge in overview.edges:
+        (x0, y0), (x1, y1) = coordinates[edge.source], coordinates[edge.target]
+        if is_visible(x0, y0, x1, y1):
+            css_class = "main-track" if edge.type == TrackType.Durchgehendes_Hauptgleis else "track"
+            yield f'<line class="{css_class}" x1="{fmt(x0)}" y1="{fmt(y0)}" x2="{fmt(x1)}" y2="{fmt(y1)}"/>'
+    yield "</g>"
+
+    yield '<g class="points">'
+    for point in overview.points:
+        if is_visible(point.x, point.y):
+            css_class = "point" if point.type == str(NodeType.Point) else "endpoint"
+            yield f'<circle class="{css_class}" cx="{fmt(point.x)}" cy="{fmt(point.y)}" r="4"/>'
+            if labels and point.name:
+                yield f'<text x="{fmt(point.x)}" y="{fmt(point.y)}" dy="-8">{escape(point.name)}</text>'
+    yield "</g>"
+
+    yield '<g class="signals">'
+    for signal in overview.signals:
+        if is_visible(signal.x, signal.y):
+            css_class = "signal special-signal" if signal.special_signal else "signal"
+            head = '<rect x="-4" y="-22" width="8" height="8"/>' if signal.special_signal else '<circle cy="-18" r="4"/>'
+            yield (
+                f'<g class="{css_class}" transform="translate({fmt(signal.x)} {fmt(signal.y)}) rotate({signal.angle})">'
+                f'<title>{escape(signal.name or "")}</title><line y2="-14"/>{head}</g>'
+            )
+            if labels and signal.name:
+                yield f'<text x="{fmt(signal.x)}" y="{fmt(signal.y)}" dy="16">{escape(signal.name)}</text>'
+    yield "</g>"
+
+    yield "</svg>"
+
+
+def render_svg(overview: SchematicOverview, target: str | Path | TextIO, **options) -> None:
+    """Writes the SVG document of the overview incrementally to a file path or a text stream, see `iter_svg`."""
+    if isinstance(target, (str, Path)):
+        with open(target, "w", encoding="utf-8") as file:
+            render_svg(overview, file, **options)
+        return
+
+    for chunk in iter_svg(overview, **options):
+        target.write(chunk)
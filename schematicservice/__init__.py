@@ -0,0 +1,2 @@
+from .client import LayoutClient, LayoutServiceError
+from .server import LayoutCache, LayoutServer, ServiceMetrics
@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+
+from .server import LayoutServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m schematicservice", description="Local schematic layout server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="serve on the given unix socket instead of tcp")
+    parser.add_argument("--workers", type=int, default=None, help="size of the worker process pool")
+    parser.add_argument("--cache-size", type=int, default=128, help="maximum number of cached layouts")
+    parser.add_argument("--cache-bytes", type=int, default=256 * 1024 * 1024, help="maximum size of the cache")
+    args = parser.parse_args()
+
+    server = LayoutServer(
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket,
+        max_workers=args.workers,
+        cache_size=args.cache_size,
+        cache_bytes=args.cache_bytes
+    )
+
+    async def run() -> None:
+        await server.start()
+        print(f"Serving schematic layouts on {server.address}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
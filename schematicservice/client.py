@@ -0,0 +1,74 @@
+import asyncio
+import json
+from pathlib import Path
+from urllib.parse import urlencode
+
+
+class LayoutServiceError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class LayoutClient:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, unix_socket: str | None = None):
+        self.host: str = host
+        self.port: int = port
+        self.unix_socket: str | None = unix_socket
+
+    async def health(self) -> dict:
+        return json.loads(await self.request("GET", "/health"))
+
+    async def metrics(self) -> dict:
+        return json.loads(await self.request("GET", "/metrics"))
+
+    async def layout_from_planpro(self, planpro: str | Path | bytes, **options) -> dict:
+        payload = planpro if isinstance(planpro, bytes) else Path(planpro).read_bytes()
+        return json.loads(await self.request("POST", self._layout_target("planpro", options), payload))
+
+    async def layout_from_topology(self, topology_json: str, **options) -> dict:
+        target = self._layout_target("topology", options)
+        return json.loads(await self.request("POST", target, topology_json.encode("utf-8"), "application/json"))
+
+    async def request(
+        self,
+        method: str,
+        target: str,
+        body: bytes = b"",
+        content_type: str = "application/octet-stream"
+    ) -> bytes:
+        if self.unix_socket:
+            reader, writer = await asyncio.open_unix_connection(self.unix_socket)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+
+        try:
+            writer.write(
+                f"{method} {target} HTTP/1.1\r\n"
+                f"Host: {self.host}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+
+            status = int((await reader.readline()).decode("latin-1").split(" ", 2)[1])
+            headers = {}
+            while (line := (await reader.readline()).decode("latin-1").strip()):
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            response = await reader.readexactly(int(headers.get("content-length", 0)))
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+        if status != 200:
+            raise LayoutServiceError(status, json.loads(response).get("error", ""))
+        return response
+
+    @staticmethod
+    def _layout_target(payload_format: str, options: dict) -> str:
+        parameters = {"format": payload_format} | {
+            name: str(value).lower() if isinstance(value, bool) else value for name, value in options.items()
+        }
+        return f"/layout?{urlencode(parameters)}"
@@ -0,0 +1,306 @@
+import asyncio
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from .worker import InvalidLayoutRequestError, compute_layout
+
+
+_STATUS_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                   413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+_LAYOUT_PARAMETERS = ("format", "scale_factor", "time_budget", "remove_non_ks_signals", "planpro_version")
+_BOOLEANS = {"1": True, "true": True, "yes": True, "0": False, "false": False, "no": False}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class LayoutCache:
+    """Least-recently-used cache of serialised layouts, bounded by entry count and total size."""
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.size_bytes: int = 0
+        self.evictions: int = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes or self.max_entries <= 0:
+            return
+        if key in self._entries:
+            self.size_bytes -= len(self._entries.pop(key))
+        self._entries[key] = value
+        self.size_bytes += len(value)
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.evictions += 1
+
+
+class ServiceMetrics:
+    def __init__(self, latency_window: int = 1024):
+        self.started_at: float = time.monotonic()
+        self.requests: int = 0
+        self.errors: int = 0
+        self.cache_hits: int = 0
+        self.coalesced: int = 0
+        self.computations: int = 0
+        self.pool_restarts: int = 0
+        self.latencies: deque[float] = deque(maxlen=latency_window)
+
+    def record_latency(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+
+    def to_dict(self) -> dict[str, float | int]:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+
+        return {
+            "uptime": time.monotonic() - self.started_at,
+            "requests": self.requests,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "computations": self.computations,
+            "pool_restarts": self.pool_restarts,
+            "latency_p50": percentile(0.5),
+            "latency_p95": percentile(0.95),
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+
+class LayoutServer:
+    """
+    Minimal HTTP/1.1 server computing `SchematicOverview.d3_graph` layouts in a worker pool.
+
+    Endpoints:
+        POST /layout    body is a PlanPro file (default) or a yaramo topology json (`format=topology`),
+                        query parameters: scale_factor, remove_non_ks_signals, planpro_version, time_budget
+        GET  /health    liveness information
+        GET  /metrics   request counters and latency percentiles in seconds
+    Concurrent requests for identical inputs share a single computation. Layouts that needed fallbacks to meet their
+    time budget are not cached.
+    Invalid requests are answered with 400 and other errors with 500. If a worker process dies, the worker pool of the
+    server is replaced and the layout computed once more, or answered with 503 if that fails as well.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        unix_socket: str | None = None,
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+        cache_size: int = 128,
+        cache_bytes: int = 256 * 1024 * 1024,
+        max_body_size: int = 512 * 1024 * 1024
+    ):
+        self.host: str = host
+        self.port: int = port
+        self.unix_socket: str | None = unix_socket
+        self.max_body_size: int = max_body_size
+        self.max_workers: int | None = max_workers
+        self.cache: LayoutCache = LayoutCache(cache_size, cache_bytes)
+        self.metrics: ServiceMetrics = ServiceMetrics()
+        self._owns_executor: bool = executor is None
+        self._executor: Executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def address(self) -> str | tuple[str, int]:
+        if self.unix_socket:
+            return self.unix_socket
+        return self._server.sockets[0].getsockname()[:2] if self._server else (self.host, self.port)
+
+    async def start(self) -> None:
+        if self.unix_socket:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.unix_socket)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def get_layout(self, payload: bytes, payload_format: str, options: dict) -> bytes:
+        key = hashlib.sha256(
+            json.dumps([payload_format, options], sort_keys=True).encode("utf-8") + payload
+        ).hexdigest()
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.metrics.cache_hits += 1
+            return cached
+
+        if key in self._in_flight:
+            self.metrics.coalesced += 1
+        else:
+            self._in_flight[key] = asyncio.ensure_future(self._compute(key, payload, payload_format, options))
+        return await asyncio.shield(self._in_flight[key])
+
+    async def _compute(self, key: str, payload: bytes, payload_format: str, options: dict) -> bytes:
+        self.metrics.computations += 1
+        try:
+            result, fallbacks = await self._run_in_pool(payload, payload_format, options)
+            if not fallbacks:
+                self.cache.put(key, result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    async def _run_in_pool(self, payload: bytes, payload_format: str, options: dict) -> tuple[bytes, list[str]]:
+        for attempt in range(2):
+            executor = self._executor
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    executor, compute_layout, payload, payload_format, options
+                )
+            except BrokenExecutor:
+                if not self._owns_executor or attempt > 0:
+                    raise HttpError(503, "The worker pool is broken.")
+                # Concurrent computations that failed in the same pool replace it only once
+                if self._executor is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    self.metrics.pool_restarts += 1
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        started = time.perf_counter()
+        try:
+            method, target, headers, body = await self._read_request(reader)
+            status, response = await self._dispatch(method, target, headers, body)
+        except HttpError as error:
+            status, response = error.status, json.dumps({"error": str(error)}).encode("utf-8")
+        except Exception as error:
+            status, response = 500, json.dumps({"error": f"{type(error).__name__}: {error}"}).encode("utf-8")
+
+        if status != 200:
+            self.metrics.errors += 1
+        self.metrics.record_latency(time.perf_counter() - started)
+
+        writer.write(
+            f"HTTP/1.1 {status} {_STATUS_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(response)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + response
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str], bytes]:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line.")
+
+        headers = {}
+        while (line := (await reader.readline()).decode("latin-1").strip()):
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        content_length = headers.get("content-length", "0")
+        if not (content_length.isascii() and content_length.isdigit()):
+            raise HttpError(400, f"Malformed Content-Length '{content_length}'.")
+        content_length = int(content_length)
+        if content_length > self.max_body_size:
+            raise HttpError(413, f"Request body exceeds {self.max_body_size} bytes.")
+        try:
+            body = await reader.readexactly(content_length) if content_length else b""
+        except asyncio.IncompleteReadError:
+            raise HttpError(400, f"Request body is shorter than its Content-Length of {content_length} bytes.")
+        return method.upper(), target, headers, body
+
+    async def _dispatch(self, method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[int, bytes]:
+        url = urlsplit(target)
+        if url.path == "/health":
+            if method != "GET":
+                raise HttpError(405, "Use GET for /health.")
+            health = {"status": "ok", "in_flight": len(self._in_flight), "cached": len(self.cache)}
+            return 200, json.dumps(health).encode("utf-8")
+
+        if url.path == "/metrics":
+            if method != "GET":
+                raise HttpError(405, "Use GET for /metrics.")
+            metrics = self.metrics.to_dict() | {"cache_size_bytes": self.cache.size_bytes,
+                                                "cache_evictions": self.cache.evictions}
+            return 200, json.dumps(metrics).encode("utf-8")
+
+        if url.path == "/layout":
+            if method != "POST":
+                raise HttpError(405, "Use POST for /layout.")
+            if not body:
+                raise HttpError(400, "Missing request body.")
+            self.metrics.requests += 1
+            payload_format, options = self._parse_layout_query(url.query, headers)
+            try:
+                return 200, await self.get_layout(body, payload_format, options)
+            except InvalidLayoutRequestError as error:
+                raise HttpError(400, str(error))
+
+        raise HttpError(404, f"Unknown path '{url.path}'.")
+
+    @staticmethod
+    def _parse_layout_query(query: str, headers: dict[str, str]) -> tuple[str, dict]:
+        parameters = {name: values[-1] for name, values in parse_qs(query).items()}
+        unknown_parameters = sorted(set(parameters) - set(_LAYOUT_PARAMETERS))
+        if unknown_parameters:
+            raise HttpError(400, f"Unknown parameters {', '.join(unknown_parameters)}.")
+        default_format = "topology" if headers.get("content-type", "").startswith("application/json") else "planpro"
+        payload_format = parameters.get("format", default_format)
+        if payload_format not in ("planpro", "topology"):
+            raise HttpError(400, f"Unsupported format '{payload_format}'.")
+        try:
+            scale_factor = float(parameters.get("scale_factor", 10))
+            time_budget = float(parameters["time_budget"]) if "time_budget" in parameters else None
+        except ValueError:
+            raise HttpError(400, "Parameters 'scale_factor' and 'time_budget' have to be numbers.")
+        if not (math.isfinite(scale_factor) and scale_factor > 0):
+            raise HttpError(400, "Parameter 'scale_factor' has to be positive.")
+        if time_budget is not None and not (math.isfinite(time_budget) and time_budget >= 0):
+            raise HttpError(400, "Parameter 'time_budget' must not be negative.")
+        remove_non_ks_signals = parameters.get("remove_non_ks_signals", "false").lower()
+        if remove_non_ks_signals not in _BOOLEANS:
+            raise HttpError(400, "Parameter 'remove_non_ks_signals' has to be true or false.")
+        options = {
+            "scale_factor": scale_factor,
+            "time_budget": time_budget,
+            "remove_non_ks_signals": _BOOLEANS[remove_non_ks_signals],
+            "planpro_version": parameters.get("planpro_version", "PlanPro19"),
+        }
+        return payload_format, options
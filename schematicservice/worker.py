@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+
+
+class InvalidLayoutRequestError(ValueError):
+    pass
+
+
+def compute_layout(payload: bytes, payload_format: str, options: dict) -> tuple[bytes, list[str]]:
+    """
+    Runs inside a worker process and returns the serialised `d3_graph` of the given plan and the fallbacks used to
+    meet its time budget. Raises an `InvalidLayoutRequestError` if the payload or the PlanPro version is invalid.
+    """
+    from schematicoverview import SchematicOverview
+
+    if payload_format == "planpro":
+        from planpro_importer import PlanProVersion, import_planpro
+
+        if options["planpro_version"] not in PlanProVersion.__members__:
+            raise InvalidLayoutRequestError(
+                f"Unknown PlanPro version '{options['planpro_version']}', "
+                f"use one of {', '.join(PlanProVersion.__members__)}."
+            )
+        file_descriptor, path = tempfile.mkstemp(suffix=".ppxml")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(payload)
+            topology = import_planpro(path, PlanProVersion[options["planpro_version"]])
+        finally:
+            os.unlink(path)
+    elif payload_format == "topology":
+        from yaramo.model import Topology
+
+        try:
+            topology_json = payload.decode("utf-8")
+            json.loads(topology_json)
+        except ValueError as error:
+            raise InvalidLayoutRequestError(f"Topology is not valid json: {error}") from error
+        try:
+            topology = Topology.from_json(topology_json)
+        except (KeyError, TypeError) as error:
+            raise InvalidLayoutRequestError(f"Topology json is incomplete: {type(error).__name__}: {error}") from error
+    else:
+        raise InvalidLayoutRequestError(f"Unsupported payload format '{payload_format}'.")
+
+    overview = SchematicOverview(
+        topology,
+        scale_factor=options["scale_factor"],
+        remove_non_ks_signals=options["remove_non_ks_signals"],
+        time_budget=options.get("time_budget")
+    )
+    return json.dumps(overview.d3_graph, default=str).encode("utf-8"), overview.fallbacks
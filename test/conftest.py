@@ -0,0 +1,58 @@
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from planpro_importer import PlanProVersion, import_planpro
+from yaramo.model import Topology
+
+
+PLANPRO_FILE = Path(__file__).parent / "complex-example.ppxml"
+
+
+@pytest.fixture
+def planpro_file() -> Path:
+    return PLANPRO_FILE
+
+
+@pytest.fixture
+def load_complex_example() -> Callable[[], Topology]:
+    """Returns a factory of freshly imported yaramo topologies of the complex example."""
+    def load() -> Topology:
+        return import_planpro(str(PLANPRO_FILE), PlanProVersion.PlanPro19)
+
+    return load
+
+
+@pytest.fixture
+def complex_example(load_complex_example: Callable[[], Topology]) -> Topology:
+    return load_complex_example()
+
+
+@pytest.fixture
+def get_layout() -> Callable[[Topology], dict[str, tuple]]:
+    """Returns a function that maps the uuids of nodes, edges and signals to their positions."""
+    def get_layout(topology: Topology) -> dict[str, tuple]:
+        layout = {uuid: (node.geo_node.x, node.geo_node.y) for uuid, node in topology.nodes.items()}
+        layout |= {
+            uuid: tuple((node.x, node.y) for node in edge.intermediate_geo_nodes)
+            for uuid, edge in topology.edges.items()
+        }
+        layout |= {uuid: signal.distance_edge for uuid, signal in topology.signals.items()}
+        return layout
+
+    return get_layout
+
+
+@pytest.fixture
+def uuid_hashes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Hashes nodes and edges of both engines by uuid instead of identity, so that both engines iterate the sets of
+    the graph in the same order in every run and layouts that depend on that order can be compared.
+    """
+    import zlib
+
+    from schematicconverter.helper.algorithms import reference
+    from schematicconverter.helper.datastructures import SchematicEdge, SchematicNode
+
+    for cls in (SchematicNode, SchematicEdge, reference.SchematicNode, reference.SchematicEdge):
+        monkeypatch.setattr(cls, "__hash__", lambda self: zlib.crc32(self.uuid.encode()))
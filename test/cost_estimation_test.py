@@ -0,0 +1,42 @@
+import pytest
+from schematicconverter import CostModel, estimate_cost
+from schematicconverter.cost_estimation import PHASES
+
+
+def test_estimate_is_based_on_the_topology_structure(load_complex_example):
+    topology = load_complex_example()
+
+    estimate = estimate_cost(topology)
+
+    assert estimate.features["num_nodes"] == len(topology.nodes)
+    assert estimate.features["num_edges"] == len(topology.edges)
+    assert estimate.features["num_signals"] == len(topology.signals)
+    assert set(estimate.phase_times) == set(PHASES)
+    assert 0 < estimate.total_time < 10
+    assert estimate.peak_memory > 0
+    assert all(node.geo_node.x == original.geo_node.x for node, original in zip(
+        topology.nodes.values(), load_complex_example().nodes.values()
+    ))
+
+
+def test_calibrated_model_can_be_restored(load_complex_example, tmp_path):
+    model = CostModel.calibrate([load_complex_example], repetitions=1)
+    model.save(tmp_path / "cost_model.json")
+
+    restored = CostModel.load(tmp_path / "cost_model.json")
+    topology = load_complex_example()
+
+    assert restored.estimate(topology).to_dict() == model.estimate(topology).to_dict()
+    assert restored.estimate(topology).total_time > 0
+
+
+def test_calibration_skips_only_conversions_that_exceed_the_time_limit(load_complex_example):
+    def create_invalid_topology():
+        topology = load_complex_example()
+        next(iter(topology.nodes.values())).geo_node = None
+        return topology
+
+    with pytest.raises(ValueError, match="No conversion could be measured"):
+        CostModel.calibrate([load_complex_example], repetitions=1, max_seconds=0.0)
+    with pytest.raises(AttributeError):
+        CostModel.calibrate([load_complex_example, create_invalid_topology], repetitions=1)
@@ -0,0 +1,93 @@
+import pytest
+from schematicconverter import LayoutEngine, compare_engines, convert, register_engine
+from schematicconverter.engines import ReferenceEngine
+from schematicconverter.helper import SchematicGraph
+
+from .stations import generate_station
+
+
+class ReferencePositionsEngine(ReferenceEngine):
+    """Leaves the signals in place, as the signals of generated stations do not always fit on their edges."""
+    name = "reference_positions"
+
+    def iter_process_signals(self, yaramo_graph):
+        yield 0
+
+
+def test_default_engine_matches_reference_engine(load_complex_example):
+    comparison = compare_engines(load_complex_example)
+
+    assert comparison.is_stable
+    assert comparison.is_equal, comparison.differences
+
+
+def fits_signal_slots(topology) -> bool:
+    """Whether every edge has as many signal slots per direction as signals, see `iter_process_signals`."""
+    graph = SchematicGraph(topology)
+    engine = LayoutEngine()
+    graph.get_start_nodes_in_order()
+    for _ in engine.iter_vertical_positions(graph):
+        pass
+    engine.generate_horizontal_positions(graph)
+    for _ in engine.iter_shorten_normal_tracks(graph):
+        pass
+    engine.stretch_main_tracks(graph)
+    for edge in graph.edges:
+        if edge.horizontal_only_length > 0:
+            num_slots = edge.horizontal_only_length - 1
+        else:
+            num_slots = edge.horizontal_length + 2
+        if num_slots < edge.max_num_signals:
+            return False
+    return True
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_default_engine_matches_reference_engine_on_generated_stations(seed, uuid_hashes):
+    def create_station():
+        return generate_station(seed, num_sidings=3, num_stubs=1, num_signals=6)
+
+    if not fits_signal_slots(create_station()):
+        with pytest.raises((IndexError, ValueError)):
+            convert(create_station(), engine="reference")
+        with pytest.raises(ValueError, match="signal slots"):
+            convert(create_station())
+        return
+    comparison = compare_engines(create_station)
+
+    assert comparison.is_stable
+    assert comparison.is_equal, comparison.differences
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_horizontal_positioning_matches_reference_engine_on_generated_stations(seed, uuid_hashes):
+    class HorizontalPositioningEngine(ReferencePositionsEngine):
+        name = "horizontal_positioning"
+
+        def generate_horizontal_positions(self, yaramo_graph):
+            LayoutEngine().generate_horizontal_positions(yaramo_graph)
+
+    comparison = compare_engines(
+        lambda: generate_station(seed, num_sidings=6, num_stubs=4, num_signals=20),
+        engine=HorizontalPositioningEngine(), reference=ReferencePositionsEngine()
+    )
+
+    assert comparison.is_equal, comparison.differences
+
+
+def test_custom_engine_is_used_by_convert(load_complex_example):
+    class CountingEngine(LayoutEngine):
+        name = "counting"
+        calls = 0
+
+        def generate_horizontal_positions(self, yaramo_graph):
+            CountingEngine.calls += 1
+            super().generate_horizontal_positions(yaramo_graph)
+
+    convert(load_complex_example(), engine=CountingEngine())
+
+    assert CountingEngine.calls == 1
+    with pytest.raises(ValueError):
+        register_engine(LayoutEngine())
+    with pytest.raises(ValueError):
+        convert(load_complex_example(), engine="unknown")
@@ -0,0 +1,40 @@
+from pathlib import Path
+import pytest
+
+from schematicconverter import GraphSnapshot, convert, create_snapshot
+
+
+@pytest.mark.parametrize("scale_factors", [(1.0, 4.5), (4.5, 1.0, 2.0)])
+def test_snapshot_conversions_match_fresh_conversions(
+    scale_factors: tuple[float, ...], load_complex_example, get_layout, tmp_path: Path
+):
+    topology = load_complex_example()
+    create_snapshot(topology).save(tmp_path / "snapshot.json")
+    snapshot = GraphSnapshot.load(tmp_path / "snapshot.json")
+
+    for scale_factor in scale_factors:
+        expected = get_layout(convert(load_complex_example(), scale_factor=scale_factor))
+        assert get_layout(convert(topology, scale_factor=scale_factor, snapshot=snapshot)) == expected
+
+
+def test_create_snapshot_keeps_topology_unchanged(complex_example):
+    coordinates = {uuid: (node.geo_node.x, node.geo_node.y) for uuid, node in complex_example.nodes.items()}
+
+    create_snapshot(complex_example)
+
+    assert {uuid: (node.geo_node.x, node.geo_node.y) for uuid, node in complex_example.nodes.items()} == coordinates
+
+
+@pytest.mark.parametrize("elements", ["nodes", "edges", "tracks"])
+def test_snapshot_of_other_topology_is_rejected(complex_example, elements: str):
+    snapshot = create_snapshot(complex_example)
+    if elements == "nodes":
+        snapshot.coordinates.popitem()
+    elif elements == "edges":
+        uuid, (node_a, node_b) = snapshot.edges.popitem()
+        snapshot.edges[uuid] = (node_a, node_a)
+    else:
+        snapshot.tracks[next(iter(snapshot.tracks))].append("other-track")
+
+    with pytest.raises(ValueError, match=f"does not match the {elements}"):
+        convert(complex_example, snapshot=snapshot)
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY_MODULES = ("numpy", "scipy", "scipy.optimize", "statistics")
+
+
+def import_in_subprocess(statement: str) -> set[str]:
+    code = f"import sys; {statement}; print(','.join(sorted(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return set(output.strip().split(","))
+
+
+@pytest.mark.parametrize("statement", [
+    "import schematicconverter",
+    "from schematicconverter import convert",
+    "from schematicconverter import load_planpro",
+    "from schematicoverview import SchematicOverview",
+])
+def test_heavy_dependencies_are_not_imported_eagerly(statement: str):
+    loaded_modules = import_in_subprocess(statement)
+
+    assert not loaded_modules & set(HEAVY_MODULES)
+
+
+def test_package_import_does_not_load_yaramo():
+    loaded_modules = import_in_subprocess("import schematicconverter")
+
+    assert not any(module.startswith("yaramo") for module in loaded_modules)
+    assert "schematicconverter.converter" not in loaded_modules
+
+
+def test_overview_import_does_not_load_converter():
+    loaded_modules = import_in_subprocess("import schematicoverview")
+
+    assert "schematicconverter.converter" not in loaded_modules
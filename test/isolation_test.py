@@ -0,0 +1,37 @@
+from schematicconverter import convert, convert_batch
+
+
+def test_isolated_conversion_matches_convert_and_keeps_geo_nodes(load_complex_example, get_layout):
+    expected = get_layout(convert(load_complex_example(), remove_non_ks_signals=True))
+    topology = load_complex_example()
+    original_geo_nodes = [(node.geo_node, node.geo_node.x, node.geo_node.y) for node in topology.nodes.values()]
+
+    convert(topology, remove_non_ks_signals=True, isolated=True)
+
+    assert get_layout(topology) == expected
+    assert all(geo_node.x == x and geo_node.y == y for geo_node, x, y in original_geo_nodes)
+
+
+def test_batch_conversion_in_threads(load_complex_example, get_layout):
+    expected = get_layout(convert(load_complex_example()))
+    topologies = [load_complex_example() for _ in range(4)]
+
+    converted = convert_batch(topologies, max_workers=4)
+
+    assert converted == topologies
+    assert all(get_layout(topology) == expected for topology in converted)
+
+
+def test_concurrent_conversions_of_topologies_sharing_input_objects(load_complex_example, get_layout):
+    expected = get_layout(convert(load_complex_example()))
+    topologies = [load_complex_example() for _ in range(4)]
+    shared_geo_nodes = {uuid: node.geo_node for uuid, node in topologies[0].nodes.items()}
+    for topology in topologies[1:]:
+        for uuid, node in topology.nodes.items():
+            node.geo_node = shared_geo_nodes[uuid]
+    original_coordinates = {uuid: (geo_node.x, geo_node.y) for uuid, geo_node in shared_geo_nodes.items()}
+
+    converted = convert_batch(topologies, max_workers=4)
+
+    assert all(get_layout(topology) == expected for topology in converted)
+    assert {uuid: (geo_node.x, geo_node.y) for uuid, geo_node in shared_geo_nodes.items()} == original_coordinates
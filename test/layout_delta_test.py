@@ -0,0 +1,42 @@
+import json
+from copy import deepcopy
+
+from schematicoverview import SchematicOverview, apply_layout_delta, compute_layout_delta
+
+
+def _as_maps(graph: dict) -> tuple[dict, dict, dict]:
+    return (
+        graph["properties"],
+        {node["uuid"]: node for node in graph["nodes"]},
+        {(edge["uuid"], edge["source"], edge["target"]): edge for edge in graph["edges"]},
+    )
+
+
+def test_delta_of_revised_plan(complex_example):
+    topology = complex_example
+    old_overview = SchematicOverview(topology)
+    old_graph = deepcopy(old_overview.d3_graph)
+
+    edge = next(edge for edge in topology.edges.values() if edge.signals)
+    removed_signal = edge.signals.pop()
+    topology.signals.pop(removed_signal.uuid)
+    moved_node = edge.node_a
+    moved_node.geo_node.x += 1
+    new_overview = SchematicOverview(topology, is_converted=True)
+
+    delta = compute_layout_delta(old_overview, new_overview)
+    assert delta["nodes"]["removed"] == [removed_signal.uuid.upper()]
+    assert delta["nodes"]["added"] == []
+    assert {"uuid": moved_node.uuid.upper(), "x": moved_node.geo_node.x} in delta["nodes"]["changed"]
+    assert len(json.dumps(delta, default=str)) < len(json.dumps(new_overview.d3_graph, default=str))
+
+    assert _as_maps(apply_layout_delta(old_graph, delta)) == _as_maps(new_overview.d3_graph)
+
+
+def test_delta_of_identical_layouts_is_empty(complex_example):
+    overview = SchematicOverview(complex_example)
+    delta = compute_layout_delta(overview, overview)
+
+    assert delta["properties"] == {}
+    for elements in ("nodes", "edges"):
+        assert delta[elements] == {"added": [], "removed": [], "changed": []}
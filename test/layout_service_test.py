@@ -0,0 +1,147 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from schematicservice import LayoutClient, LayoutServer, LayoutServiceError
+
+
+def run_with_server(test, **server_options):
+    async def run():
+        server = LayoutServer(port=0, **({"executor": ThreadPoolExecutor(max_workers=2)} | server_options))
+        await server.start()
+        host, port = server.address
+        try:
+            return await test(server, LayoutClient(host, port))
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_layout_requests_are_coalesced_and_cached(planpro_file):
+    async def test(server: LayoutServer, client: LayoutClient):
+        first, second = await asyncio.gather(
+            client.layout_from_planpro(planpro_file, scale_factor=1.0),
+            client.layout_from_planpro(planpro_file, scale_factor=1.0)
+        )
+        third = await client.layout_from_planpro(planpro_file, scale_factor=1.0)
+        return first, second, third, await client.metrics()
+
+    first, second, third, metrics = run_with_server(test)
+
+    assert first == second == third
+    assert len([node for node in first["nodes"] if node["type"] == "NodeType.Point"]) > 0
+    assert metrics["requests"] == 3
+    assert metrics["computations"] == 1
+    assert metrics["coalesced"] + metrics["cache_hits"] == 2
+
+
+def test_layout_cache_evicts_least_recently_used(planpro_file):
+    async def test(server: LayoutServer, client: LayoutClient):
+        for scale_factor in (1.0, 2.0, 1.0):
+            await client.layout_from_planpro(planpro_file, scale_factor=scale_factor)
+        return await client.metrics()
+
+    metrics = run_with_server(test, cache_size=1)
+
+    assert metrics["computations"] == 3
+    assert metrics["cache_evictions"] == 2
+
+
+def test_health_and_errors():
+    async def test(server: LayoutServer, client: LayoutClient):
+        health = await client.health()
+        with pytest.raises(LayoutServiceError) as not_found:
+            await client.request("GET", "/unknown")
+        with pytest.raises(LayoutServiceError) as bad_request:
+            await client.request("POST", "/layout?scale_factor=abc", b"<xml/>")
+        return health, not_found.value.status, bad_request.value.status
+
+    health, not_found_status, bad_request_status = run_with_server(test)
+
+    assert health["status"] == "ok"
+    assert not_found_status == 404
+    assert bad_request_status == 400
+
+
+def test_invalid_requests_are_rejected(planpro_file):
+    async def send_raw(host: str, port: int, request: bytes) -> int:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(request)
+        await writer.drain()
+        status = int((await reader.readline()).split(b" ", 2)[1])
+        writer.close()
+        await writer.wait_closed()
+        return status
+
+    async def test(server: LayoutServer, client: LayoutClient):
+        statuses = []
+        for target in ("/layout?scale_factor=-1", "/layout?remove_non_ks_signals=maybe", "/layout?scale=1",
+                       "/layout?planpro_version=PlanPro99"):
+            with pytest.raises(LayoutServiceError) as error:
+                await client.request("POST", target, planpro_file.read_bytes())
+            statuses.append(error.value.status)
+        host, port = server.address
+        for content_length in (b"abc", b"-1"):
+            request = b"POST /layout HTTP/1.1\r\nContent-Length: " + content_length + b"\r\n\r\n<xml/>"
+            statuses.append(await send_raw(host, port, request))
+        return statuses
+
+    assert run_with_server(test) == [400] * 6
+
+
+def exit_on_request(payload: bytes, payload_format: str, options: dict) -> tuple[bytes, list[str]]:
+    if payload == b"exit":
+        os._exit(1)
+    return b"{}", []
+
+
+@pytest.mark.parametrize("error", [KeyError("missing"), ValueError("max() arg is an empty sequence")])
+def test_internal_errors_are_not_bad_requests(planpro_file, monkeypatch, error):
+    def compute_layout(payload: bytes, payload_format: str, options: dict) -> tuple[bytes, list[str]]:
+        raise error
+
+    monkeypatch.setattr("schematicservice.server.compute_layout", compute_layout)
+
+    async def test(server: LayoutServer, client: LayoutClient):
+        with pytest.raises(LayoutServiceError) as error:
+            await client.layout_from_planpro(planpro_file)
+        return error.value.status, await client.metrics()
+
+    status, metrics = run_with_server(test)
+
+    assert status == 500
+    assert metrics["errors"] == 1
+
+
+def test_broken_worker_pool_is_replaced(monkeypatch):
+    monkeypatch.setattr("schematicservice.server.compute_layout", exit_on_request)
+
+    async def test(server: LayoutServer, client: LayoutClient):
+        with pytest.raises(LayoutServiceError) as error:
+            await client.request("POST", "/layout", b"exit")
+        return error.value.status, await client.request("POST", "/layout", b"layout"), await client.metrics()
+
+    status, layout, metrics = run_with_server(test, executor=None, max_workers=1)
+
+    assert status == 503
+    assert layout == b"{}"
+    assert metrics["pool_restarts"] == 2
+
+
+def test_layouts_with_fallbacks_are_not_cached(monkeypatch):
+    def compute_layout(payload: bytes, payload_format: str, options: dict) -> tuple[bytes, list[str]]:
+        return b"{}", ["greedy_cover"]
+
+    monkeypatch.setattr("schematicservice.server.compute_layout", compute_layout)
+
+    async def test(server: LayoutServer, client: LayoutClient):
+        for _ in range(2):
+            await client.request("POST", "/layout?time_budget=0", b"layout")
+        return await client.metrics()
+
+    metrics = run_with_server(test)
+
+    assert metrics["computations"] == 2
+    assert metrics["cache_hits"] == 0
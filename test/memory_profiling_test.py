@@ -0,0 +1,75 @@
+import tracemalloc
+
+import pytest
+from schematicconverter import MemoryBudgetExceededError, MemoryProfile, convert
+from schematicconverter.planpro_loader import LayoutEdge, LayoutGeoNode, LayoutNode, LayoutTopology
+from schematicoverview import SchematicOverview
+
+
+def create_chain(num_nodes: int) -> LayoutTopology:
+    """The reachability of a chain of nodes takes memory quadratic in its length."""
+    chain = LayoutTopology()
+    nodes = [LayoutNode(f"node-{idx}", LayoutGeoNode(float(idx), 0.0)) for idx in range(num_nodes)]
+    chain.nodes = {node.uuid: node for node in nodes}
+    for idx, (node_a, node_b) in enumerate(zip(nodes, nodes[1:])):
+        edge = LayoutEdge(f"edge-{idx}", node_a, node_b, 1.0)
+        node_a.connected_edges.append(edge)
+        node_b.connected_edges.append(edge)
+        chain.edges[edge.uuid] = edge
+    return chain
+
+
+def test_profile_records_every_phase_of_an_overview(load_complex_example):
+    profile = MemoryProfile(top_sites=3)
+
+    SchematicOverview(load_complex_example(), memory_profile=profile)
+
+    assert list(profile.phases) == [
+        "graph", "vertical_positioning", "horizontal_positioning", "track_postprocessing", "signals",
+        "normalization", "overview_points", "overview_edges", "overview_breakpoints", "overview_signals"
+    ]
+    assert profile.peak == max(phase.peak for phase in profile.phases.values()) > 0
+    assert all(len(phase.top_sites) <= 3 for phase in profile.phases.values())
+    assert profile.phases["overview_points"].top_sites
+    assert not tracemalloc.is_tracing()
+
+
+def test_conversion_aborts_when_the_memory_budget_is_exceeded(load_complex_example):
+    profile = MemoryProfile(budget=1)
+
+    with pytest.raises(MemoryBudgetExceededError) as error:
+        convert(load_complex_example(), memory_profile=profile)
+
+    assert error.value.phase == "graph"
+    assert error.value.peak > error.value.budget
+    assert not tracemalloc.is_tracing()
+
+
+def test_budget_is_checked_within_the_graph_phase():
+    # The first profile also traces the lazy imports of the conversion
+    for _ in range(2):
+        profile = MemoryProfile(top_sites=0)
+        convert(create_chain(300), memory_profile=profile)
+    graph_peak = profile.phases["graph"].peak
+
+    with pytest.raises(MemoryBudgetExceededError) as error:
+        convert(create_chain(300), memory_profile=MemoryProfile(budget=graph_peak // 2, top_sites=0))
+
+    assert error.value.phase == "graph"
+    assert error.value.budget < error.value.peak < graph_peak
+
+
+def test_overlapping_profiles_share_the_tracing(load_complex_example):
+    # Profiles of concurrent conversions in threads overlap without being nested
+    first_tracing, second = MemoryProfile().tracing(), MemoryProfile(top_sites=1)
+    second_tracing = second.tracing()
+
+    first_tracing.__enter__()
+    second_tracing.__enter__()
+    first_tracing.__exit__(None, None, None)
+    convert(load_complex_example(), memory_profile=second)
+    assert tracemalloc.is_tracing()
+    second_tracing.__exit__(None, None, None)
+
+    assert second.phases["normalization"].peak > 0
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from yaramo.track import TrackType
+
+from schematicconverter import convert_partitioned, load_planpro, validate_layout
+from schematicconverter.partitioning import find_bridges
+from schematicconverter.planpro_loader import LayoutEdge, LayoutTopology, LayoutTrack
+
+
+def create_corridor(planpro_file: Path, num_stations: int) -> tuple[LayoutTopology, list[LayoutEdge]]:
+    """Connects copies of the complex example by single-track main track edges."""
+    corridor = LayoutTopology()
+    connections = []
+    previous_end = None
+    for idx in range(num_stations):
+        station = load_planpro(planpro_file)
+        for elements in ("nodes", "edges", "signals"):
+            for element in getattr(station, elements).values():
+                element.uuid = f"{idx}-{element.uuid}"
+                getattr(corridor, elements)[element.uuid] = element
+        for node in station.nodes.values():
+            node.geo_node.x += idx * 1000
+
+        start = min(station.nodes.values(), key=lambda node: node.geo_node.x)
+        if previous_end is not None:
+            edge = LayoutEdge(f"connection-{idx}", previous_end, start, 600.0)
+            previous_end.connected_edges.append(edge)
+            start.connected_edges.append(edge)
+            corridor.edges[edge.uuid] = edge
+            connections.append(edge)
+        previous_end = max(station.nodes.values(), key=lambda node: node.geo_node.x)
+
+    corridor.tracks["main"] = LayoutTrack("main", TrackType.Durchgehendes_Hauptgleis, connections)
+    return corridor, connections
+
+
+def test_find_bridges(planpro_file):
+    corridor, connections = create_corridor(planpro_file, 3)
+
+    assert {edge.uuid for edge in connections} <= find_bridges(corridor)
+
+
+def test_partitioned_conversion_stitches_sections(planpro_file):
+    corridor, connections = create_corridor(planpro_file, 3)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        convert_partitioned(corridor, scale_factor=1.0, min_section_size=4, executor=executor)
+
+    for edge in connections:
+        left, right = edge.node_a.geo_node, edge.node_b.geo_node
+        assert left.y == right.y
+        assert left.x < right.x
+    for idx in range(2):
+        assert max(node.geo_node.x for uuid, node in corridor.nodes.items() if uuid.startswith(f"{idx}-")) <= \
+               min(node.geo_node.x for uuid, node in corridor.nodes.items() if uuid.startswith(f"{idx + 1}-"))
+    assert not validate_layout(corridor).violations["multiple_breakpoints"]
+
+
+def test_partitioned_sections_do_not_overlap(planpro_file):
+    corridor, (connection,) = create_corridor(planpro_file, 2)
+    # The right section lies left of its node of the cut
+    connection.node_b.connected_edges.remove(connection)
+    connection.node_b = max(
+        (node for uuid, node in corridor.nodes.items() if uuid.startswith("1-")), key=lambda node: node.geo_node.x
+    )
+    connection.node_b.connected_edges.append(connection)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        convert_partitioned(corridor, scale_factor=1.0, min_section_size=4, executor=executor)
+
+    def get_x_extent(idx: int) -> tuple[float, float]:
+        xs = [
+            geo_node.x
+            for uuid, edge in corridor.edges.items() if uuid.startswith(f"{idx}-")
+            for geo_node in (edge.node_a.geo_node, *edge.intermediate_geo_nodes, edge.node_b.geo_node)
+        ]
+        return min(xs), max(xs)
+
+    assert get_x_extent(0)[1] <= get_x_extent(1)[0]
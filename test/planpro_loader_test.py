@@ -0,0 +1,95 @@
+import pytest
+
+from schematicconverter import convert, load_planpro, validate_layout
+from schematicoverview import SchematicOverview
+
+
+@pytest.fixture
+def layout_topology(planpro_file):
+    return load_planpro(planpro_file)
+
+
+def write_planpro(path, length: str | None, direction: str | None):
+    """Writes a PlanPro file with a single edge between two nodes and one signal on it."""
+    def value(tag: str, text: str | None) -> str:
+        return f"<{tag}><Wert>{text}</Wert></{tag}>" if text is not None else ""
+
+    nodes = "".join(
+        f"<GEO_Punkt>{value('Identitaet', f'point-{idx}')}{value('ID_GEO_Knoten', f'geo-{idx}')}"
+        f"<GEO_Punkt_Allg>{value('GK_X', x)}{value('GK_Y', y)}</GEO_Punkt_Allg></GEO_Punkt>"
+        f"<TOP_Knoten>{value('Identitaet', f'node-{idx}')}{value('ID_GEO_Knoten', f'geo-{idx}')}</TOP_Knoten>"
+        for idx, (x, y) in enumerate([("0", "0"), ("30", "40")])
+    )
+    edge = (
+        f"<TOP_Kante>{value('Identitaet', 'edge')}"
+        f"{value('ID_TOP_Knoten_A', 'node-0')}{value('ID_TOP_Knoten_B', 'node-1')}"
+        f"<TOP_Kante_Allg>{value('TOP_Laenge', length)}</TOP_Kante_Allg></TOP_Kante>"
+    )
+    signal = (
+        f"<Signal>{value('Identitaet', 'signal')}<Punkt_Objekt_TOP_Kante>{value('ID_TOP_Kante', 'edge')}"
+        f"{value('Abstand', '20')}{value('Wirkrichtung', direction)}</Punkt_Objekt_TOP_Kante>"
+        f"<Signal_Real><Signal_Real_Aktiv_Schirm>{value('Signal_Art', 'Hauptsignal')}"
+        f"{value('Signalsystem', 'Ks')}</Signal_Real_Aktiv_Schirm></Signal_Real></Signal>"
+    )
+    path.write_text(
+        f"<PlanPro_Schnittstelle><LST_Zustand_Ziel><Container>{nodes}{edge}{signal}</Container></LST_Zustand_Ziel>"
+        f"</PlanPro_Schnittstelle>"
+    )
+    return path
+
+
+def test_loaded_elements(layout_topology, complex_example):
+    topology = complex_example
+
+    assert set(layout_topology.nodes) == set(topology.nodes)
+    assert set(layout_topology.edges) == set(topology.edges)
+    assert set(layout_topology.signals) == set(topology.signals)
+    for uuid, edge in layout_topology.edges.items():
+        assert {edge.node_a.uuid, edge.node_b.uuid} == {topology.edges[uuid].node_a.uuid, topology.edges[uuid].node_b.uuid}
+        assert {signal.uuid for signal in edge.signals} == {signal.uuid for signal in topology.edges[uuid].signals}
+
+
+def test_layout_matches_yaramo_import(layout_topology, complex_example):
+    topology = convert(complex_example, scale_factor=1.0)
+    layout_topology = convert(layout_topology, scale_factor=1.0)
+
+    for uuid, node in layout_topology.nodes.items():
+        assert (node.geo_node.x, node.geo_node.y) == (topology.nodes[uuid].geo_node.x, topology.nodes[uuid].geo_node.y)
+    for uuid, edge in layout_topology.edges.items():
+        assert [(node.x, node.y) for node in edge.intermediate_geo_nodes] == \
+               [(node.x, node.y) for node in topology.edges[uuid].intermediate_geo_nodes]
+    for uuid, signal in layout_topology.signals.items():
+        assert signal.distance_edge == pytest.approx(topology.signals[uuid].distance_edge)
+
+
+def test_overview_from_layout_topology(layout_topology, planpro_file):
+    d3_graph = SchematicOverview(load_planpro(planpro_file)).d3_graph
+
+    assert len([node for node in d3_graph["nodes"] if node["type"] == "NodeType.Signal"]) == 13
+    assert len(d3_graph["edges"]) == len(layout_topology.edges) + sum(
+        1 for node in d3_graph["nodes"] if node["type"] == "NodeType.Breakpoint"
+    )
+
+
+def test_edges_without_length_get_the_distance_of_their_nodes(tmp_path):
+    topology = load_planpro(write_planpro(tmp_path / "station.ppxml", length=None, direction="in"))
+
+    assert topology.edges["edge"].length == pytest.approx(50.0)
+    assert not validate_layout(convert(topology)).violations["signal_outside_edge"]
+
+
+def test_signals_effective_in_both_directions_keep_their_relative_position(tmp_path):
+    topology = load_planpro(write_planpro(tmp_path / "station.ppxml", length="80", direction="beide"))
+    signal = topology.signals["signal"]
+
+    assert signal.direction is None
+    convert(topology)
+    node_a, node_b = signal.edge.node_a.geo_node, signal.edge.node_b.geo_node
+    assert signal.distance_edge == pytest.approx(20 / 80 * abs(node_b.x - node_a.x))
+    assert not validate_layout(topology).violations["signal_outside_edge"]
+
+
+@pytest.mark.parametrize("direction", [None, "links"])
+def test_signals_without_known_direction_are_rejected(tmp_path, direction):
+    with pytest.raises(ValueError, match="Signal signal has an unknown direction"):
+        load_planpro(write_planpro(tmp_path / "station.ppxml", length="80", direction=direction))
@@ -0,0 +1,66 @@
+from yaramo.signal import SignalDirection
+from yaramo.track import Track, TrackType
+
+from schematicconverter import convert
+from schematicoverview import SchematicOverview
+
+
+def test_signals_are_placed_on_their_edges(load_complex_example):
+    overview = SchematicOverview(load_complex_example())
+    signals = {signal.uuid: signal for signal in overview.signals}
+
+    for edge in overview.topology.edges.values():
+        node_a, node_b = edge.node_a.geo_node, edge.node_b.geo_node
+        left_is_a = (node_a.x, node_a.y) < (node_b.x, node_b.y)
+        for yaramo_signal in edge.signals:
+            signal = signals[yaramo_signal.uuid.upper()]
+            distance = yaramo_signal.distance_edge
+            assert signal.x == (node_a.x + distance if left_is_a else node_a.x - distance)
+            if node_a.y == node_b.y:
+                assert signal.y == node_a.y
+            elif edge.intermediate_geo_nodes:
+                assert signal.y == edge.intermediate_geo_nodes[0].y
+            assert (signal.direction == str(SignalDirection.IN)) == \
+                   (left_is_a == (yaramo_signal.direction == SignalDirection.IN))
+            if node_a.y == node_b.y or edge.intermediate_geo_nodes:
+                assert signal.angle == (90 if signal.direction == str(SignalDirection.IN) else -90)
+
+
+def test_components_are_computed_on_first_access(load_complex_example):
+    overview = SchematicOverview(load_complex_example())
+    assert not set(overview.components) & set(overview.__dict__)
+
+    num_edges = len(overview.edges)
+    assert "edges" in overview.__dict__ and "signals" not in overview.__dict__
+    assert num_edges == len(overview.topology.edges) + len(overview.breakpoints)
+
+    moved_node = next(iter(overview.topology.nodes.values()))
+    moved_node.geo_node.x += 1
+    overview.invalidate("points")
+    assert overview.get_point_by_uuid(moved_node.uuid.upper()).x == moved_node.geo_node.x
+    assert "edges" in overview.__dict__
+
+    overview.invalidate()
+    assert not set(overview.components) & set(overview.__dict__)
+
+
+def test_edges_are_computed_without_arguments(load_complex_example):
+    topology = convert(load_complex_example())
+    yaramo_edges = list(topology.edges.values())
+    main_track_edges = yaramo_edges[:1]
+    tracks = {TrackType.Sonstiges: yaramo_edges, TrackType.Durchgehendes_Hauptgleis: main_track_edges}
+    for track_type, edges in tracks.items():
+        track = Track(track_type)
+        track.edges = edges
+        topology.tracks[track.uuid] = track
+    overview = SchematicOverview(topology, is_converted=True)
+
+    overview.compute_track_types()
+    edges = {edge.uuid: edge for edge in overview.edges}
+    assert edges[main_track_edges[0].uuid.upper()].type == TrackType.Durchgehendes_Hauptgleis
+    assert all(edge.type is not None for edge in overview.edges)
+
+    for _ in range(2):
+        overview.compute_breakpoints()
+        assert len(overview.edges) == len(yaramo_edges) + len(overview.breakpoints)
+        assert all(edge.type is not None for edge in overview.edges)
@@ -0,0 +1,50 @@
+import pytest
+from schematicconverter import SignalFilter, convert, validate_layout
+from schematicoverview import SchematicOverview
+from yaramo.signal import SignalDirection
+
+
+def test_rejected_signals_keep_their_relative_position(load_complex_example):
+    topology = load_complex_example()
+    original_positions = {
+        uuid: signal.distance_edge / signal.edge.length for uuid, signal in topology.signals.items()
+    }
+    signal_filter = SignalFilter(directions=[SignalDirection.IN])
+
+    convert(topology, signal_filter=signal_filter)
+
+    assert set(topology.signals) == set(original_positions)
+    assert sum(len(edge.signals) for edge in topology.edges.values()) == len(original_positions)
+    for uuid, signal in topology.signals.items():
+        edge = signal.edge
+        if not signal_filter(signal) and not edge.intermediate_geo_nodes:
+            width = abs(edge.node_b.geo_node.x - edge.node_a.geo_node.x)
+            assert signal.distance_edge == pytest.approx(original_positions[uuid] * width)
+
+
+def test_unfiltered_consumers_of_a_filtered_conversion(load_complex_example):
+    topology = convert(load_complex_example(), remove_non_ks_signals=True)
+
+    overview = SchematicOverview(topology, is_converted=True)
+
+    assert {signal.uuid for signal in overview.signals} == {uuid.upper() for uuid in topology.signals}
+    assert not validate_layout(topology).violations["signal_outside_edge"]
+
+
+def test_overviews_of_one_topology_show_the_selected_signals(load_complex_example):
+    topology = convert(load_complex_example())
+    overviews = [
+        SchematicOverview(topology, is_converted=True, signal_filter=SignalFilter(directions=[direction]))
+        for direction in (SignalDirection.IN, SignalDirection.GEGEN)
+    ]
+
+    signal_uuids = [{signal.uuid for signal in overview.signals} for overview in overviews]
+    assert not signal_uuids[0] & signal_uuids[1]
+    assert signal_uuids[0] | signal_uuids[1] == {uuid.upper() for uuid in topology.signals}
+
+
+def test_ks_shorthand_cannot_be_combined_with_a_filter(load_complex_example):
+    topology = load_complex_example()
+
+    with pytest.raises(ValueError):
+        convert(topology, remove_non_ks_signals=True, signal_filter=SignalFilter())
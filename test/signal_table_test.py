@@ -0,0 +1,114 @@
+import pytest
+
+from schematicconverter.engines import get_engine
+from schematicconverter.helper import SchematicEdge, SchematicGraph, SignalTable
+from schematicconverter.helper.algorithms import reference
+from schematicconverter.helper.algorithms.signal_processing import iter_process_signals
+
+
+def create_positioned_graph(topology) -> SchematicGraph:
+    graph = SchematicGraph(topology)
+    engine = get_engine("default")
+    graph.get_start_nodes_in_order()
+    for _ in engine.iter_vertical_positions(graph):
+        pass
+    engine.generate_horizontal_positions(graph)
+    return graph
+
+
+def shorten_edge(edge, horizontal_only_length: int) -> None:
+    edge.target.new_x = edge.source.new_x + abs(edge.source.new_y - edge.target.new_y) + horizontal_only_length
+
+
+def test_signal_groups_are_contiguous_and_ordered(load_complex_example):
+    graph = SchematicGraph(load_complex_example())
+    table = graph.signal_table
+
+    assert len(table) == sum(len(edge.yaramo_edge.signals) for edge in graph.edges)
+    max_num_signals = {edge: 0 for edge in graph.edges}
+    for edge_idx, direction, start, end in table.groups:
+        edge = table.edges[edge_idx]
+        assert all(signal in edge.yaramo_edge.signals for signal in table.signals[start:end])
+        assert list(table.original_distances[start:end]) == sorted(table.original_distances[start:end])
+        if direction in (SignalTable.IN, SignalTable.AGAINST):
+            max_num_signals[edge] = max(max_num_signals[edge], end - start)
+    assert {edge: edge.max_num_signals for edge in graph.edges} == max_num_signals
+
+
+def test_signals_are_only_written_back_on_request(load_complex_example):
+    graph = create_positioned_graph(load_complex_example())
+    original_distances = [signal.distance_edge for signal in graph.signal_table.signals]
+
+    for _ in iter_process_signals(graph):
+        pass
+
+    assert [signal.distance_edge for signal in graph.signal_table.signals] == original_distances
+    graph.signal_table.write_back()
+    assert [signal.distance_edge for signal in graph.signal_table.signals] == list(graph.signal_table.distances)
+
+
+def test_signals_that_do_not_fit_on_their_edge_are_rejected(load_complex_example):
+    graph = create_positioned_graph(load_complex_example())
+    table = graph.signal_table
+    edge_idx, _, start, end = next(group for group in table.groups if group[3] - group[2] > 1)
+    shorten_edge(table.edges[edge_idx], end - start)
+
+    with pytest.raises(ValueError, match=f"Edge {table.edges[edge_idx].uuid} has {end - start - 1} signal slots"):
+        for _ in iter_process_signals(graph):
+            pass
+
+    graph = create_positioned_graph(load_complex_example())
+    table = graph.signal_table
+    edge = min(
+        (table.edges[edge_idx] for edge_idx, _, start, end in table.groups),
+        key=lambda edge: (edge.max_num_signals, edge.uuid)
+    )
+    shorten_edge(edge, 1)
+
+    with pytest.raises(ValueError, match=f"beyond the signal slots of edge {edge.uuid}"):
+        for _ in iter_process_signals(graph):
+            pass
+
+
+def test_signals_of_edges_with_zero_length_are_rejected(load_complex_example):
+    graph = create_positioned_graph(load_complex_example())
+    table = graph.signal_table
+    edge = table.edges[table.edge_idxs[0]]
+    edge.yaramo_edge.length = 0
+
+    with pytest.raises(ValueError, match=f"Edge {edge.uuid} has zero length"):
+        for _ in iter_process_signals(graph):
+            pass
+    lengths = table.get_horizontal_lengths()
+    lengths[table.edge_idxs[0]] = 0
+    with pytest.raises(ValueError, match=f"Edge {edge.uuid} has zero length"):
+        table.rescale(lengths, table.get_horizontal_lengths())
+
+
+def test_vectorised_placement_matches_per_signal_placement(load_complex_example):
+    graph = create_positioned_graph(load_complex_example())
+    table = graph.signal_table
+    for _ in iter_process_signals(graph):
+        pass
+    positions = {node.uuid: (node.new_x, node.new_y) for node in graph.nodes}
+    breakpoints = {edge.uuid: edge.intermediate_geo_node for edge in graph.edges if edge.intermediate_geo_node}
+
+    # The reference places the signals of its own graph, laid out like the graph above
+    reference_graph = reference.SchematicGraph(graph.topology)
+    for node in reference_graph.nodes:
+        node.new_x, node.new_y = positions[node.uuid]
+    for edge in reference_graph.edges:
+        if edge.uuid in breakpoints:
+            edge.intermediate_geo_node = breakpoints[edge.uuid]
+    reference.process_signals(reference_graph)
+
+    assert table.distances.tolist() == [signal.distance_edge for signal in table.signals]
+
+
+def test_edges_without_graph_count_their_signals(complex_example):
+    graph = SchematicGraph(complex_example)
+    edge = max(graph.edges, key=lambda edge: edge.max_num_signals)
+
+    copied_edge = SchematicEdge(edge.yaramo_edge, edge.source, edge.target)
+
+    assert copied_edge.max_num_signals == edge.max_num_signals > 0
@@ -0,0 +1,86 @@
+"""Generated stations for tests and benchmarks, which import this module from the test directory."""
+import random
+from itertools import count
+
+from yaramo.signal import SignalDirection, SignalKind, SignalSystem
+from yaramo.track import TrackType
+
+from schematicconverter.planpro_loader import LayoutEdge, LayoutGeoNode, LayoutNode, LayoutSignal, LayoutTopology
+from schematicconverter.planpro_loader import LayoutTrack
+
+
+def generate_station(seed: int, num_sidings: int = 8, num_stubs: int = 3, num_signals: int = 12) -> LayoutTopology:
+    """Generates a station on a straight main track with sidings, stub tracks and signals at random positions."""
+    rnd = random.Random(seed)
+    topology = LayoutTopology()
+    edge_idxs = count()
+
+    def add_node(x: float, y: float) -> LayoutNode:
+        node = LayoutNode(f"node-{len(topology.nodes)}", LayoutGeoNode(float(x), float(y)))
+        topology.nodes[node.uuid] = node
+        return node
+
+    def add_edge(node_a: LayoutNode, node_b: LayoutNode) -> LayoutEdge:
+        edge = LayoutEdge(
+            f"edge-{next(edge_idxs)}", node_a, node_b, abs(node_b.geo_node.x - node_a.geo_node.x) + 1.0
+        )
+        node_a.connected_edges.append(edge)
+        node_b.connected_edges.append(edge)
+        topology.edges[edge.uuid] = edge
+        return edge
+
+    def split(edge: LayoutEdge, x: float) -> LayoutNode:
+        node_a, node_b = sorted((edge.node_a, edge.node_b), key=lambda node: node.geo_node.x)
+        node_a.connected_edges.remove(edge)
+        node_b.connected_edges.remove(edge)
+        del topology.edges[edge.uuid]
+        node = add_node(x, node_a.geo_node.y)
+        add_edge(node_a, node)
+        add_edge(node, node_b)
+        return node
+
+    def get_horizontal_edges() -> list[LayoutEdge]:
+        return [
+            edge for edge in topology.edges.values()
+            if edge.node_a.geo_node.y == edge.node_b.geo_node.y
+            and abs(edge.node_a.geo_node.x - edge.node_b.geo_node.x) > 40
+        ]
+
+    add_edge(add_node(0, 0), add_node(1000, 0))
+    used_xs = set()
+    for _ in range(num_sidings + num_stubs):
+        candidates = get_horizontal_edges()
+        if not candidates:
+            break
+        edge = rnd.choice(candidates)
+        low, high = sorted((edge.node_a.geo_node.x, edge.node_b.geo_node.x))
+        xs = [
+            rnd.randint(int(low) + 5, int(low + (high - low) / 3)),
+            rnd.randint(int(low + 2 * (high - low) / 3), int(high) - 5)
+        ]
+        if used_xs & set(xs):
+            continue
+        used_xs |= set(xs)
+        left = split(edge, xs[0])
+        if len(used_xs) <= 2 * num_sidings:
+            # Siding between two switches of the same track
+            right_edge = next(e for e in left.connected_edges if e.get_opposite_node(left).geo_node.x > xs[0])
+            add_edge(left, split(right_edge, xs[1]))
+        else:
+            end_y = left.geo_node.y + rnd.choice([-1, 1]) * (rnd.random() * 10 + 1)
+            add_edge(left, add_node(xs[0] + rnd.choice([-1, 1]) * rnd.randint(5, 40), end_y))
+
+    edges = list(topology.edges.values())
+    for idx in range(num_signals):
+        edge = rnd.choice(edges)
+        signal = LayoutSignal(
+            f"signal-{idx}", edge, rnd.random() * edge.length, rnd.choice([SignalDirection.IN, SignalDirection.GEGEN]),
+            rnd.choice(list(SignalKind)), rnd.choice([SignalSystem.Ks, SignalSystem.HV]), f"S{idx}"
+        )
+        edge.signals.append(signal)
+        topology.signals[signal.uuid] = signal
+    main_track_edges = [
+        edge for edge in topology.edges.values() if edge.node_a.geo_node.y == 0 and edge.node_b.geo_node.y == 0
+    ]
+    topology.tracks["main-track"] = LayoutTrack("main-track", TrackType.Durchgehendes_Hauptgleis, main_track_edges)
+    return topology
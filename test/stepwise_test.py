@@ -0,0 +1,54 @@
+import asyncio
+import sys
+
+from schematicconverter import StepwiseConversion, convert, convert_async
+from schematicconverter.planpro_loader import LayoutEdge, LayoutGeoNode, LayoutNode, LayoutTopology
+
+
+def test_stepwise_conversion_matches_convert(load_complex_example, get_layout):
+    expected = get_layout(convert(load_complex_example()))
+    conversion = StepwiseConversion(load_complex_example(), units_per_step=1)
+
+    phases = list(conversion)
+
+    assert conversion.done
+    assert len(phases) > len(set(phases)) >= 5
+    assert get_layout(conversion.topology) == expected
+
+
+def test_convert_async_does_not_block_the_event_loop(load_complex_example, get_layout):
+    ticks = []
+
+    async def ticker(conversion: asyncio.Task):
+        while not conversion.done():
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        conversion = asyncio.ensure_future(
+            convert_async(load_complex_example(), units_per_step=1)
+        )
+        await asyncio.gather(conversion, ticker(conversion))
+        return conversion.result()
+
+    topology = asyncio.run(main())
+
+    assert len(ticks) > 5
+    assert get_layout(topology) == get_layout(convert(load_complex_example()))
+
+
+def test_deep_topologies_are_converted_in_bounded_steps():
+    chain = LayoutTopology()
+    nodes = [LayoutNode(f"node-{idx}", LayoutGeoNode(float(idx), 0.0)) for idx in range(sys.getrecursionlimit() + 100)]
+    chain.nodes = {node.uuid: node for node in nodes}
+    for idx, (node_a, node_b) in enumerate(zip(nodes, nodes[1:])):
+        edge = LayoutEdge(f"edge-{idx}", node_a, node_b, 1.0)
+        node_a.connected_edges.append(edge)
+        node_b.connected_edges.append(edge)
+        chain.edges[edge.uuid] = edge
+    conversion = StepwiseConversion(chain, scale_factor=1.0, units_per_step=1)
+
+    phases = list(conversion)
+
+    assert phases.count("graph") > len(nodes)
+    assert [node.geo_node.x for node in nodes] == [2.0 * idx for idx in range(len(nodes))]
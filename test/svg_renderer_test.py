@@ -0,0 +1,35 @@
+from pathlib import Path
+from xml.etree import ElementTree
+import pytest
+
+from schematicoverview import SchematicOverview, iter_svg, render_svg
+
+
+SVG_NAMESPACE = "{http://www.w3.org/2000/svg}"
+
+
+@pytest.fixture
+def overview(complex_example) -> SchematicOverview:
+    return SchematicOverview(complex_example)
+
+
+def test_render_complete_overview(overview: SchematicOverview, tmp_path: Path):
+    render_svg(overview, tmp_path / "overview.svg", labels=True)
+    root = ElementTree.parse(tmp_path / "overview.svg").getroot()
+
+    assert len(root.findall(f"{SVG_NAMESPACE}g[@class='tracks']/{SVG_NAMESPACE}line")) == len(overview.edges)
+    assert len(root.findall(f"{SVG_NAMESPACE}g[@class='points']/{SVG_NAMESPACE}circle")) == len(overview.points)
+    assert len(root.findall(f"{SVG_NAMESPACE}g[@class='signals']/{SVG_NAMESPACE}g")) == len(overview.signals)
+
+
+def test_viewport_skips_elements_outside(overview: SchematicOverview):
+    point = min(overview.points, key=lambda point: (point.x, point.y))
+    viewport = (point.x - 0.01, point.y - 0.01, point.x + 0.01, point.y + 0.01)
+    root = ElementTree.fromstring("".join(iter_svg(overview, viewport=viewport)))
+
+    assert 0 < len(root.findall(f"{SVG_NAMESPACE}g[@class='points']/{SVG_NAMESPACE}circle")) < len(overview.points)
+
+
+def test_empty_viewport_is_rejected(overview: SchematicOverview):
+    with pytest.raises(ValueError):
+        next(iter_svg(overview, viewport=(1, 1, 1, 2)))
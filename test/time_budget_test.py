@@ -0,0 +1,32 @@
+import pytest
+
+from schematicconverter import TimeBudget, convert
+from schematicconverter.validation import validate_layout
+from schematicoverview import SchematicOverview
+
+
+def test_exceeded_budget_uses_fallbacks(load_complex_example):
+    budget = TimeBudget(0.0)
+    topology = convert(load_complex_example(), time_budget=budget)
+
+    assert budget.exceeded
+    assert "start_nodes_by_original_y" in budget.fallbacks
+    assert "skip_shorten_normal_tracks" in budget.fallbacks
+    assert set(budget.phase_times) == {
+        "graph", "vertical_positioning", "horizontal_positioning", "track_postprocessing", "signals", "normalization"
+    }
+    assert not validate_layout(topology).violations["multiple_breakpoints"]
+
+
+def test_sufficient_budget_uses_no_fallbacks(load_complex_example):
+    budget = TimeBudget(60.0)
+    convert(load_complex_example(), time_budget=budget)
+
+    assert budget.fallbacks == []
+
+
+@pytest.mark.parametrize("time_budget, expect_fallbacks", [(None, False), (0.0, True)])
+def test_overview_reports_fallbacks(load_complex_example, time_budget: float | None, expect_fallbacks: bool):
+    overview = SchematicOverview(load_complex_example(), time_budget=time_budget)
+
+    assert bool(overview.d3_graph["properties"]["fallbacks"]) == expect_fallbacks
@@ -0,0 +1,45 @@
+import pytest
+
+from schematicconverter import convert
+from schematicconverter.validation import LayoutValidationError, validate_layout
+from yaramo.topology import Topology
+
+
+@pytest.fixture()
+def processed_topology(complex_example):
+    yield convert(complex_example, scale_factor=1.0, remove_non_ks_signals=False)
+
+
+def test_complex_example_is_valid(processed_topology: Topology):
+    report = validate_layout(processed_topology, min_signal_spacing=1.0)
+
+    assert report.is_valid, report.violations
+    assert report.metrics["num_nodes"] == 12
+    assert report.metrics["num_signals"] == 13
+    assert report.metrics["edge_crossings"] == 0
+    assert report.metrics["bend_count"] == sum(
+        1 for edge in processed_topology.edges.values() if edge.intermediate_geo_nodes
+    )
+    assert report.metrics["height"] == 5.0
+
+
+def test_detects_invalid_layout(processed_topology: Topology):
+    edge = next(edge for edge in processed_topology.edges.values() if edge.intermediate_geo_nodes)
+    edge.intermediate_geo_nodes[0].y += 0.5
+    signal = next(signal for signal in processed_topology.signals.values())
+    signal.distance_edge = -1.0
+
+    report = validate_layout(processed_topology)
+
+    assert edge.uuid in report.violations["misaligned_breakpoint"]
+    assert edge.uuid in report.violations["invalid_angle"]
+    assert signal.uuid in report.violations["signal_outside_edge"]
+    with pytest.raises(LayoutValidationError):
+        report.raise_for_violations()
+
+
+def test_counts_crossings(processed_topology: Topology):
+    node = next(node for node in processed_topology.nodes.values() if node.geo_node.y == 0.0)
+    node.geo_node.y = 10.0
+
+    assert validate_layout(processed_topology).metrics["edge_crossings"] > 0
@@ -0,0 +1,30 @@
+from typing import Callable
+
+from yaramo.model import Topology
+
+from schematicconverter import convert, convert_variants
+
+
+def create_variants(load_complex_example: Callable[[], Topology]) -> list[Topology]:
+    moved_signal = load_complex_example()
+    signal = next(iter(moved_signal.signals.values()))
+    signal.distance_edge = signal.distance_edge / 2
+
+    removed_signal = load_complex_example()
+    edge = next(edge for edge in removed_signal.edges.values() if len(edge.signals) > 1)
+    removed_signal.signals.pop(edge.signals.pop().uuid)
+
+    moved_node = load_complex_example()
+    next(iter(moved_node.nodes.values())).geo_node.y += 1
+
+    return [moved_signal, removed_signal, moved_node]
+
+
+def test_variants_match_individual_conversions(load_complex_example, get_layout):
+    base = load_complex_example()
+    variants = convert_variants(base, create_variants(load_complex_example), scale_factor=2.0)
+    expected = [convert(variant, scale_factor=2.0) for variant in create_variants(load_complex_example)]
+
+    assert get_layout(base) == get_layout(convert(load_complex_example(), 2.0))
+    for variant, expected_variant in zip(variants, expected):
+        assert get_layout(variant) == get_layout(expected_variant)